@@ -0,0 +1,26 @@
+"""Materializes the DB new and pastweek listings after an announcement."""
+import click
+from flask import Blueprint
+
+from browse.services.database.models import db, ListingAnnouncement, ListingAnnouncementDay
+from browse.services.database.listings import materialize_listings
+
+bp = Blueprint("listings", __name__)
+
+
+@bp.cli.command("materialize", short_help="writes the new and pastweek DB listings after an announcement")
+@click.option("-v", is_flag=True,
+              help="Verbose.",
+              default=False)
+def materialize(v: bool) -> None:
+    """Write the new and pastweek listings of every archive and category.
+
+    Run this after each announcement. Until it is run the DB listing
+    service makes these listings from arXiv_updates on each request."""
+    for table in [ListingAnnouncement.__table__, ListingAnnouncementDay.__table__]:
+        table.create(db.engine, checkfirst=True)
+
+    written = materialize_listings()
+    if v:
+        for listing, count in written.items():
+            print(f"Wrote {count} rows for the {listing} listings.")
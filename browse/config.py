@@ -46,6 +46,10 @@ class Settings(BaseSettings):
     """Sets if LATEXML is enabled or not"""
 
     LATEXML_BUCKET: str = os.environ.get('LATEXML_BUCKET', 'latexml_arxiv_id_converted')
+    """GS bucket name of the LaTeXML HTML conversions.
+
+    This may also be a `gs://` or file system path, ex. `./tests/data/latexml/`
+    for testing."""
 
     LATEXML_BASE_URL: str = ''
     """Base GS bucket URL to find the HTML."""
@@ -87,6 +91,35 @@ class Settings(BaseSettings):
     """SQLALCHEMY_MAX_OVERFLOW is set from BROWSE_SQLALCHEMY_MAX_OVERFLOW.
     Ignored under sqlite."""
 
+    SQLALCHEMY_POOL_TIMEOUT: Optional[int] = None
+    """Seconds to wait for a connection from the pool before giving up.
+    Ignored under sqlite."""
+
+    SQLALCHEMY_POOL_RECYCLE: Optional[int] = None
+    """Seconds after which a pooled connection is replaced. Should be less
+    than the DB's `wait_timeout`. Ignored under sqlite."""
+
+    SQLALCHEMY_POOL_PRE_PING: bool = False
+    """Test each connection when it is checked out of the pool and replace it
+    if the DB has closed it."""
+
+    LATEXML_POOL_SIZE: int = 5
+    """Pool size of the latexml DB connection."""
+
+    LATEXML_MAX_OVERFLOW: int = 2
+    """Max overflow of the pool of the latexml DB connection."""
+
+    LATEXML_POOL_TIMEOUT: int = 5
+    """Seconds to wait for a latexml DB connection. This is short since the
+    abs and list pages can be shown without the latexml status."""
+
+    LATEXML_POOL_RECYCLE: int = 1800
+    """Seconds after which a latexml DB connection is replaced. The Cloud SQL
+    connections are closed by the server when idle too long."""
+
+    LATEXML_POOL_PRE_PING: bool = True
+    """Test each latexml DB connection when it is checked out of the pool."""
+
     BROWSE_DISABLE_DATABASE: bool = False
     """Disable DB queries even if other SQLAlchemy config are defined
     This, for example, could be used in conjunction with the
@@ -94,6 +127,10 @@ class Settings(BaseSettings):
     where we know the DB is unavailable and thus intentionally bypass
     any DB access."""
 
+    BROWSE_DB_MEMO_HEADERS: bool = False
+    """Add the hits and misses of the request memo of the DB functions as
+    `X-Browse-DB-Memo-*` response headers, they are always added in debug."""
+
     BROWSE_DAILY_STATS_PATH: str = "tests/data/daily_stats"
     """The classic home page uses this file to get the total paper count
     The file contains one line, with key "total_papers" and an integer, e.g.
@@ -131,6 +168,27 @@ class Settings(BaseSettings):
     This can start with gs:// to use Google Storage.
     Ex gs://arxiv-production-data/ftp."""
 
+    DOCUMENT_LISTING_CACHE_MAX_ENTRIES: int = 500
+    """Max number of parsed new and pastweek listing files to keep in memory per
+    worker process.
+
+    Only used by `browse.services.listing.fs_listing`. Set to 0 to disable the
+    cache."""
+
+    DOCUMENT_LISTING_CACHE_REVALIDATE_SECONDS: int = 30
+    """Seconds to use a cached parsed listing before checking if the file has
+    changed.
+
+    During the publish window a stale listing is served while this check is
+    done in the background."""
+
+    DOCUMENT_LISTING_CACHE_DIR: str = ""
+    """Local directory to share parsed listings between the worker processes on
+    a host.
+
+    Empty to only cache in memory. This must only be writable by the user
+    browse runs as."""
+
 
     DOCUMENT_ABSTRACT_SERVICE: PyObject = 'browse.services.documents.fs_docs'  # type: ignore
     """Implementation to use for abstracts.
@@ -155,6 +213,24 @@ class Settings(BaseSettings):
     DOCUMENT_CACHE_PATH: str =  "tests/data/cache"
     """Path to cache directory"""
 
+    DOCUMENT_ABS_CACHE_MAX_ENTRIES: int = 5000
+    """Max number of parsed .abs files to keep in memory per worker process.
+
+    Only used by `browse.services.documents.fs_docs`. Set to 0 to disable the
+    cache."""
+
+    DOCUMENT_ABS_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    """Approximate max memory in bytes used by the parsed .abs cache."""
+
+    DOCUMENT_ABS_CACHE_REVALIDATE_SECONDS: int = 30
+    """Seconds to use a cached parsed .abs before checking if the file has
+    changed."""
+
+    DOCUMENT_ABS_FETCH_THREADS: int = 8
+    """Max threads used to read .abs files in parallel for listing pages.
+
+    Only used by `browse.services.documents.fs_docs`."""
+
     DISSEMINATION_STORAGE_PREFIX: str = "./tests/data/abs_files/"
     """Storage prefix to use. Ex gs://arxiv-production-data
 
@@ -165,6 +241,63 @@ class Settings(BaseSettings):
     `./testing/data/` for testing data. Must end with a /
     """
 
+    DISSEMINATION_SENDFILE: str = ""
+    """How to send files from a local `DISSEMINATION_STORAGE_PREFIX`.
+
+    Empty streams the file through Python. `sendfile` uses `send_file()` so
+    the WSGI server can use sendfile(2), or `X-Sendfile` if Flask's
+    `USE_X_SENDFILE` is set. `x-accel-redirect` lets nginx send the file, see
+    `DISSEMINATION_X_ACCEL_PREFIX`. These do not apply to GS."""
+
+    DISSEMINATION_X_ACCEL_PREFIX: str = "/protected/"
+    """nginx internal location that maps to `DISSEMINATION_STORAGE_PREFIX`."""
+
+    OBJECT_STORE_CACHE_DIR: str = ""
+    """Local directory, ex. on a tmpfs, to keep copies of the GS objects that
+    are opened, empty to not keep copies.
+
+    Each GS store used gets its own subdirectory. See
+    `browse.services.object_store.object_store_cache`."""
+
+    OBJECT_STORE_CACHE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+    """Max bytes of copies to keep for each GS store in each process."""
+
+    OBJECT_STORE_CACHE_MAX_OBJECT_BYTES: int = 256 * 1024 * 1024
+    """Objects larger than this are streamed from GS and not copied."""
+
+    GZIP_SIZE_CACHE_DIR: str = ""
+    """Directory to save the uncompressed sizes of large gzip files in, empty
+    to only keep them in memory.
+
+    Sizes of gzip files under about 4MB are read from the gzip trailer, larger
+    files are decompressed once to get their size."""
+
+    DISSEMINATION_INDEX_PATH: str = ""
+    """Path to the SQLite dissemination index, empty to not use an index.
+
+    The index is made at announce time by
+    `script/sync_prod_to_gcp/dissem_index.py` and lets the source of a paper
+    be found without listing the storage."""
+
+    DISSEMINATION_PROBE_THREADS: int = 16
+    """Threads used to try the possible keys of a PDF, PS or source at the
+    same time, shared by all requests. Set to 1 to try them one after another.
+    """
+
+    DISSEMINATION_LOCATION_CACHE_MAX_ENTRIES: int = 20000
+    """Max number of PDF locations to cache, set to 0 to disable.
+
+    This avoids probing several keys in the storage for repeated requests of
+    the same PDF. Entries never outlive the next announcement."""
+
+    DISSEMINATION_LOCATION_CACHE_FOUND_SECONDS: int = 60 * 60 * 12
+    """Max seconds to cache the key a PDF was found at."""
+
+    DISSEMINATION_LOCATION_CACHE_MISSING_SECONDS: int = 300
+    """Max seconds to cache that no PDF was found.
+
+    Keep this short since PDFs are built on demand."""
+
     ######################### End of Services ###########################
 
     SHOW_EMAIL_SECRET: SecretStr = SecretStr(token_hex(10))
@@ -409,6 +542,8 @@ class Settings(BaseSettings):
                 log.warning(f"using SQLite DB at {self.SQLALCHEMY_DATABASE_URI}")
             self.SQLALCHEMY_MAX_OVERFLOW = None
             self.SQLALCHEMY_POOL_SIZE = None
+            self.SQLALCHEMY_POOL_TIMEOUT = None
+            self.SQLALCHEMY_POOL_RECYCLE = None
 
         if (os.environ.get("FLASK_ENV", False) == "production"
                 and "sqlite" in self.SQLALCHEMY_DATABASE_URI):
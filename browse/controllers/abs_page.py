@@ -28,14 +28,7 @@ from browse.domain.identifier import (
 )
 from browse.domain.metadata import DocMetadata
 from browse.exceptions import AbsNotFound
-from browse.services.database import (
-    count_trackback_pings,
-    get_datacite_doi,
-    get_dblp_authors,
-    get_dblp_listing_path,
-    get_trackback_ping_latest_date,
-    get_latexml_publish_dt,
-)
+from browse.services.database import AbsPageBundle, get_abs_page_bundle, get_latexml_versions
 from browse.services.documents import get_doc_service
 from browse.services.documents.format_codes import formats_from_source_flag
 
@@ -114,9 +107,12 @@ def get_abs_page(arxiv_id: str) -> Response:
             return redirect
 
         abs_meta = get_doc_service().get_abs(arxiv_identifier)
-        not_modified = _check_request_headers(abs_meta, response_data, response_headers)
+        # Only the LaTeXML publish times are needed to check for not modified
+        latexml = get_latexml_versions(abs_meta.arxiv_id)
+        not_modified = _check_request_headers(abs_meta, latexml, response_data, response_headers)
         if not_modified:
             return {}, status.NOT_MODIFIED, response_headers
+        db_data = get_abs_page_bundle(abs_meta.arxiv_id, latexml=latexml)
 
         response_data["requested_id"] = (
             arxiv_identifier.idv
@@ -134,7 +130,7 @@ def get_abs_page(arxiv_id: str) -> Response:
             archive=abs_meta.primary_archive.id,
             query=author_query,
         )
-        response_data['latexml_url'] = get_latexml_url(abs_meta)
+        response_data['latexml_url'] = get_latexml_url(abs_meta, bundle=db_data)
 
         # Dissemination formats for download links
         response_data["formats"] = abs_meta.get_requested_version().formats()
@@ -155,7 +151,7 @@ def get_abs_page(arxiv_id: str) -> Response:
                     response_data["higher_version_withdrawn_submitter"] = _get_submitter(abs_meta.arxiv_identifier,
                                                                                          ver.version)
 
-        _non_critical_abs_data(abs_meta, arxiv_identifier, response_data)
+        _non_critical_abs_data(abs_meta, arxiv_identifier, db_data, response_data)
 
     except AbsNotFoundException as ex:
         if (arxiv_identifier.is_old_id
@@ -204,16 +200,15 @@ def get_abs_page(arxiv_id: str) -> Response:
 
 
 def _non_critical_abs_data(
-    abs_meta: DocMetadata, arxiv_identifier: Identifier, response_data: Dict
+    abs_meta: DocMetadata, arxiv_identifier: Identifier, db_data: AbsPageBundle,
+    response_data: Dict
 ) -> None:
     """Get additional non-essential data for the abs page."""
     # The DBLP listing and trackback counts depend on the DB.
-    response_data["dblp"] = _check_dblp(abs_meta)
-    response_data["trackback_ping_count"] = count_trackback_pings(arxiv_identifier.id)
+    response_data["dblp"] = _check_dblp(abs_meta, db_data)
+    response_data["trackback_ping_count"] = db_data.trackback_ping_count
     if response_data["trackback_ping_count"] > 0:
-        response_data["trackback_ping_latest"] = get_trackback_ping_latest_date(
-            arxiv_identifier.id
-        )
+        response_data["trackback_ping_latest"] = db_data.trackback_ping_latest
 
     # Include INSPIRE link in references & citations section
     response_data["include_inspire_link"] = include_inspire_link(abs_meta)
@@ -224,18 +219,17 @@ def _non_critical_abs_data(
     _prevnext_links(arxiv_identifier, abs_meta.primary_category, response_data)
 
     response_data["is_covid_match"] = _is_covid_match(abs_meta)
-    response_data["datacite_doi"] = get_datacite_doi(
-        paper_id=abs_meta.arxiv_id
-    )
+    response_data["datacite_doi"] = db_data.datacite_doi
 
 
 def _check_request_headers(
-    docmeta: DocMetadata, response_data: Dict[str, Any], resp_headers: Dict[str, Any]
+    docmeta: DocMetadata, latexml: Dict[int, Tuple[int, Optional[datetime]]],
+    response_data: Dict[str, Any], resp_headers: Dict[str, Any]
 ) -> bool:
     """Check the request headers, update the response headers accordingly."""
     version = docmeta.get_version()
     if version:
-        html_updated = get_latexml_publish_dt(docmeta.arxiv_id, version.version) or datetime.min.replace(tzinfo=timezone.utc)
+        html_updated = latexml.get(version.version, (None, None))[1] or datetime.min.replace(tzinfo=timezone.utc)
     else:
         html_updated = datetime.min.replace(tzinfo=timezone.utc)
     last_mod_dt: datetime = max(html_updated, docmeta.modified)
@@ -355,7 +349,8 @@ def _is_covid_match(docmeta: DocMetadata) -> bool:
     return False
 
 
-def _check_dblp(docmeta: DocMetadata, db_override: bool = False) -> Optional[Dict]:
+def _check_dblp(docmeta: DocMetadata, db_data: AbsPageBundle,
+                db_override: bool = False) -> Optional[Dict]:
     """Check whether paper has DBLP Bibliography entry."""
     if not include_dblp_section(docmeta):
         return None
@@ -366,16 +361,12 @@ def _check_dblp(docmeta: DocMetadata, db_override: bool = False) -> Optional[Dic
     if db_override:
         listing_path = get_computed_dblp_listing_path(docmeta)
     else:
-        try:
-            if identifier.id is None:
-                return None
-            listing_path = get_dblp_listing_path(identifier.id)
-            if not listing_path:
-                return None
-            author_list = get_dblp_authors(identifier.id)
-        except IOError:
-            # log this
+        if identifier.id is None:
+            return None
+        listing_path = db_data.dblp_listing_path
+        if not listing_path:
             return None
+        author_list = db_data.dblp_authors
     if listing_path is not None:
         bibtex_path = get_dblp_bibtex_path(listing_path)
     else:
@@ -11,6 +11,7 @@ from browse.services.dissemination.article_store import Deleted
 from browse.services.documents import get_doc_service
 from browse.services.object_store import FileObj
 from browse.services.object_store.fileobj import FileFromTar
+from browse.services.object_store.tar_index import find_tar_index
 
 from . import last_modified, add_time_headers, add_mimetype
 
@@ -58,7 +59,8 @@ def get_extracted_src_file_resp(arxiv_id_str: str,
         abort(500, description="Unexpected result for source")
 
     src_file: FileObj = dis_res[0]
-    tarmember = FileFromTar(src_file, path)
+    tar_index = find_tar_index(src_file) if src_file.name.endswith('.tar.gz') else None
+    tarmember = FileFromTar(src_file, path, tar_index)
     if not tarmember.exists():
         return make_response(
             render_template("src/anc_not_found.html",
@@ -17,7 +17,7 @@ from browse.domain import fileformat
 from browse.controllers.files import last_modified, add_time_headers, add_mimetype, \
     download_file_base, maxage, withdrawn, unavailable, not_pdf, no_html, not_found, bad_id, cannot_build_pdf
 
-from browse.services.object_store.fileobj import FileObj, FileTransform
+from browse.services.object_store.fileobj import FileObj, FileTransform, LocalFileObj
 
 from browse.services.html_processing import post_process_html
 
@@ -25,7 +25,8 @@ from browse.services.dissemination import get_article_store
 from browse.services.dissemination.article_store import (
     Acceptable_Format_Requests, CannotBuildPdf, Deleted)
 
-from flask import Response, abort, make_response, render_template, request
+from flask import (Response, abort, current_app, make_response,
+                   render_template, request, send_file)
 from flask_rangerequest import RangeRequest
 
 
@@ -59,7 +60,10 @@ def default_resp_fn(format: Optional[FileFormat],
         Any extra after the normal URL path part. For use in anc files or html files.
     """
     resp: Response = Response()
-    if request.method == 'GET' and 'range' in [hk.lower() for hk in request.headers.keys()]:
+    local_resp = _local_file_resp(file)
+    if local_resp is not None:
+        resp = local_resp
+    elif request.method == 'GET' and 'range' in [hk.lower() for hk in request.headers.keys()]:
         # Fastly requires Range response to cache large objects (>20MB),
         # Cloud run requires response larger than 20MB to be chunked but Range response will be smaller.
         resp = RangeRequest(file.open('rb'),
@@ -97,6 +101,47 @@ def default_resp_fn(format: Optional[FileFormat],
     return resp
 
 
+def _local_file_resp(file: FileObj) -> Optional[Response]:
+    """Makes a response that lets the server send a local file without copying it through Python.
+
+    Uses `DISSEMINATION_SENDFILE`:
+
+    - `sendfile`: `send_file()` so the WSGI server's file wrapper can use
+      sendfile(2). With Flask's `USE_X_SENDFILE` this sends `X-Sendfile`
+      instead. Range and conditional requests are handled by werkzeug.
+    - `x-accel-redirect`: an empty response with `X-Accel-Redirect` for nginx
+      to serve the file, nginx handles range requests.
+
+    Returns `None` if `file` is not a `LocalFileObj` or the mode is not set, in
+    which case the file should be streamed as usual."""
+    mode = current_app.config.get("DISSEMINATION_SENDFILE", "")
+    if not mode or not isinstance(file, LocalFileObj):
+        return None
+
+    path = file.item.resolve()
+    if mode == "sendfile":
+        resp = send_file(path, conditional=True, etag=file.etag,
+                         last_modified=file.updated, max_age=None)
+        resp.headers["Accept-Ranges"] = "bytes"
+        return resp
+    elif mode == "x-accel-redirect":
+        root = Path(current_app.config["DISSEMINATION_STORAGE_PREFIX"]).resolve()
+        try:
+            relative = path.relative_to(root)
+        except ValueError:
+            logger.warning("Not using X-Accel-Redirect for %s, it is not in %s", path, root)
+            return None
+        resp = Response(status=200)
+        prefix = current_app.config.get("DISSEMINATION_X_ACCEL_PREFIX", "/protected/")
+        resp.headers["X-Accel-Redirect"] = prefix.rstrip('/') + '/' + relative.as_posix()
+        resp.set_etag(file.etag)
+        resp.headers["Last-Modified"] = last_modified(file)
+        resp.headers["Accept-Ranges"] = "bytes"
+        return resp
+    else:
+        raise ValueError(f"Unknown DISSEMINATION_SENDFILE mode {mode}")
+
+
 def _src_response(format: FileFormat,
                   file: FileObj,
                   arxiv_id: Identifier,
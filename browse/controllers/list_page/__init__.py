@@ -59,7 +59,7 @@ from browse.services.documents.format_codes import formats_from_source_flag
 from browse.services.listing import (Listing, ListingNew, NotModifiedResponse,
                                      get_listing_service, ListingItem)
 
-from browse.formatting.latexml import get_latexml_url
+from browse.formatting.latexml import get_latexml_url, get_latexml_urls
 
 from flask import request, url_for, redirect
 from werkzeug.exceptions import BadRequest, NotFound
@@ -268,11 +268,14 @@ def get_listing(subject_or_category: str,
 
     idx = 0
 
+    missing = [item.id for item in listings
+               if not hasattr(item, 'article') or item.article is None]
+    articles = abs_for_articles(missing)
     for item in listings:
         idx = idx + 1
         setattr(item, 'list_index', idx + skipn)
         if not hasattr(item, 'article') or item.article is None:
-            setattr(item, 'article', get_doc_service().get_abs(item.id))
+            setattr(item, 'article', articles[item.id])
 
     response_data['listings'] = listings
     response_data['author_links'] = authors_for_articles(listings)
@@ -391,8 +394,7 @@ def latexml_links_for_article (article: DocMetadata)->Dict[str, Any]:
 
 def latexml_links_for_articles (listings: List[Any])->Dict[str, Any]:
     """Returns a Dict of article id to latexml links"""
-    return {item.article.arxiv_id_v: get_latexml_url(item.article, True)
-                for item in listings}
+    return get_latexml_urls([item.article for item in listings], True)
 
 def authors_for_article(article: DocMetadata)->Dict[str, Any]:
     """Returns a Dict of article id to author links."""
@@ -404,6 +406,19 @@ def authors_for_articles(listings: List[Any])->Dict[str, Any]:
             for item in listings}
 
 
+def abs_for_articles(ids: List[str]) -> Dict[str, DocMetadata]:
+    """Gets the `DocMetadata` for `ids` with a single batch call.
+
+    Any id missing from the batch is fetched again with `get_abs` so that the
+    same exceptions are raised as when getting them one at a time."""
+    doc_service = get_doc_service()
+    articles = doc_service.get_abs_many(ids) if ids else {}
+    for arxiv_id in ids:
+        if arxiv_id not in articles:
+            articles[arxiv_id] = doc_service.get_abs(arxiv_id)
+    return articles
+
+
 def author_links(abs_meta: DocMetadata) -> Tuple[AuthorList, AuthorList, int]:
     """Creates author list links in a very similar way to abs page."""
     raw = abs_meta.authors.raw
@@ -21,9 +21,8 @@ from ...services.database import (
     get_orcid_by_user_id,
     get_articles_for_author
 )
-from browse.services.documents import get_doc_service
-
 from browse.controllers.list_page import (
+    abs_for_articles,
     dl_for_articles, 
     latexml_links_for_articles,
     authors_for_articles,
@@ -47,8 +46,10 @@ def get_json (id: str) -> Optional[Dict]:
         return None
 
     entries = []
-    for li in get_articles_for_author(user_id):
-        entries.append(_make_json_entry(get_doc_service().get_abs(li.id)))
+    listings = get_articles_for_author(user_id)
+    articles = abs_for_articles([li.id for li in listings])
+    for li in listings:
+        entries.append(_make_json_entry(articles[li.id]))
 
     if is_orcid:
         orcid = f'{ORCID_URI_PREFIX}/{unquote(id)}'
@@ -79,8 +80,9 @@ def get_html_page (id: str) -> Tuple[Dict[str, Optional[Any]], int, Dict[str, st
     response_data['title'] = f'{response_data["display_name"]}\'s articles on arXiv'
 
     listings = get_articles_for_author(user_id)
+    articles = abs_for_articles([item.id for item in listings])
     for i, item in enumerate(listings):
-        setattr(item, 'article', get_doc_service().get_abs(item.id))
+        setattr(item, 'article', articles[item.id])
         setattr(item, 'list_index', i + 1)
 
     response_data['abstracts'] = listings
@@ -307,8 +309,10 @@ def _get_atom_feed (id: str, atom2: bool = False) -> str:
                     'href': f'{request.url_root}{id}'
                 })
     
-    for li in get_articles_for_author(user_id):
-        _add_atom_feed_entry(get_doc_service().get_abs(li.id), feed, atom2)
+    listings = get_articles_for_author(user_id)
+    articles = abs_for_articles([li.id for li in listings])
+    for li in listings:
+        _add_atom_feed_entry(articles[li.id], feed, atom2)
 
     return tostring(feed, pretty_print=True, xml_declaration=True, encoding='UTF-8')  # type: ignore
     
@@ -3,7 +3,7 @@ import re
 from collections import abc
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Iterator, List, Optional, Set, Literal, Sequence
+from typing import Iterator, List, Optional, Set, Literal, Sequence, Tuple
 
 from arxiv import taxonomy
 from arxiv.base.urls import canonical_url
@@ -26,6 +26,10 @@ class Submitter:
 
     __slots__ = ['name', 'email']
 
+    def __reduce__(self) -> Tuple[type, Tuple[str, str]]:
+        """Pickle by value, the default for slots does not work when frozen."""
+        return (Submitter, (self.name, self.email))
+
 
 @dataclass(frozen=True)
 class AuthorList:
@@ -40,6 +44,10 @@ class AuthorList:
         """Return the string representation of AuthorList."""
         return self.raw
 
+    def __reduce__(self) -> Tuple[type, Tuple[str]]:
+        """Pickle by value, the default for slots does not work when frozen."""
+        return (AuthorList, (self.raw,))
+
 
 class Archive(taxonomy.Archive):
     """Represents an arXiv archive--the middle level of the taxonomy."""
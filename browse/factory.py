@@ -18,8 +18,8 @@ from flask_s3 import FlaskS3
 
 from browse.config import Settings
 from browse.routes import ui, dissemination, src, unimplemented, redirects
-from browse.commands import invalidate, check_paper_formats
-from browse.services.database import models
+from browse.commands import invalidate, check_paper_formats, listings
+from browse.services.database import init_request_memo, models
 from browse.services.check import service_statuses
 from browse.formatting.email import generate_show_email_hash
 from browse.filters import entity_to_utf
@@ -40,6 +40,7 @@ def create_web_app(**kwargs) -> Flask: # type: ignore
     app.config.from_object(settings)
 
     models.init_app(app)  # type: ignore
+    init_request_memo(app)
     Base(app)
     #Auth(app)
 
@@ -53,6 +54,7 @@ def create_web_app(**kwargs) -> Flask: # type: ignore
     # commands
     app.register_blueprint(invalidate.bp)
     app.register_blueprint(check_paper_formats.bp)
+    app.register_blueprint(listings.bp)
 
     s3.init_app(app)
 
@@ -1,20 +1,39 @@
-from typing import Optional
+from typing import Dict, List, Optional
 
 from flask import current_app
 
 from browse.domain.metadata import DocMetadata
 
-from browse.services.database import get_latexml_status_for_document
+from browse.services.database import (AbsPageBundle, get_latexml_status_for_document,
+                                      get_latexml_statuses)
 
 import logging
 
-def get_latexml_url (article: DocMetadata, most_recent: bool=False) -> Optional[str]:
+def get_latexml_url (article: DocMetadata, most_recent: bool=False,
+                     bundle: Optional[AbsPageBundle]=None) -> Optional[str]:
+    """The LaTeXML URL of `article`, the status is from `bundle` if given."""
     if not current_app.config["LATEXML_ENABLED"]:
         return None
-    LATEXML_URI_BASE = current_app.config['LATEXML_BASE_URL']
-    status = get_latexml_status_for_document(article.arxiv_id, article.highest_version()) if most_recent \
-             else get_latexml_status_for_document(article.arxiv_id, article.version)
+    version = article.highest_version() if most_recent else article.version
+    status = bundle.latexml_status(version) if bundle is not None \
+             else get_latexml_status_for_document(article.arxiv_id, version)
     logging.debug(f'{article.arxiv_id_v} version: {article.version}, highest_version: {article.highest_version()}')
+    return _latexml_url(article, status)
+
+def get_latexml_urls (articles: List[DocMetadata], most_recent: bool=False) -> Dict[str, Optional[str]]:
+    """The LaTeXML URL of each of `articles` by `arxiv_id_v`.
+
+    Same as `get_latexml_url` for each article but with a single query."""
+    if not current_app.config["LATEXML_ENABLED"]:
+        return {article.arxiv_id_v: None for article in articles}
+    versions = {article.arxiv_id_v:
+                (article.arxiv_id, article.highest_version() if most_recent else article.version)
+                for article in articles}
+    statuses = get_latexml_statuses(versions.values())
+    return {article.arxiv_id_v: _latexml_url(article, statuses.get(versions[article.arxiv_id_v]))
+            for article in articles}
+
+def _latexml_url (article: DocMetadata, status: Optional[int]) -> Optional[str]:
+    LATEXML_URI_BASE = current_app.config['LATEXML_BASE_URL']
     path = f'html/{article.arxiv_id}v{article.version}'
     return f'{LATEXML_URI_BASE}/{path}' if status == 1 else None
-
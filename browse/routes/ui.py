@@ -36,6 +36,7 @@ from browse.controllers.openurl_cookie import make_openurl_cookie, get_openurl_p
 from browse.controllers.cookies import get_cookies_page, cookies_to_set
 from browse.exceptions import AbsNotFound
 from browse.services.database import get_institution
+from browse.services.database.models import db
 from browse.controllers.year import year_page
 from browse.controllers.bibtexcite import bibtex_citation
 from browse.controllers.list_page import author
@@ -242,6 +243,12 @@ def list_articles(context: str, subcontext: str) -> Response:
     return response, code, headers  # type: ignore
 
 
+@blueprint.route("status/db_pools", methods=["GET"])
+def db_pool_status() -> Tuple[Dict[str, Any], int, Dict[str, Any]]:
+    """Checkout latency, in use and overflow counts of the DB connection pools."""
+    return db.pool_status(), status.OK, {"Cache-Control": "no-store"}
+
+
 @blueprint.route("stats/main", methods=["GET"])
 def main() -> Response:
     """Display the stats main page."""
@@ -2,10 +2,12 @@
 # pylint disable=no-member
 
 import ipaddress
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import date, datetime, timezone
-from typing import Any, Callable, List, Mapping, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
 
-from flask import current_app
+from flask import Flask, Response, current_app, g, has_request_context
 
 from arxiv.base.globals import get_application_config
 from dateutil.tz import gettz, tzutc
@@ -46,9 +48,42 @@ logger = logging.getLogger(__name__)
 app_config = get_application_config()
 tz = gettz(app_config.get("ARXIV_BUSINESS_TZ"))
 
+MAX_LATEXML_IDS_PER_QUERY = 1000
+"""Max paper ids in the `IN (...)` of a single query in `get_latexml_statuses`."""
 
-def db_handle_error(db_logger: Logger, default_return_val: Any) -> Any:
-    """Handle operational database errors via decorator."""
+
+class RequestMemo():
+    """Results of the memoized DB functions for the current request."""
+
+    def __init__(self) -> None:
+        self.results: Dict[Any, Any] = {}
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+
+
+def _request_memo() -> RequestMemo:
+    if "_db_memo" not in g:
+        g._db_memo = RequestMemo()
+    memo: RequestMemo = g._db_memo
+    return memo
+
+
+def _memo_key(func_to_wrap: Callable, args: Tuple, kwargs: Dict) -> Any:
+    """Key of a call, or `None` if the args cannot be used as a key."""
+    key = (func_to_wrap, args, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def db_handle_error(db_logger: Logger, default_return_val: Any, memoize: bool = False) -> Any:
+    """Handle operational database errors via decorator.
+
+    With `memoize` the result of a call is kept until the end of the Flask
+    request and calls with the same args get it without a query. Results
+    are not kept outside of a request or when there is an error."""
 
     def decorator(func_to_wrap: Callable) -> Any:
         def wrapper(*args, **kwargs):  # type: ignore
@@ -58,8 +93,16 @@ def db_handle_error(db_logger: Logger, default_return_val: Any) -> Any:
                 if db_logger:
                     db_logger.info("Database is disabled per BROWSE_DISABLE_DATABASE")
                 return default_return_val
+            key = _memo_key(func_to_wrap, args, kwargs) \
+                if memoize and has_request_context() else None
+            if key is not None:
+                memo = _request_memo()
+                if key in memo.results:
+                    memo.hits[func_to_wrap.__name__] += 1
+                    return memo.results[key]
+                memo.misses[func_to_wrap.__name__] += 1
             try:
-                return func_to_wrap(*args, **kwargs)
+                result = func_to_wrap(*args, **kwargs)
             except NoResultFound:
                 return default_return_val
             except (OperationalError, DBAPIError) as ex:
@@ -70,12 +113,38 @@ def db_handle_error(db_logger: Logger, default_return_val: Any) -> Any:
                 if db_logger:
                     db_logger.warning(f"Unknown exception in {func_to_wrap.__name__}: {ex}")
                 raise
+            if key is not None:
+                memo.results[key] = result
+            return result
 
         return wrapper
 
     return decorator
 
 
+def init_request_memo(app: Flask) -> None:
+    """Starts a new `RequestMemo` for each request of `app`.
+
+    If `app` is in debug mode or `BROWSE_DB_MEMO_HEADERS` is set the hits
+    and misses of the memo are added to the response headers."""
+
+    @app.before_request
+    def reset_request_memo() -> None:
+        g.pop("_db_memo", None)
+
+    @app.after_request
+    def request_memo_headers(response: Response) -> Response:
+        memo = g.get("_db_memo")
+        if memo is None or not (app.debug or app.config.get("BROWSE_DB_MEMO_HEADERS")):
+            return response
+        response.headers["X-Browse-DB-Memo-Hits"] = str(sum(memo.hits.values()))
+        response.headers["X-Browse-DB-Memo-Misses"] = str(sum(memo.misses.values()))
+        response.headers["X-Browse-DB-Memo-Detail"] = ", ".join(
+            f"{name}={memo.hits[name]}/{memo.hits[name] + memo.misses[name]}"
+            for name in sorted(memo.hits.keys() | memo.misses.keys()))
+        return response
+
+
 def __all_trackbacks_query() -> Query:
     return db.session.query(TrackbackPing)
 
@@ -182,7 +251,7 @@ def get_recent_trackback_pings(max_trackbacks: int = 25) \
 
 
 #Used on abs page
-@db_handle_error(db_logger=logger, default_return_val=None)
+@db_handle_error(db_logger=logger, default_return_val=None, memoize=True)
 def get_trackback_ping_latest_date(paper_id: str) -> Optional[datetime]:
     """Get the most recent accepted trackback datetime for a paper_id."""
     timestamp: int = db.session.query(func.max(TrackbackPing.approved_time)).filter(
@@ -196,7 +265,7 @@ def get_trackback_ping_latest_date(paper_id: str) -> Optional[datetime]:
 
 
 # used on abs page
-@db_handle_error(db_logger=logger, default_return_val=0)
+@db_handle_error(db_logger=logger, default_return_val=0, memoize=True)
 def count_trackback_pings(paper_id: str) -> int:
     """Count trackback pings for a particular document (paper_id)."""
     row = (
@@ -222,7 +291,7 @@ def count_all_trackback_pings() -> int:
 
 
 # used in abs page
-@db_handle_error(db_logger=logger, default_return_val=None)
+@db_handle_error(db_logger=logger, default_return_val=None, memoize=True)
 def get_dblp_listing_path(paper_id: str) -> Optional[str]:
     """Get the DBLP Bibliography URL for a given document (paper_id)."""
     url: str = db.session.query(DBLP.url).join(Document).filter(
@@ -232,7 +301,7 @@ def get_dblp_listing_path(paper_id: str) -> Optional[str]:
 
 
 # used in abs page
-@db_handle_error(db_logger=logger, default_return_val=[])
+@db_handle_error(db_logger=logger, default_return_val=[], memoize=True)
 def get_dblp_authors(paper_id: str) -> List[str]:
     """Get sorted list of DBLP authors for a given document (paper_id)."""
     authors_t = (
@@ -438,7 +507,7 @@ def get_max_download_stats_dt() -> Optional[datetime]:
     return row.max_ym if row else None
 
 
-@db_handle_error(db_logger=logger, default_return_val=None)
+@db_handle_error(db_logger=logger, default_return_val=None, memoize=True)
 def get_datacite_doi(paper_id: str, account: str = "prod") -> Optional[str]:
     """Get the DataCite DOI for a given paper ID."""
     row = (
@@ -473,7 +542,7 @@ def service_status()->List[str]:
     return []
 
 
-@db_handle_error(db_logger=logger, default_return_val=None)
+@db_handle_error(db_logger=logger, default_return_val=None, memoize=True)
 def get_latexml_status_for_document(paper_id: str, version: int = 1) -> Optional[int]:
     """Get latexml conversion status for a given paper_id and version"""
     row = (
@@ -484,7 +553,31 @@ def get_latexml_status_for_document(paper_id: str, version: int = 1) -> Optional
     )
     return row.conversion_status if row else None
 
-@db_handle_error(db_logger=logger, default_return_val=None)
+@db_handle_error(db_logger=logger, default_return_val={})
+def get_latexml_statuses(papers: Iterable[Tuple[str, int]]) -> Dict[Tuple[str, int], int]:
+    """Get latexml conversion status for several (paper_id, version).
+
+    This is a single query for up to `MAX_LATEXML_IDS_PER_QUERY` papers. The
+    (paper_id, version) that have no conversion are left out."""
+    wanted = set(papers)
+    paper_ids = list({paper_id for paper_id, _ in wanted})
+    statuses: Dict[Tuple[str, int], int] = {}
+    for start in range(0, len(paper_ids), MAX_LATEXML_IDS_PER_QUERY):
+        rows = (
+            db.session.query(DBLaTeXMLDocuments.paper_id,
+                             DBLaTeXMLDocuments.document_version,
+                             DBLaTeXMLDocuments.conversion_status)
+            .filter(DBLaTeXMLDocuments.paper_id.in_(
+                paper_ids[start:start + MAX_LATEXML_IDS_PER_QUERY]))
+            .all()
+        )
+        for row in rows:
+            key = (row.paper_id, row.document_version)
+            if key in wanted:
+                statuses[key] = row.conversion_status
+    return statuses
+
+@db_handle_error(db_logger=logger, default_return_val=None, memoize=True)
 def get_latexml_publish_dt (paper_id: str, version: int = 1) -> Optional[datetime]:
     if not current_app.config["LATEXML_ENABLED"]:
         return None
@@ -501,6 +594,116 @@ def get_latexml_publish_dt (paper_id: str, version: int = 1) -> Optional[datetim
         return None
 
 
+@dataclass(frozen=True)
+class AbsPageBundle:
+    """The data from the DB for an abs page other than its metadata.
+
+    These used to be gotten with a query each by `count_trackback_pings`,
+    `get_trackback_ping_latest_date`, `get_dblp_listing_path`,
+    `get_dblp_authors`, `get_datacite_doi`, `get_latexml_publish_dt` and
+    `get_latexml_status_for_document`. See `get_abs_page_bundle`."""
+
+    trackback_ping_count: int = 0
+    trackback_ping_latest: Optional[datetime] = None
+    dblp_listing_path: Optional[str] = None
+    dblp_authors: List[str] = field(default_factory=list)
+    datacite_doi: Optional[str] = None
+    latexml: Dict[int, Tuple[int, Optional[datetime]]] = field(default_factory=dict)
+    """LaTeXML conversion status and publish time of each version."""
+
+    def latexml_status(self, version: int) -> Optional[int]:
+        """Same as `get_latexml_status_for_document` for `version`."""
+        return self.latexml[version][0] if version in self.latexml else None
+
+    def latexml_publish_dt(self, version: int) -> Optional[datetime]:
+        """Same as `get_latexml_publish_dt` for `version`."""
+        return self.latexml[version][1] if version in self.latexml else None
+
+
+# used in abs page
+def get_latexml_versions(paper_id: str) -> Dict[int, Tuple[int, Optional[datetime]]]:
+    """LaTeXML conversion status and publish time of each version of a paper_id.
+
+    This is the LaTeXML part of `get_abs_page_bundle`, it is one query of
+    the LaTeXML DB."""
+    return _get_latexml_versions(paper_id) or {}
+
+
+# used in abs page
+def get_abs_page_bundle(paper_id: str, datacite_account: str = "prod",
+                        latexml: Optional[Dict[int, Tuple[int, Optional[datetime]]]] = None) -> AbsPageBundle:
+    """Get the `AbsPageBundle` for a paper_id.
+
+    This is one query of the main DB, a second only if the paper has a DBLP
+    listing, and one query of the LaTeXML DB for all versions of the paper.
+    That query is skipped if `latexml` from `get_latexml_versions` is passed.
+    As with the individual functions, a part that cannot be gotten from the
+    DB has its default value."""
+    if latexml is None:
+        latexml = get_latexml_versions(paper_id)
+    row = _get_abs_page_row(paper_id, datacite_account)
+    if row is None:
+        return AbsPageBundle(latexml=latexml)
+
+    latest = None
+    if row.num_pings and row.latest_ping is not None:
+        latest = datetime.fromtimestamp(row.latest_ping, tz=tz).astimezone(tz=tzutc())
+    return AbsPageBundle(
+        trackback_ping_count=int(row.num_pings or 0),
+        trackback_ping_latest=latest,
+        dblp_listing_path=row.dblp_url,
+        dblp_authors=get_dblp_authors(paper_id) if row.dblp_url else [],
+        datacite_doi=row.doi,
+        latexml=latexml,
+    )
+
+
+@db_handle_error(db_logger=logger, default_return_val=None, memoize=True)
+def _get_abs_page_row(paper_id: str, datacite_account: str) -> Any:
+    """Trackback count and latest time, DBLP URL and DataCite DOI in one query.
+
+    Each is a scalar subquery of a single `SELECT` so it is one round trip."""
+    pings = (
+        db.session.query(TrackbackPing)
+        .filter(TrackbackPing.document_id == Document.document_id)
+        .filter(Document.paper_id == paper_id)
+        .filter(TrackbackPing.status == "accepted")
+    )
+    num_pings = pings.with_entities(func.count(func.distinct(TrackbackPing.url)))
+    latest_ping = pings.with_entities(func.max(TrackbackPing.approved_time))
+    dblp_url = db.session.query(DBLP.url).join(Document).filter(Document.paper_id == paper_id)
+    doi = (
+        db.session.query(DataciteDois.doi)
+        .filter(DataciteDois.paper_id == paper_id)
+        .filter(DataciteDois.account == datacite_account)
+        .limit(1)
+    )
+    return db.session.query(
+        num_pings.scalar_subquery().label("num_pings"),
+        latest_ping.scalar_subquery().label("latest_ping"),
+        dblp_url.scalar_subquery().label("dblp_url"),
+        doi.scalar_subquery().label("doi"),
+    ).one()
+
+
+@db_handle_error(db_logger=logger, default_return_val=None, memoize=True)
+def _get_latexml_versions(paper_id: str) -> Optional[Dict[int, Tuple[int, Optional[datetime]]]]:
+    """LaTeXML conversion status and publish time of each version of a paper_id."""
+    if not current_app.config["LATEXML_ENABLED"]:
+        return None
+    rows = (
+        db.session.query(DBLaTeXMLDocuments.document_version,
+                         DBLaTeXMLDocuments.conversion_status,
+                         DBLaTeXMLDocuments.publish_dt)
+        .filter(DBLaTeXMLDocuments.paper_id == paper_id)
+        .all()
+    )
+    return {row.document_version:
+            (row.conversion_status,
+             row.publish_dt.replace(tzinfo=timezone.utc) if row.publish_dt else None)
+            for row in rows}
+
+
 @db_handle_error(db_logger=logger, default_return_val=None)
 def get_user_id_by_author_id(author_id: str) -> Optional[int]:
     row = (
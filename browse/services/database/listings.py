@@ -1,12 +1,15 @@
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import date, datetime
+import threading
 import time
 from dateutil.tz import gettz, tzutc
-from typing import List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from sqlalchemy import case, distinct, or_, and_, desc
 from sqlalchemy.sql import func, select
 from sqlalchemy.engine import Row
-from sqlalchemy.orm import aliased
+from sqlalchemy.orm import Query, aliased
 
 from browse.services.listing import (
     MonthCount,
@@ -17,7 +20,9 @@ from browse.services.listing import (
     ListingNew,
     AnnounceTypes
 )
-from browse.services.database.models import NextMail, Metadata, db, DocumentCategory, Document, Updates
+from browse.services.database import db_handle_error
+from browse.services.database.models import (NextMail, Metadata, db, DocumentCategory, Document, Updates,
+                                             ListingAnnouncement, ListingAnnouncementDay)
 from browse.domain.metadata import DocMetadata, AuthorList
 from browse.domain.category import Category
 from browse.domain.version import VersionEntry, SourceFlag
@@ -33,11 +38,109 @@ logger = logging.getLogger(__name__)
 app_config = get_application_config()
 tz = gettz(app_config.get("ARXIV_BUSINESS_TZ"))
 
+KEYSET_STRIDE = 100
+"""Positions between the keys saved in a `ListingIndex`.
+
+This is the most rows a page of a month or year listing skips with OFFSET."""
+
+ListingKey = Tuple[int, str]
+"""The is_primary and paper_id a month or year listing is sorted by."""
+
+
+@dataclass(frozen=True)
+class ListingIndex:
+    """Count and seek keys of a month or year listing.
+
+    `keys[i]` is the key of the item at position `(i + 1) * KEYSET_STRIDE - 1`
+    so a page starting at `skip` can seek past the key before it and only
+    OFFSET past less than `KEYSET_STRIDE` rows."""
+    mailing: Optional[date]
+    count: int
+    keys: Tuple[ListingKey, ...]
+
+
+class ListingIndexCache():
+    """Thread safe LRU cache of `ListingIndex`.
+
+    An index is remade after a new mailing since that may add papers or
+    crosses to any month."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, ListingIndex]" = OrderedDict()
+
+    def get(self, key: Tuple, mailing: Optional[date]) -> Optional[ListingIndex]:
+        with self._lock:
+            index = self._entries.get(key)
+            if index is None or index.mailing != mailing:
+                return None
+            self._entries.move_to_end(key)
+            return index
+
+    def put(self, key: Tuple, index: ListingIndex) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = index
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_listing_index_cache = ListingIndexCache(1000)
+"""Process wide cache, this works because it is thread safe and not bound to the app context."""
+
 def get_new_listing(archive_or_cat: str,skip: int, show: int) -> ListingNew:
     "gets the most recent day of listings for an archive or category"
 
     category_list=_all_possible_categories(archive_or_cat)
-    
+    materialized=_materialized_new_listing(archive_or_cat, skip, show)
+    if materialized is not None:
+        return materialized
+
+    counts, results_query = _new_listing_queries(category_list)
+
+    new_count=0
+    cross_count=0
+    rep_count=0
+    for name, number in counts.all():
+        if name =="new":
+            new_count+=number
+        elif name=="cross":
+            cross_count+=number
+        else: #rep and repcross
+            rep_count+=number
+
+    results = results_query.offset(skip).limit(show).all()
+
+    #organize results into expected listing
+    items=[]
+    for row in results:
+        listing_case, metadata, _ = row
+        if listing_case=="repcross":
+            listing_case="rep"
+        item= _metadata_to_listing_item(metadata, listing_case)
+        items.append(item)
+
+    if len(items)==0: #no results to find the last mailing day from
+        mail_date=db.session.query(func.max(Updates.date)).scalar()
+    else:
+        mail_date=results[0][2] 
+
+    return ListingNew(listings=items, 
+                      new_count=new_count, 
+                      cross_count=cross_count, 
+                      rep_count=rep_count, 
+                      announced=mail_date,
+                      expires=gen_expires())
+
+def _new_listing_queries(category_list: List[str]) -> Tuple[Query, Query]:
+    """queries for the most recent day of listings for a list of categories
+    returns a query of the count of each listing type and a query of the listing type, metadata and date of
+    each item in the order they are listed"""
     up=aliased(Updates)
     case_order = case(
         [
@@ -112,20 +215,8 @@ def get_new_listing(archive_or_cat: str,skip: int, show: int) -> ListingNew:
         .filter(listing_type.label('case_order').in_(valid_types))
         .group_by(listing_type)
         .order_by(case_order)
-        .all() 
     )
 
-    new_count=0
-    cross_count=0
-    rep_count=0
-    for name, number in counts:
-        if name =="new":
-            new_count+=number
-        elif name=="cross":
-            cross_count+=number
-        else: #rep and repcross
-            rep_count+=number
-
     #data for listings to be displayed
     meta = aliased(Metadata)
     results = (
@@ -138,35 +229,48 @@ def get_new_listing(archive_or_cat: str,skip: int, show: int) -> ListingNew:
         .filter(listing_type.label('case_order').in_(valid_types))
         .filter(meta.is_current ==1)
         .order_by(case_order, meta.paper_id)
-        .offset(skip)
-        .limit(show)
-        .all() 
     )
+    return counts, results
+
+def get_recent_listing(archive_or_cat: str,skip: int, show: int) -> Listing:
+
+    category_list=_all_possible_categories(archive_or_cat)
+    materialized=_materialized_recent_listing(archive_or_cat, skip, show)
+    if materialized is not None:
+        return materialized
+
+    counts, result_query = _recent_listing_queries(category_list)
+    result = result_query.offset(skip).limit(show).all()
+
+    total=0
+    daily_counts=[]
+    for count in counts.all():
+        day, number = count
+        daily_counts.append((day, number))
+        total+=number
 
-    #organize results into expected listing
     items=[]
-    for row in results:
-        listing_case, metadata, _ = row
-        if listing_case=="repcross":
-            listing_case="rep"
+    for row in result:
+        primary, metadata, _ = row
+        listing_case: AnnounceTypes
+        if primary:
+            listing_case="new"
+        else:
+            listing_case="cross"
         item= _metadata_to_listing_item(metadata, listing_case)
         items.append(item)
 
-    if len(items)==0: #no results to find the last mailing day from
-        mail_date=db.session.query(func.max(up.date)).scalar()
-    else:
-        mail_date=results[0][2] 
-
-    return ListingNew(listings=items, 
-                      new_count=new_count, 
-                      cross_count=cross_count, 
-                      rep_count=rep_count, 
-                      announced=mail_date,
-                      expires=gen_expires())
-
-def get_recent_listing(archive_or_cat: str,skip: int, show: int) -> Listing:
+    return Listing(
+        listings=items,
+        pubdates=daily_counts,
+        count=total,
+        expires=gen_expires()
+    )
 
-    category_list=_all_possible_categories(archive_or_cat)
+def _recent_listing_queries(category_list: List[str]) -> Tuple[Query, Query]:
+    """queries for the 5 most recent days of listings for a list of categories
+    returns a query of the count for each day and a query of is_primary, metadata and date of
+    each item in the order they are listed"""
     up=aliased(Updates)
     dates = (
         db.session.query(distinct(up.date).label("date"))
@@ -203,7 +307,6 @@ def get_recent_listing(archive_or_cat: str,skip: int, show: int) -> Listing:
             count_subquery.c.date,
             count_subquery.c.count
         )
-        .all()
     )
 
     dc = aliased(DocumentCategory)
@@ -223,40 +326,130 @@ def get_recent_listing(archive_or_cat: str,skip: int, show: int) -> Listing:
     result=(
         db.session.query(   
             all.c.is_primary,
-            meta
+            meta,
+            all.c.date
         )
         .join(meta, meta.document_id == all.c.document_id)
         .filter(meta.is_current ==1)
         .order_by(desc(all.c.date), desc(all.c.is_primary), desc(meta.paper_id))
-        .offset(skip)
-        .limit(show)
-        .all()
     )
+    return counts, result
 
-    total=0
-    daily_counts=[]
-    for count in counts:
-        day, number = count
-        daily_counts.append((day, number))
-        total+=number
+def materialize_listings(contexts: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """Writes the new and pastweek listings of each archive and category to `ListingAnnouncement`.
+    This is to be run after each announcement, it replaces the previous listings in one transaction.
+    contexts: archives and categories to write, all of them if not given
+    returns the number of rows written for each listing
+    """
+    if contexts is None:
+        contexts = sorted(set(taxonomy.ARCHIVES) | set(taxonomy.CATEGORIES))
+    rows: Dict[str, List[Dict]] = {'new': [], 'pastweek': []}
+    for context in contexts:
+        category_list=_all_possible_categories(context)
+
+        _, new_results=_new_listing_queries(category_list)
+        for position, (listing_case, document_id, day) in enumerate(_with_document_id(new_results)):
+            rows['new'].append(dict(listing='new', context=context, position=position,
+                                    document_id=document_id, date=day,
+                                    listing_type='rep' if listing_case=='repcross' else listing_case))
+
+        _, recent_results=_recent_listing_queries(category_list)
+        for position, (primary, document_id, day) in enumerate(_with_document_id(recent_results)):
+            rows['pastweek'].append(dict(listing='pastweek', context=context, position=position,
+                                         document_id=document_id, date=day,
+                                         listing_type='new' if primary else 'cross'))
 
-    items=[]
-    for row in result:
-        primary, metadata=row
-        listing_case: AnnounceTypes
-        if primary:
-            listing_case="new"
-        else:
-            listing_case="cross"
-        item= _metadata_to_listing_item(metadata, listing_case)
-        items.append(item)
+    up=aliased(Updates)
+    new_day=db.session.query(func.max(up.date)).scalar()
+    recent_days=[day for (day,) in
+                 db.session.query(distinct(up.date)).order_by(desc(up.date)).limit(5).all()]
+
+    db.session.query(ListingAnnouncement).delete()
+    db.session.query(ListingAnnouncementDay).delete()
+    for listing in rows:
+        if rows[listing]:
+            db.session.bulk_insert_mappings(ListingAnnouncement, rows[listing])
+    days=[dict(listing='pastweek', date=day) for day in recent_days]
+    if new_day:
+        days.append(dict(listing='new', date=new_day))
+    db.session.bulk_insert_mappings(ListingAnnouncementDay, days)
+    db.session.commit()
+    return {listing: len(rows[listing]) for listing in rows}
+
+def _with_document_id(query: Query) -> Query:
+    """the query of a new or recent listing with the metadata of each item replaced by its document_id"""
+    listing_case, meta, day = [col['expr'] for col in query.column_descriptions]
+    return query.with_entities(listing_case, meta.document_id, day)
+
+@db_handle_error(db_logger=logger, default_return_val=None)
+def _materialized_days(listing: str) -> Optional[List[date]]:
+    """days of the materialized `listing`, most recent first
+    returns None if the listing was not materialized after the latest announcement
+    """
+    days=[day for (day,) in
+          db.session.query(ListingAnnouncementDay.date)
+          .filter(ListingAnnouncementDay.listing == listing)
+          .order_by(desc(ListingAnnouncementDay.date))
+          .all()]
+    if not days or days[0] != db.session.query(func.max(Updates.date)).scalar():
+        return None
+    return days
+
+def _materialized_items(listing: str, archive_or_cat: str, skip: int, show: int) -> List[ListingItem]:
+    """items of a page of a materialized listing, selected by position"""
+    ann = aliased(ListingAnnouncement)
+    meta = aliased(Metadata)
+    rows = (
+        db.session.query(ann.listing_type, meta)
+        .join(meta, meta.document_id == ann.document_id)
+        .filter(ann.listing == listing)
+        .filter(ann.context == archive_or_cat)
+        .filter(ann.position >= skip)
+        .filter(ann.position < skip + show)
+        .filter(meta.is_current == 1)
+        .order_by(ann.position)
+        .all()
+    )
+    return [_metadata_to_listing_item(metadata, listing_type) for listing_type, metadata in rows]
+
+def _materialized_new_listing(archive_or_cat: str, skip: int, show: int) -> Optional[ListingNew]:
+    """new listing from `ListingAnnouncement`, None if it is not materialized"""
+    days=_materialized_days('new')
+    if days is None:
+        return None
+    ann = aliased(ListingAnnouncement)
+    counts = dict(
+        db.session.query(ann.listing_type, func.count())
+        .filter(ann.listing == 'new')
+        .filter(ann.context == archive_or_cat)
+        .group_by(ann.listing_type)
+        .all()
+    )
+    return ListingNew(listings=_materialized_items('new', archive_or_cat, skip, show),
+                      new_count=counts.get('new', 0),
+                      cross_count=counts.get('cross', 0),
+                      rep_count=counts.get('rep', 0),
+                      announced=days[0],
+                      expires=gen_expires())
 
-    return Listing(
-        listings=items,
-        pubdates=daily_counts,
-        count=total,
-        expires=gen_expires()
+def _materialized_recent_listing(archive_or_cat: str, skip: int, show: int) -> Optional[Listing]:
+    """pastweek listing from `ListingAnnouncement`, None if it is not materialized"""
+    days=_materialized_days('pastweek')
+    if days is None:
+        return None
+    ann = aliased(ListingAnnouncement)
+    counts = dict(
+        db.session.query(ann.date, func.count())
+        .filter(ann.listing == 'pastweek')
+        .filter(ann.context == archive_or_cat)
+        .group_by(ann.date)
+        .all()
     )
+    daily_counts=[(day, counts.get(day, 0)) for day in days]
+    return Listing(listings=_materialized_items('pastweek', archive_or_cat, skip, show),
+                   pubdates=daily_counts,
+                   count=sum(number for _, number in daily_counts),
+                   expires=gen_expires())
 
 def get_articles_for_month(
     archive_or_cat: str, year: int, month: Optional[int], skip: int, show: int
@@ -317,15 +510,22 @@ def get_articles_for_month(
             )
         .filter(meta.is_current == 1)
     )
+    order=(cat_query.c.is_primary.desc(), meta.paper_id)
+
+    #count and seek keys, made once per mailing
+    index=_listing_index((archive_or_cat, year, month),
+                         main_query.with_entities(cat_query.c.is_primary, meta.paper_id).order_by(*order))
+
+    #seeks past the saved key before skip instead of having the DB OFFSET past all of the skipped rows
+    seek=min(skip // KEYSET_STRIDE, len(index.keys))
+    rows=main_query
+    if seek:
+        is_primary, paper_id = index.keys[seek - 1]
+        rows=rows.filter(or_(cat_query.c.is_primary < is_primary,
+                             and_(cat_query.c.is_primary == is_primary, meta.paper_id > paper_id)))
+    rows=rows.order_by(*order).offset(skip - seek * KEYSET_STRIDE).limit(show)
 
-    rows=( 
-        main_query.order_by(cat_query.c.is_primary.desc(), meta.paper_id)
-        .offset(skip)
-        .limit(show)
-        )
-    
     result=rows.all() #get listings to display
-    count=main_query.count() #get total entries 
     new_listings, cross_listings = _entries_into_monthly_listing_items(result)
 
     if not month: month=1 #yearly listings need a month for datetime
@@ -333,10 +533,30 @@ def get_articles_for_month(
     return Listing(
         listings=new_listings + cross_listings,
         pubdates=[(datetime(year, month, 1), 1)],  # only used for display month
-        count=count,
+        count=index.count,
         expires=gen_expires(),
     )
 
+def _listing_index(key: Tuple, key_query: Query) -> ListingIndex:
+    """Gets the `ListingIndex` of a month or year listing from the cache or makes it.
+
+    key_query: the is_primary and paper_id of all the items of the listing in order
+    """
+    mailing=db.session.query(func.max(Updates.date)).scalar()
+    index=_listing_index_cache.get(key, mailing)
+    if index is not None:
+        return index
+
+    count=0
+    keys=[]
+    for is_primary, paper_id in key_query.yield_per(1000):
+        count+=1
+        if count % KEYSET_STRIDE == 0:
+            keys.append((is_primary, paper_id))
+    index=ListingIndex(mailing=mailing, count=count, keys=tuple(keys))
+    _listing_index_cache.put(key, index)
+    return index
+
 def _metadata_to_listing_item(meta: Metadata, type: AnnounceTypes) -> ListingItem:
     """"turns rows of document and category into a underfilled version of DocMetadata.
     Underfilled to match the behavior of fs_listings, omits data not needed for listing items
@@ -3,7 +3,7 @@
 import hashlib
 import re
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from arxiv.base.globals import get_application_config
 from dateutil.tz import gettz, tzutc
@@ -29,21 +29,42 @@ from sqlalchemy.dialects.mysql import (
     TINYINT,
     INTEGER
 )
-from sqlalchemy.engine import make_url
+from sqlalchemy.engine import URL, make_url
 from sqlalchemy.orm import relationship
 from validators import url as is_valid_url
 from werkzeug.local import LocalProxy
 
+from .pool_metrics import PoolMetrics, timed_pool_class
+
+
 class BrowseSQLAlchemy(SQLAlchemy):
     """Overrides how flask_sqlalchemy handles options that need to be passed to
     create_engine.
 
     Inspite of documentation to the contrary, flask_sqlalchemy does not seem to
     be able to handle a dict as the value for a SQLALCHEMY_BINDS.
+
+    Each engine's pool, other than under sqlite, records its checkout
+    latency, timeouts and overflow connections in a `PoolMetrics` kept in
+    `pool_metrics` by the name of the pool. The name is `default` for
+    SQLALCHEMY_DATABASE_URI and the bind name for the binds. A dict bind may
+    set its pool options, ex. `pool_size`, along with its `url`.
     """
 
+    def __init__(self, *args, **kwargs): # type: ignore
+        super().__init__(*args, **kwargs)
+        self.pool_metrics: Dict[str, PoolMetrics] = {}
+
+    def apply_pool_defaults(self, app, options): # type: ignore
+        options = super().apply_pool_defaults(app, options)
+        if app.config.get("SQLALCHEMY_POOL_PRE_PING"):
+            options["pool_pre_ping"] = True
+        return options
+
     def apply_driver_hacks(self, app, sa_url, options): # type: ignore
         if not isinstance(sa_url, dict):
+            # Named before super() adds ?charset=utf8 to MySQL URLs so they match the config
+            options.setdefault("pool_name", _pool_name(app, sa_url))
             return super().apply_driver_hacks(app, sa_url, options)
 
         url = make_url(sa_url["url"])
@@ -51,6 +72,30 @@ class BrowseSQLAlchemy(SQLAlchemy):
         options.pop("url")
         return url, options
 
+    def create_engine(self, sa_url, engine_opts): # type: ignore
+        name = engine_opts.pop("pool_name", None) or sa_url.get_backend_name()
+        if sa_url.get_backend_name() != "sqlite" and "poolclass" not in engine_opts:
+            metrics = PoolMetrics(name)
+            self.pool_metrics[name] = metrics
+            engine_opts["poolclass"] = timed_pool_class(metrics)
+        return super().create_engine(sa_url, engine_opts)
+
+    def pool_status(self) -> Dict[str, Dict[str, Any]]:
+        """Metrics and current state of each pool by its name."""
+        return {name: metrics.status() for name, metrics
+                in sorted(self.pool_metrics.items())}
+
+
+def _pool_name(app: LocalProxy, sa_url: URL) -> str:
+    """Name of the pool for `sa_url`, `default` or the name of its bind."""
+    config = app.config  # type: ignore
+    if sa_url == make_url(config["SQLALCHEMY_DATABASE_URI"]):
+        return "default"
+    for bind, bind_url in (config.get("SQLALCHEMY_BINDS") or {}).items():
+        if isinstance(bind_url, str) and sa_url == make_url(bind_url):
+            return str(bind)
+    return str(sa_url.get_backend_name())
+
 
 
 db: SQLAlchemy = BrowseSQLAlchemy()
@@ -702,6 +747,32 @@ class Updates(db.Model):
         return f"ArXivUpdate(document_id={self.document_id}, version={self.version}, action={self.action}, date={self.date}, category={self.category}, archive={self.archive})"
     
 
+class ListingAnnouncement(db.Model):
+    """Materialized new and pastweek listings of each archive and category.
+
+    Written after each announcement by `flask listings materialize` so the
+    DB listing service can read a page of a listing by position."""
+    __tablename__ = "browse_listing_announcements"
+
+    listing = Column(String(8), primary_key=True)
+    """`new` or `pastweek`"""
+    context = Column(String(32), primary_key=True)
+    """Archive or category of the listing"""
+    position = Column(Integer, primary_key=True, autoincrement=False)
+    document_id = Column(Integer, nullable=False)
+    date = Column(Date, nullable=False)
+    listing_type = Column(String(8), nullable=False)
+    """`new`, `cross` or `rep`"""
+
+
+class ListingAnnouncementDay(db.Model):
+    """Announcement days of the materialized `ListingAnnouncement` rows."""
+    __tablename__ = "browse_listing_announcement_days"
+
+    listing = Column(String(8), primary_key=True)
+    date = Column(Date, primary_key=True)
+
+
 class NextMail(db.Model):
     """Model for mailings from publish"""
     __tablename__ = 'arXiv_next_mail'
@@ -785,12 +856,27 @@ def _config_latexml(app: LocalProxy) -> None:
         bind = {
             #"url": make_url("postgresql+pg8000://"),
             "url": "postgresql+pg8000://",
-            "creator": getconn}
+            "creator": getconn,
+            **_latexml_pool_options(config)}
 
         config["SQLALCHEMY_BINDS"]["latexml"] = bind
     elif config["LATEXML_DB_USER"] and config["LATEXML_DB_PASS"] and config["LATEXML_DB_NAME"]:
         user = config["LATEXML_DB_USER"]
         pw = config["LATEXML_DB_PASS"]
         db = config["LATEXML_DB_NAME"]
-        config["SQLALCHEMY_BINDS"]["latexml"] = {"url": f"postgresql+pg8000://{user}@{pw}/{db}"}
+        config["SQLALCHEMY_BINDS"]["latexml"] = {"url": f"postgresql+pg8000://{user}@{pw}/{db}",
+                                                 **_latexml_pool_options(config)}
+
+
+def _latexml_pool_options(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Pool options of the latexml bind.
+
+    These replace the SQLALCHEMY_POOL_* options of the main DB since the
+    latexml DB is a different server with its own connection limits."""
+    return {"pool_name": "latexml",
+            "pool_size": config["LATEXML_POOL_SIZE"],
+            "max_overflow": config["LATEXML_MAX_OVERFLOW"],
+            "pool_timeout": config["LATEXML_POOL_TIMEOUT"],
+            "pool_recycle": config["LATEXML_POOL_RECYCLE"],
+            "pool_pre_ping": config["LATEXML_POOL_PRE_PING"]}
 
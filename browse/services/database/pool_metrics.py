@@ -0,0 +1,106 @@
+"""Metrics of the DB connection pools.
+
+The pools of `BrowseSQLAlchemy` are made with a `QueuePool` subclass from
+`timed_pool_class` that records how long each checkout waits for a
+connection. With `SQLALCHEMY_POOL_SIZE` and `SQLALCHEMY_MAX_OVERFLOW` set low
+a busy server can spend most of a request waiting here so these are shown
+with the in use and overflow counts of each pool by the `db_pool_status`
+route.
+"""
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from typing import Any, Dict, List, Type
+
+from sqlalchemy import exc
+from sqlalchemy.pool import Pool, QueuePool
+
+CHECKOUT_BUCKETS_MS = [1, 5, 10, 50, 100, 500, 1000, 5000]
+"""Upper bounds in ms of the buckets of the checkout latency histogram."""
+
+
+class PoolMetrics():
+    """Thread safe checkout latency histogram and event counts of a pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool: Any = None
+        self._lock = threading.Lock()
+        self.checkout_buckets: List[int] = [0] * (len(CHECKOUT_BUCKETS_MS) + 1)
+        self.checkouts = 0
+        self.checkout_seconds = 0.0
+        self.max_checkout_seconds = 0.0
+        self.timeouts = 0
+        self.connects = 0
+        self.overflow_connects = 0
+
+    def observe_checkout(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_seconds += seconds
+            self.max_checkout_seconds = max(self.max_checkout_seconds, seconds)
+            self.checkout_buckets[bisect_left(CHECKOUT_BUCKETS_MS, seconds * 1000)] += 1
+
+    def observe_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def observe_connect(self, pool: Pool) -> None:
+        """A new DB connection, it is an overflow if the pool is past its size."""
+        with self._lock:
+            self.connects += 1
+            if isinstance(pool, QueuePool) and pool.overflow() > 0:
+                self.overflow_connects += 1
+
+    def status(self) -> Dict[str, Any]:
+        """Counts and histogram, plus the current state of the pool."""
+        with self._lock:
+            buckets = {f"le_{bound}ms": count for bound, count
+                       in zip(CHECKOUT_BUCKETS_MS, self.checkout_buckets)}
+            buckets[f"gt_{CHECKOUT_BUCKETS_MS[-1]}ms"] = self.checkout_buckets[-1]
+            stats: Dict[str, Any] = {
+                "checkouts": self.checkouts,
+                "checkout_avg_ms": round(1000 * self.checkout_seconds / self.checkouts, 3)
+                if self.checkouts else 0,
+                "checkout_max_ms": round(1000 * self.max_checkout_seconds, 3),
+                "checkout_histogram": buckets,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "overflow_connects": self.overflow_connects,
+            }
+        pool = self.pool
+        if isinstance(pool, QueuePool):
+            stats.update({"size": pool.size(),
+                          "checked_in": pool.checkedin(),
+                          "in_use": pool.checkedout(),
+                          "overflow": max(pool.overflow(), 0)})
+        return stats
+
+
+def timed_pool_class(metrics: PoolMetrics) -> Type[QueuePool]:
+    """A `QueuePool` class that records its checkouts in `metrics`.
+
+    The class is made for each pool since `QueuePool.recreate` makes the new
+    pool with `self.__class__`."""
+
+    class TimedQueuePool(QueuePool):
+        def __init__(self, *args: Any, **kwargs: Any):
+            super().__init__(*args, **kwargs)
+            metrics.pool = self
+
+        def _create_connection(self) -> Any:
+            # QueuePool counts the overflow before making the connection
+            metrics.observe_connect(self)
+            return super()._create_connection()
+
+        def connect(self) -> Any:
+            start = perf_counter()
+            try:
+                conn = super().connect()
+            except exc.TimeoutError:
+                metrics.observe_timeout()
+                raise
+            metrics.observe_checkout(perf_counter() - start)
+            return conn
+
+    return TimedQueuePool
@@ -1,14 +1,22 @@
 """Service to get PDF and other disseminations of an item."""
+from pathlib import Path
+from typing import Optional
+from zoneinfo import ZoneInfo
+
 from flask import current_app
 from urllib.parse import urlparse
 from google.cloud import storage
 
 from browse.services.documents import get_doc_service
 from browse.services.object_store import ObjectStore
+from browse.services.object_store.gzip_size import get_gzip_size_cache
+from browse.services.object_store.object_store_cache import CachingObjectStore
 from browse.services.object_store.object_store_gs import GsObjectStore
 from browse.services.object_store.object_store_local import LocalObjectStore
 
 from .article_store import ArticleStore
+from .dissem_index import DisseminationIndex
+from .location_cache import LocationCache
 
 _article_store: ArticleStore = None  # type: ignore
 # This works because it is thread safe and not bound to the app context.
@@ -16,16 +24,27 @@ _article_store: ArticleStore = None  # type: ignore
 _object_store: ObjectStore = None  # type: ignore
 # This works because it is thread safe and not bound to the app context.
 _genpdf_store: ObjectStore = None  # type: ignore
+_latexml_store: ObjectStore = None  # type: ignore
 
 
 def get_global_object_store(path: str, global_name: str) -> ObjectStore:
-    """Creates an object store from given path."""
+    """Creates an object store from given path.
+
+    If `OBJECT_STORE_CACHE_DIR` is set a GS store is wrapped in a
+    `CachingObjectStore`."""
     store = globals().get(global_name)
     if store is None:
         uri = urlparse(path)
         if uri.scheme == "gs":
             gs_client = storage.Client()
             store = GsObjectStore(gs_client.bucket(uri.netloc))
+            cache_dir = current_app.config.get("OBJECT_STORE_CACHE_DIR")
+            if cache_dir:
+                store = CachingObjectStore(
+                    store,
+                    str(Path(cache_dir) / global_name.strip("_")),
+                    current_app.config.get("OBJECT_STORE_CACHE_MAX_BYTES", 2 * 1024 * 1024 * 1024),
+                    current_app.config.get("OBJECT_STORE_CACHE_MAX_OBJECT_BYTES"))
         else:
             store = LocalObjectStore(path)
         globals()[global_name] = store
@@ -42,7 +61,50 @@ def get_article_store() -> "ArticleStore":
         _article_store = ArticleStore(
             get_doc_service(),
             get_global_object_store(config["DISSEMINATION_STORAGE_PREFIX"], "_object_store"),
-            get_global_object_store(config["GENPDF_API_STORAGE_PREFIX"], "_genpdf_store")
+            get_global_object_store(config["GENPDF_API_STORAGE_PREFIX"], "_genpdf_store"),
+            location_cache=_location_cache(config),
+            latexml_store=get_latexml_store,
+            dissem_index=_dissem_index(config),
+            probe_threads=config.get("DISSEMINATION_PROBE_THREADS", 1)
         )
+        _config_gzip_size_cache(config)
 
     return _article_store
+
+
+def get_latexml_store() -> ObjectStore:
+    """Gets the `ObjectStore` of the LaTeXML HTML conversions.
+
+    `LATEXML_BUCKET` may be a bucket name or a path as used with
+    `get_global_object_store`."""
+    bucket = current_app.config["LATEXML_BUCKET"]
+    if not urlparse(bucket).scheme and not bucket.startswith(("/", ".")):
+        bucket = f"gs://{bucket}"
+    return get_global_object_store(bucket, "_latexml_store")
+
+
+def _dissem_index(config: dict) -> Optional[DisseminationIndex]:
+    """Opens the `DisseminationIndex` or `None` if it is not configured or usable."""
+    path = config.get("DISSEMINATION_INDEX_PATH")
+    if not path:
+        return None
+    index = DisseminationIndex(path)
+    return index if index.usable else None
+
+
+def _config_gzip_size_cache(config: dict) -> None:
+    """Sets where the process wide `GzipSizeCache` saves sizes, if configured."""
+    cache_dir = config.get("GZIP_SIZE_CACHE_DIR")
+    if cache_dir:
+        get_gzip_size_cache().cache_dir = Path(cache_dir)
+
+
+def _location_cache(config: dict) -> Optional[LocationCache]:
+    """Makes the `LocationCache` for the `ArticleStore` or `None` if it is disabled."""
+    max_entries = config.get("DISSEMINATION_LOCATION_CACHE_MAX_ENTRIES", 0)
+    if not max_entries or max_entries <= 0:
+        return None
+    return LocationCache(max_entries,
+                         config.get("DISSEMINATION_LOCATION_CACHE_FOUND_SECONDS", 60 * 60 * 12),
+                         config.get("DISSEMINATION_LOCATION_CACHE_MISSING_SECONDS", 300),
+                         ZoneInfo(config.get("ARXIV_BUSINESS_TZ", "US/Eastern")))
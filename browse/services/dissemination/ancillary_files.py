@@ -7,14 +7,33 @@ from tarfile import CompressionError, ReadError
 from typing import Dict, List, Optional
 
 from browse.services.object_store.fileobj import FileObj
+from browse.services.object_store.tar_index import find_tar_index
 
 
 
 def list_ancillary_files(tarball: Optional[FileObj]) -> List[Dict]:
-    """Return a list of ancillary files in a tarball (.tar.gz file)."""
+    """Return a list of ancillary files in a tarball (.tar.gz file).
+
+    This uses the cached `TarIndex` of the tarball so the later request for
+    one of the files does not need to scan the tarball again. A tarball that
+    is not gzipped is scanned with `tarfile` instead."""
     if not tarball or not tarball.name.endswith('.tar.gz') or not tarball.exists():
         return []
 
+    index = find_tar_index(tarball)
+    if index is None:
+        return _scan_ancillary_files(tarball)
+
+    anc_files = []
+    for member in (m for m in index.members.values() if re.search(r'^anc\/', m.name)):
+        name = re.sub(r'^anc\/', '', member.name)
+        anc_files.append({'name': name, 'size_bytes': member.size})
+
+    return sorted(anc_files, key=itemgetter('name'))
+
+
+def _scan_ancillary_files(tarball: FileObj) -> List[Dict]:
+    """Lists the ancillary files by reading through the whole tarball."""
     anc_files = []
     try:
         with tarball.open(mode='rb') as fh:
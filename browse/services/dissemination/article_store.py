@@ -31,6 +31,9 @@ from browse.services.key_patterns import (abs_path_current_parent,
                                           ps_cache_ps_path, ps_cache_html_path, latexml_html_path)
 from browse.services.object_store import ObjectStore
 from browse.services.object_store.fileobj import FileObj, FileDoesNotExist
+from .dissem_index import DisseminationIndex
+from .key_probe import Candidate, KeyProbe
+from .location_cache import CacheKey, Found, LocationCache, Missing
 from .source_store import SourceStore
 from .ancillary_files import list_ancillary_files
 from google.cloud import storage
@@ -87,6 +90,9 @@ v_regex = re.compile(r'.*v(\d+)')
 _src_regex = re.compile(r'.*(\.tar\.gz|\.pdf|\.ps\.gz|\.gz|\.div\.gz|\.html\.gz)')
 
 
+SOURCE_CANDIDATE = "source"
+"""Label of the `KeyProbe` candidate for the source of an article."""
+
 MAX_ITEMS_IN_PATTERN_MATCH = 1000
 """This uses pattern matching on all the keys in an itmes directory. If
 the number if items is very large the was probably a problem"""
@@ -128,6 +134,11 @@ def is_genpdf_able(_arxiv_id: Identifier) -> bool:
     return bool(current_app.config.get("GENPDF_API_URL"))
 
 
+def _latexml_store_from_config() -> ObjectStore:
+    """Makes a `GsObjectStore` for the `LATEXML_BUCKET`."""
+    return GsObjectStore(storage.Client().bucket(current_app.config['LATEXML_BUCKET']))
+
+
 Acceptable_Format_Requests = Union[fileformat.FileFormat, Literal["e-print"]]
 """Possible formats to request from the `ArticleStore`.
 
@@ -140,14 +151,22 @@ class ArticleStore():
                  objstore: ObjectStore,
                  genpdf_store: ObjectStore,
                  reasons: Callable[[str, FORMATS], Optional[str]] = _unset_reasons,
-                 is_deleted: Callable[[str], Optional[str]] = _is_deleted
+                 is_deleted: Callable[[str], Optional[str]] = _is_deleted,
+                 location_cache: Optional[LocationCache] = None,
+                 latexml_store: Callable[[], ObjectStore] = _latexml_store_from_config,
+                 dissem_index: Optional[DisseminationIndex] = None,
+                 probe_threads: int = 1
                  ):
         self.metadataservice = metaservice
+        self.location_cache = location_cache
+        self.latexml_store_factory = latexml_store
+        self._latexml_store: Optional[ObjectStore] = None
         self.objstore: ObjectStore = objstore
         self.genpdf_store: ObjectStore = genpdf_store
         self.reasons = reasons
         self.is_deleted = is_deleted
-        self.sourcestore = SourceStore(self.objstore)
+        self.sourcestore = SourceStore(self.objstore, dissem_index)
+        self.probe = KeyProbe(probe_threads)
 
         self.format_handlers: Dict[Acceptable_Format_Requests, FHANDLER] = {
             fileformat.pdf: self._pdf,
@@ -356,31 +375,109 @@ class ArticleStore():
         if res:
             return CannotBuildPdf(res)
 
-        ps_cache_pdf = self.objstore.to_obj(ps_cache_pdf_path(arxiv_id, version.version))
-        if ps_cache_pdf.exists():
-            return ps_cache_pdf
+        cache_key: CacheKey = (arxiv_id.idv, version.version, 'pdf')
+        cached = self._cached_location(cache_key)
+        if cached is not None:
+            return cached
 
+        ps_cache_key = ps_cache_pdf_path(arxiv_id, version.version)
         if not arxiv_id.has_version or arxiv_id.version == docmeta.highest_version():
             # try from the /ftp with no number for current ver of pdf only paper
-            pdf_file = self.objstore.to_obj(current_pdf_path(arxiv_id))
-            if pdf_file.exists():
-                return pdf_file
-            if is_genpdf_able(arxiv_id):
-                return self._genpdf(arxiv_id, docmeta, version)
+            pdf_key = current_pdf_path(arxiv_id)
         else:
             # try from the /orig with version number for a pdf only paper
-            pdf_file=self.objstore.to_obj(previous_pdf_path(arxiv_id))
-            if pdf_file.exists():
-                return pdf_file
-            if is_genpdf_able(arxiv_id):
-                return self._genpdf(arxiv_id, docmeta, version)
-
-        if not self.sourcestore.source_exists(arxiv_id, docmeta):
-            return "NO_SOURCE"
+            pdf_key = previous_pdf_path(arxiv_id)
+
+        record = self.sourcestore.get_index_record(arxiv_id, docmeta)
+        if record is not None and record.pdf:
+            # The index says the PDF was built to the ps_cache or is the source
+            key = pdf_key if record.src_format == 'pdf' else ps_cache_key
+            fileobj = self._indexed_obj(key)
+            if fileobj is not None:
+                return self._remember_found(cache_key, key, fileobj)
+
+        genpdf_able = is_genpdf_able(arxiv_id)
+        candidates = [self._objs_candidate([ps_cache_key, pdf_key])]
+        if not genpdf_able:
+            candidates.append(self._src_candidate(arxiv_id, docmeta))
+        label, found = self.probe.first("pdf", candidates)
+        if found is not None and label != SOURCE_CANDIDATE:
+            key, fileobj = found
+            return self._remember_found(cache_key, key, fileobj)
+
+        if genpdf_able:
+            return self._genpdf(arxiv_id, docmeta, version)
+
+        if found is None:
+            return self._remember_missing(cache_key, "NO_SOURCE")
 
         logger.debug("No PDF found for %s, source exists and is not WDR, tried %s", arxiv_id.idv,
-                     [str(ps_cache_pdf), str(pdf_file)])
-        return "UNAVAILABLE"
+                     [ps_cache_key, pdf_key])
+        return self._remember_missing(cache_key, "UNAVAILABLE")
+
+    def _indexed_obj(self, key: str) -> Optional[FileObj]:
+        """Gets the `FileObj` of a key the `DisseminationIndex` says exists.
+
+        This is a single `to_obj` instead of a probe. Returns `None` if the
+        object is missing, then the caller probes as if there was no index."""
+        fileobj = self.objstore.to_obj(key)
+        if isinstance(fileobj, FileDoesNotExist):
+            logger.warning("%s is in the dissemination index but not in the object store", key)
+            return None
+        return fileobj
+
+    def _objs_candidate(self, keys: List[str]) -> Candidate[Tuple[str, FileObj]]:
+        """A candidate for `KeyProbe` that is a hit with the key and `FileObj` of
+        the first of `keys` that exists.
+
+        The keys are gotten with one `to_objs`, on GS that is a single batch
+        request."""
+        def probe() -> Optional[Tuple[str, FileObj]]:
+            for key, fileobj in zip(keys, self.objstore.to_objs(keys)):
+                # Not `exists()` since that is another RPC for a `Blob`
+                if not isinstance(fileobj, FileDoesNotExist):
+                    return key, fileobj
+            return None
+        return (" ".join(keys), probe)
+
+    def _src_candidate(self, arxiv_id: Identifier, docmeta: DocMetadata) -> Candidate[Tuple[str, FileObj]]:
+        """A candidate for `KeyProbe` that is a hit with `SOURCE_CANDIDATE` and
+        the `FileObj` of the source if it exists.
+
+        This is the last candidate of a format, except for e-print it is only
+        a hit to tell `UNAVAILABLE` from `NO_SOURCE`."""
+        def probe() -> Optional[Tuple[str, FileObj]]:
+            src = self.sourcestore.get_src_for_docmeta(arxiv_id, docmeta)
+            return (SOURCE_CANDIDATE, src) if src is not None else None
+        return (SOURCE_CANDIDATE, probe)
+
+    def _cached_location(self, cache_key: CacheKey) -> Optional[FormatHandlerReturn]:
+        """Gets a previously found `FileObj` or `Conditions` from the `location_cache`.
+
+        A found key costs a single `to_obj`. If the object is gone the entry is
+        dropped and `None` is returned so the caller probes again."""
+        if self.location_cache is None:
+            return None
+        location = self.location_cache.get(cache_key)
+        if location is None:
+            return None
+        if isinstance(location, Missing):
+            return location.condition  # type: ignore
+        fileobj = self.objstore.to_obj(location.key)
+        if isinstance(fileobj, FileDoesNotExist):
+            self.location_cache.invalidate(cache_key)
+            return None
+        return fileobj
+
+    def _remember_found(self, cache_key: CacheKey, key: str, fileobj: FileObj) -> FileObj:
+        if self.location_cache is not None:
+            self.location_cache.put(cache_key, Found(key))
+        return fileobj
+
+    def _remember_missing(self, cache_key: CacheKey, condition: Conditions) -> Conditions:
+        if self.location_cache is not None and isinstance(condition, str):
+            self.location_cache.put(cache_key, Missing(condition))
+        return condition
 
     def _genpdf(self, arxiv_id: Identifier, docmeta: DocMetadata, version: VersionEntry) -> FormatHandlerReturn:
         """Gets a PDF from the genpdf-api."""
@@ -442,26 +539,29 @@ class ArticleStore():
         if res:
             return CannotBuildPdf(res)
 
-        cached_ps = self.objstore.to_obj(ps_cache_ps_path(arxiv_id, version.version))
-        if cached_ps:
-            return cached_ps
-
+        ps_cache_key = ps_cache_ps_path(arxiv_id, version.version)
         if not arxiv_id.has_version or arxiv_id.version == docmeta.highest_version():
             # try from the /ftp with no number for current ver of ps only paper
-            ps_file = self.objstore.to_obj(current_ps_path(arxiv_id))
-            if ps_file.exists():
-                return ps_file
+            ps_key = current_ps_path(arxiv_id)
         else:
             # try from the /orig with version number for a ps only paper
-            ps_file=self.objstore.to_obj(previous_ps_path(arxiv_id))
-            if ps_file.exists():
-                return ps_file
+            ps_key = previous_ps_path(arxiv_id)
+
+        record = self.sourcestore.get_index_record(arxiv_id, docmeta)
+        if record is not None and record.ps:
+            fileobj = self._indexed_obj(ps_cache_key)
+            if fileobj is not None:
+                return fileobj
 
-        if not self.sourcestore.source_exists(arxiv_id, docmeta):
+        label, found = self.probe.first("ps", [self._objs_candidate([ps_cache_key, ps_key]),
+                                               self._src_candidate(arxiv_id, docmeta)])
+        if found is None:
             return "NO_SOURCE"
+        if label != SOURCE_CANDIDATE:
+            return found[1]
 
         logger.debug("No PS found for %s, source exists and is not WDR, tried %s", arxiv_id.idv,
-                     [str(cached_ps), str(ps_file)])
+                     [ps_cache_key, ps_key])
         return "UNAVAILABLE"
 
     def _e_print(self,
@@ -472,8 +572,8 @@ class ArticleStore():
         Lists through possible extensions to find source file.
 
         Returns `FileObj` if found, `None` if not."""
-        src = self.sourcestore.get_src_for_docmeta(arxiv_id, docmeta)
-        return src if src is not None else "NO_SOURCE"
+        _, found = self.probe.first("e-print", [self._src_candidate(arxiv_id, docmeta)])
+        return found[1] if found is not None else "NO_SOURCE"
 
 
     def _html(self, arxiv_id: Identifier, docmeta: DocMetadata, version: VersionEntry) -> FormatHandlerReturn:
@@ -486,7 +586,14 @@ class ArticleStore():
                 file_list=list(self.objstore.list(path))
                 return file_list if file_list else "NO_SOURCE"
         else: # latex to html
-            # TODO it may be expensive to recreate the GS Client each time
-            latex_obj_store = GsObjectStore(storage.Client().bucket(current_app.config['LATEXML_BUCKET']))
-            file=latex_obj_store.to_obj(latexml_html_path(arxiv_id, version.version))
+            file=self.latexml_store().to_obj(latexml_html_path(arxiv_id, version.version))
             return file if file.exists() else "NO_HTML"
+
+    def latexml_store(self) -> ObjectStore:
+        """Gets the `ObjectStore` of the LaTeXML HTML conversions.
+
+        This is made on first use and then reused since making a GS client is
+        slow."""
+        if self._latexml_store is None:
+            self._latexml_store = self.latexml_store_factory()
+        return self._latexml_store
@@ -0,0 +1,157 @@
+"""Read only index of the dissemination files of each version of a paper.
+
+The index is a SQLite file made at announce time by
+`script/sync_prod_to_gcp/dissem_index.py` from the same publish log used by
+`sync_published_to_gcp.make_todos`. It has one row per idv with the key and
+size of the source and flags for ancillary files and the ps_cache PDF, PS and
+HTML.
+
+With the index the source of a paper can be found with a single lookup
+instead of listing every key with the paper's prefix. The format of the source
+comes from the name of its key, so it too needs no request to the object store.
+When the flags say so the ps_cache PDF or PS is gotten without probing, and a
+version without ancillary files is not scanned for them.
+
+SQLite is opened with `mmap_size` so lookups are done on the memory mapped
+file.
+"""
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from browse.services.object_store import ObjectStore
+from browse.services.object_store.fileobj import BinaryMinimalFile, FileObj
+
+logger = logging.getLogger(__file__)
+
+INDEX_VERSION = 1
+"""Expected `PRAGMA user_version` of the index file.
+
+Must match `INDEX_VERSION` in `script/sync_prod_to_gcp/dissem_index.py`."""
+
+MMAP_SIZE = 256 * 1024 * 1024
+"""Max bytes of the index file to memory map."""
+
+
+@dataclass(frozen=True)
+class IndexRecord:
+    """Dissemination facts of a single version of a paper.
+
+    The flags are `None` when the publish log did not tell."""
+    idv: str
+    src_key: Optional[str]
+    src_size: Optional[int]
+    src_format: Optional[str]
+    anc: Optional[bool]
+    pdf: Optional[bool]
+    ps: Optional[bool]
+    html: Optional[bool]
+
+
+def _flag(value: Optional[int]) -> Optional[bool]:
+    return None if value is None else bool(value)
+
+
+class DisseminationIndex():
+    """Read only, thread safe access to the dissemination index file.
+
+    Each thread gets its own SQLite connection."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self.usable = self._check()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+            conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+            self._local.conn = conn
+        return conn
+
+    def _check(self) -> bool:
+        if not Path(self.path).is_file():
+            logger.warning("Dissemination index %s does not exist, not using it", self.path)
+            return False
+        try:
+            version = self._connection().execute("PRAGMA user_version").fetchone()[0]
+        except sqlite3.Error as ex:
+            logger.warning("Could not open dissemination index %s: %s", self.path, ex)
+            return False
+        if version != INDEX_VERSION:
+            logger.warning("Dissemination index %s is version %s but expected %s, not using it",
+                           self.path, version, INDEX_VERSION)
+            return False
+        return True
+
+    def get(self, idv: str) -> Optional[IndexRecord]:
+        """Gets the record for `idv` or `None` if it is not in the index.
+
+        `idv` must have a version, ex. `2101.00001v2` or `cs/0012007v1`."""
+        if not self.usable:
+            return None
+        try:
+            row = self._connection().execute(
+                "SELECT idv, src_key, src_size, src_format, anc, pdf, ps, html"
+                " FROM dissem WHERE idv = ?", (idv,)).fetchone()
+        except sqlite3.Error as ex:
+            logger.warning("Dissemination index lookup of %s failed: %s", idv, ex)
+            return None
+        if row is None:
+            return None
+        return IndexRecord(row[0], row[1], row[2], row[3],
+                           _flag(row[4]), _flag(row[5]), _flag(row[6]), _flag(row[7]))
+
+
+class IndexedFileObj(FileObj):
+    """`FileObj` for a source found in the `DisseminationIndex`.
+
+    The name and size come from the index so checking the format of the
+    source does not touch the object store. The object is only gotten from
+    the object store when the file is opened or its etag or updated time are
+    needed.
+    """
+
+    def __init__(self, objstore: ObjectStore, record: IndexRecord):
+        if not record.src_key:
+            raise ValueError(f"Index record for {record.idv} has no source key")
+        self.objstore = objstore
+        self.record = record
+        self._fileobj: Optional[FileObj] = None
+
+    def _obj(self) -> FileObj:
+        if self._fileobj is None:
+            self._fileobj = self.objstore.to_obj(self.record.src_key)  # type: ignore
+        return self._fileobj
+
+    @property
+    def name(self) -> str:
+        return self.record.src_key  # type: ignore
+
+    def exists(self) -> bool:
+        return self._obj().exists()
+
+    def open(self, mode: str) -> BinaryMinimalFile:
+        return self._obj().open(mode)
+
+    @property
+    def etag(self) -> str:
+        return self._obj().etag
+
+    @property
+    def size(self) -> int:
+        if self.record.src_size is not None:
+            return self.record.src_size
+        return self._obj().size
+
+    @property
+    def updated(self) -> datetime:
+        return self._obj().updated
+
+    def __repr__(self) -> str:
+        return f"<IndexedFileObj {self.record.src_key}>"
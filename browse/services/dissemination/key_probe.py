@@ -0,0 +1,78 @@
+"""Probes the candidate keys of a format concurrently.
+
+The format handlers of `ArticleStore` try several keys for a file, ex. the
+ps_cache, then /ftp or /orig, then the source. On GS each try is an RPC so
+trying them one after another costs the sum of their latencies.
+
+`KeyProbe` starts all the tries at once on a bounded thread pool and then
+takes the results in the order of the candidates. The first hit in the list
+is returned, just as when trying them in order, but the cost is about the
+latency of the slowest try that was needed. Tries after the hit are dropped.
+
+The time and result of each try are added as events to a `probe` span for
+tracing.
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+from opentelemetry import trace
+
+tracer = trace.get_tracer(__name__)
+
+T = TypeVar('T')
+
+Candidate = Tuple[str, Callable[[], Optional[T]]]
+"""A label, usually the key, and a function that gets the hit or `None`."""
+
+
+def _timed(probe: Callable[[], Optional[T]]) -> Tuple[Optional[T], float]:
+    start = perf_counter()
+    return probe(), perf_counter() - start
+
+
+class KeyProbe():
+    """Gets the first hit of a list of candidates.
+
+    With `max_workers` of 1 or less the candidates are tried one after
+    another on the calling thread and the tries stop at the first hit."""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="key_probe") \
+            if max_workers > 1 else None
+
+    def first(self, name: str, candidates: Sequence[Candidate[T]]) -> Tuple[Optional[str], Optional[T]]:
+        """Gets the label and value of the first candidate that is a hit.
+
+        Returns `(None, None)` if none are. An exception from a candidate is
+        only raised if all the candidates before it are misses, as it would
+        be if they were tried in order."""
+        with tracer.start_as_current_span(f"probe {name}") as span:
+            span.set_attribute("probe.candidates", len(candidates))
+            if self._executor is None or len(candidates) <= 1:
+                results = (_timed(probe) for _, probe in candidates)
+                return self._first_hit(span, candidates, results)
+
+            futures: List["Future[Tuple[Optional[T], float]]"] = [self._executor.submit(_timed, probe)
+                                     for _, probe in candidates]
+            try:
+                return self._first_hit(span, candidates, (future.result() for future in futures))
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _first_hit(self,
+                   span: trace.Span,
+                   candidates: Sequence[Candidate[T]],
+                   results: Iterable[Tuple[Optional[T], float]]) -> Tuple[Optional[str], Optional[T]]:
+        for (label, _), (value, seconds) in zip(candidates, results):
+            hit = value is not None
+            span.add_event("probe", {"probe.key": label,
+                                     "probe.ms": round(seconds * 1000, 3),
+                                     "probe.hit": hit})
+            if hit:
+                span.set_attribute("probe.hit", label)
+                return label, value
+        return None, None
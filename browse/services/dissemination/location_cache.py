@@ -0,0 +1,136 @@
+"""Cache of where the file for a format of an article was found.
+
+Getting a PDF may probe several keys in the object store, on GS each of
+these is a separate RPC. This caches the key that was found, or that nothing
+was found, so a repeated request costs at most one RPC.
+
+Entries never outlive the next announcement since that is when new versions
+and files show up and files move from /ftp to /orig.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional, Tuple, Union
+from zoneinfo import ZoneInfo
+
+from browse.controllers.response_headers import guess_next_update_utc
+
+CacheKey = Tuple[str, int, str]
+"""The `idv` as requested, the version it resolved to and the format."""
+
+
+@dataclass(frozen=True)
+class Found:
+    """The article's file for the format is at `key`."""
+    key: str
+
+
+@dataclass(frozen=True)
+class Missing:
+    """No file was found for the format, `condition` is what was returned."""
+    condition: str
+
+
+Location = Union[Found, Missing]
+
+
+@dataclass
+class _Entry:
+    location: Location
+    expires: float
+
+
+class LocationCache():
+    """Thread safe, bounded LRU cache of `Location` by `CacheKey`.
+
+    Parameters
+    ----------
+    max_entries: int
+        Maximum number of locations to keep.
+    found_seconds: float
+        Maximum time to keep a `Found`.
+    missing_seconds: float
+        Maximum time to keep a `Missing`. This should be short since PDFs are
+        built on demand.
+    business_tz: ZoneInfo
+        Timezone of the arXiv business offices, used to guess the next
+        announcement with `guess_next_update_utc`.
+    """
+
+    def __init__(self,
+                 max_entries: int,
+                 found_seconds: float,
+                 missing_seconds: float,
+                 business_tz: ZoneInfo,
+                 clock: Callable[[], float] = time.time) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.found_seconds = found_seconds
+        self.missing_seconds = missing_seconds
+        self.business_tz = business_tz
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: CacheKey) -> Optional[Location]:
+        """Gets the unexpired `Location` for `key` or `None`."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.location
+
+    def put(self, key: CacheKey, location: Location) -> None:
+        """Adds `location`, it will expire by the next announcement.
+
+        A `Missing` is not cached during an announcement since files are
+        likely to be appearing."""
+        now = self._clock()
+        next_update, in_publish = guess_next_update_utc(
+            self.business_tz, datetime.fromtimestamp(now, tz=timezone.utc))
+        if isinstance(location, Missing):
+            if in_publish:
+                return
+            ttl = self.missing_seconds
+        else:
+            ttl = self.found_seconds
+        expires = min(now + ttl, next_update.timestamp())
+        if expires <= now:
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = _Entry(location, expires)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: CacheKey) -> None:
+        """Removes `key` from the cache if it is present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Removes all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Counters and size of the cache."""
+        with self._lock:
+            return {"entries": len(self._entries),
+                    "max_entries": self.max_entries,
+                    "hits": self.hits,
+                    "misses": self.misses}
+
+    def __len__(self) -> int:
+        return len(self._entries)
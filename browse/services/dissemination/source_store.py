@@ -14,6 +14,7 @@ from browse.services.object_store import ObjectStore
 from browse.services.object_store.fileobj import FileObj
 
 from .ancillary_files import list_ancillary_files
+from .dissem_index import DisseminationIndex, IndexedFileObj, IndexRecord
 from ...domain.version import VersionEntry
 
 logger = logging.getLogger(__file__)
@@ -38,8 +39,9 @@ class SourceStore():
 
     """
 
-    def __init__(self, objstore: ObjectStore):
+    def __init__(self, objstore: ObjectStore, index: Optional[DisseminationIndex] = None):
         self.objstore = objstore
+        self.index = index
 
     def source_exists(self,
                       arxiv_id: Identifier,
@@ -77,9 +79,14 @@ class SourceStore():
                             docmeta: DocMetadata) -> Optional[FileObj]:
         """Gets the src for the arxiv_id.
 
-        Lists through possible extensions to find source file.
+        Uses the `DisseminationIndex` if the version is in it, otherwise lists
+        through possible extensions to find source file.
 
         Returns `FileObj` if found, `None` if not."""
+        record = self.get_index_record(arxiv_id, docmeta)
+        if record is not None and record.src_key:
+            return IndexedFileObj(self.objstore, record)
+
         if arxiv_id.has_version and arxiv_id.version == docmeta.highest_version():
             return self.get_src(arxiv_id, True)
         elif not arxiv_id.has_version:
@@ -87,6 +94,17 @@ class SourceStore():
         else:
             return self.get_src(arxiv_id, False)
 
+    def get_index_record(self,
+                         arxiv_id: Identifier,
+                         docmeta: DocMetadata) -> Optional[IndexRecord]:
+        """Gets the `DisseminationIndex` record of the version of `arxiv_id`.
+
+        Returns `None` if there is no index or the version is not in it."""
+        if self.index is None:
+            return None
+        version = arxiv_id.version if arxiv_id.has_version else docmeta.highest_version()
+        return self.index.get(f"{arxiv_id.id}v{version}")
+
     def get_src_format_for_version(self,
                                    version: VersionEntry,
                                    src_file: FileObj)-> FileFormat:
@@ -153,4 +171,7 @@ class SourceStore():
         source_type = docmeta.version_history[version - 1].source_flag
         if not source_type.includes_ancillary_files:
             return []
+        record = self.get_index_record(docmeta.arxiv_identifier, docmeta)
+        if record is not None and record.anc is False:
+            return []  # The index says there are none, don't scan the source
         return list_ancillary_files(self.get_src_for_docmeta(docmeta.arxiv_identifier, docmeta))
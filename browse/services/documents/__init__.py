@@ -1,9 +1,14 @@
 """Documents Service and implementations."""
-from typing import Any, cast
+from typing import Any, Optional, cast
 
 from flask import g, current_app
 
 from .base_documents import DocMetadataService
+from .fs_implementation.docmeta_cache import DocMetadataCache
+
+_docmeta_cache: Optional[DocMetadataCache] = None
+# Process wide cache of parsed .abs used by `fs_docs`.
+# This works because it is thread safe and not bound to the app context.
 
 def get_doc_service() -> DocMetadataService:
     """Gets the documents service configured for this app context."""
@@ -17,7 +22,23 @@ def fs_docs(config: dict, _: Any) -> DocMetadataService:
     """Factory function for file system abstract service."""
     from browse.services.documents.fs_implementation.fs_abs import FsDocMetadataService
     return FsDocMetadataService(config["DOCUMENT_LATEST_VERSIONS_PATH"],
-                                config["DOCUMENT_ORIGNAL_VERSIONS_PATH"])
+                                config["DOCUMENT_ORIGNAL_VERSIONS_PATH"],
+                                _get_docmeta_cache(config),
+                                config.get("DOCUMENT_ABS_FETCH_THREADS", 8))
+
+
+def _get_docmeta_cache(config: dict) -> Optional[DocMetadataCache]:
+    """Gets the process wide `DocMetadataCache`, `None` if it is disabled."""
+    global _docmeta_cache
+    if _docmeta_cache is None:
+        max_entries = config.get("DOCUMENT_ABS_CACHE_MAX_ENTRIES", 0)
+        max_bytes = config.get("DOCUMENT_ABS_CACHE_MAX_BYTES", 0)
+        if not max_entries or not max_bytes:
+            return None
+        _docmeta_cache = DocMetadataCache(
+            max_entries, max_bytes,
+            config.get("DOCUMENT_ABS_CACHE_REVALIDATE_SECONDS", 30))
+    return _docmeta_cache
 
 
 def db_docs(config: dict, _: Any) -> DocMetadataService:
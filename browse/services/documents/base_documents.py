@@ -1,8 +1,9 @@
 """Base classes for the abstracts service."""
 
 import abc
-from typing import Union
+from typing import Dict, Iterable, Optional, Union
 
+from browse.domain.identifier import IdentifierException
 from browse.domain.metadata import DocMetadata, Identifier
 from browse.services import HasStatus
 
@@ -24,6 +25,40 @@ class DocMetadataService(abc.ABC, HasStatus):
         :class:`DocMetadata`
         """
 
+    def get_abs_many(self, arxiv_ids: Iterable[str]) -> Dict[str, DocMetadata]:
+        """Get the .abs metadata for several arXiv paper identifiers.
+
+        Ids that are not found, deleted or have problems are left out of the
+        returned `Dict`. Call `get_abs` for those to get the exception.
+
+        This implementation calls `get_abs` for each id. Implementations
+        should override it to get the metadata in fewer round trips.
+
+        Parameters
+        ----------
+        arxiv_ids : Iterable[str]
+            The arXiv identifier strings.
+
+        Returns
+        -------
+        Dict[str, :class:`DocMetadata`]
+            Keyed by the arXiv identifier strings as passed.
+        """
+        found = {}
+        for arxiv_id in dict.fromkeys(arxiv_ids):
+            docmeta = self._get_abs_or_none(arxiv_id)
+            if docmeta is not None:
+                found[arxiv_id] = docmeta
+        return found
+
+    def _get_abs_or_none(self, arxiv_id: str) -> Optional[DocMetadata]:
+        """`get_abs` that returns `None` for any expected problem."""
+        try:
+            return self.get_abs(arxiv_id)
+        except (AbsException, AbsNotFoundException, AbsVersionNotFoundException,
+                AbsParsingException, AbsDeletedException, IdentifierException):
+            return None
+
 
 class AbsException(Exception):
     """Error class for general arXiv .abs exceptions."""
@@ -1,6 +1,7 @@
 """Legacy DB backed core metadata service."""
+from collections import defaultdict
 from datetime import timezone
-from typing import List, Optional, Union, Tuple
+from typing import Dict, Iterable, List, Optional, Union, Tuple
 
 import sqlalchemy
 from arxiv import taxonomy
@@ -8,7 +9,7 @@ from sqlalchemy.exc import DBAPIError, OperationalError
 from sqlalchemy.orm.exc import NoResultFound
 
 from browse.domain.category import Category
-from browse.domain.identifier import Identifier
+from browse.domain.identifier import Identifier, IdentifierException
 from browse.domain.license import License
 from browse.domain.metadata import DocMetadata, Archive, AuthorList, Submitter, Group
 from browse.domain.version import SourceFlag, VersionEntry
@@ -18,6 +19,9 @@ from browse.services.documents.base_documents import (
     DocMetadataService, AbsException)
 from browse.services.documents.config.deleted_papers import DELETED_PAPERS
 
+MAX_IDS_PER_QUERY = 1000
+"""Max paper ids in the `IN (...)` of a single query in `get_abs_many`."""
+
 
 class DbDocMetadataService(DocMetadataService):
     """Class for arXiv document metadata service."""
@@ -48,15 +52,44 @@ class DbDocMetadataService(DocMetadataService):
         if not all_versions:
             raise AbsNotFoundException(identifier.id)
 
-        latest = next((ver for ver in all_versions if ver.is_current))
-        if identifier.has_version:
-            ver_of_interest = next((ver for ver in all_versions if ver.version == identifier.version), None)
-            if not ver_of_interest:
-                raise AbsVersionNotFoundException(identifier.idv)
-        else:
-            ver_of_interest = latest
+        return _docmeta_for_versions(all_versions, identifier)
+
+    def get_abs_many(self, arxiv_ids: Iterable[str]) -> Dict[str, DocMetadata]:
+        """Get the .abs metadata for several arXiv paper identifiers.
 
-        return _to_docmeta(all_versions, latest, ver_of_interest, identifier)
+        This gets all the versions of all the papers with a single
+        `IN (...)` query on `arXiv_metadata`, or a few queries if there are
+        more than `MAX_IDS_PER_QUERY` papers.
+
+        Ids that are not found, deleted or have problems are left out of the
+        returned `Dict`.
+        """
+        identifiers: Dict[str, Identifier] = {}
+        for arxiv_id in arxiv_ids:
+            try:
+                identifier = Identifier(arxiv_id=arxiv_id)
+            except IdentifierException:
+                continue
+            if identifier.id not in DELETED_PAPERS:
+                identifiers[arxiv_id] = identifier
+
+        paper_ids = list({identifier.id for identifier in identifiers.values()})
+        by_paper_id: Dict[str, List[Metadata]] = defaultdict(list)
+        for start in range(0, len(paper_ids), MAX_IDS_PER_QUERY):
+            chunk = paper_ids[start:start + MAX_IDS_PER_QUERY]
+            for row in Metadata.query.filter(Metadata.paper_id.in_(chunk)).all():
+                by_paper_id[row.paper_id].append(row)
+
+        found: Dict[str, DocMetadata] = {}
+        for arxiv_id, identifier in identifiers.items():
+            all_versions = by_paper_id.get(identifier.id)
+            if not all_versions:
+                continue
+            try:
+                found[arxiv_id] = _docmeta_for_versions(all_versions, identifier)
+            except (AbsException, AbsVersionNotFoundException, StopIteration):
+                continue
+        return found
 
 
     def service_status(self) -> List[str]:
@@ -76,6 +109,19 @@ class DbDocMetadataService(DocMetadataService):
         return []
 
 
+def _docmeta_for_versions(all_versions: List[Metadata], identifier: Identifier) -> DocMetadata:
+    """Picks the latest and requested version from `all_versions` and converts to `DocMetadata`."""
+    latest = next((ver for ver in all_versions if ver.is_current))
+    if identifier.has_version:
+        ver_of_interest = next((ver for ver in all_versions if ver.version == identifier.version), None)
+        if not ver_of_interest:
+            raise AbsVersionNotFoundException(identifier.idv)
+    else:
+        ver_of_interest = latest
+
+    return _to_docmeta(all_versions, latest, ver_of_interest, identifier)
+
+
 def _to_docmeta(all_versions: List[Metadata], latest: Metadata, ver_of_interest: Metadata, identifier: Identifier) -> DocMetadata:
     """Convert a Metadata object from the DB to a DocMetadata object."""
     version_history = list()
@@ -0,0 +1,168 @@
+"""Process wide LRU cache of parsed `DocMetadata`.
+
+The FS abs service is created for each request so this cache is held at the
+module level by `browse.services.documents.fs_docs` and shared by all threads
+of a worker.
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from browse.domain.metadata import DocMetadata
+
+ENTRY_OVERHEAD_BYTES = 4 * 1024
+"""Rough size of a parsed `DocMetadata` not counting its raw .abs text."""
+
+MTIME_TOLERANCE = 0.001
+"""Seconds of difference in mtime still considered the same version of a file.
+
+`DocMetadata.modified` only has microsecond resolution."""
+
+
+@dataclass
+class _Entry:
+    docmeta: DocMetadata
+    mtime: float
+    size: int
+    checked: float
+
+
+def approx_size(docmeta: DocMetadata) -> int:
+    """Approximate memory used by `docmeta`.
+
+    The raw .abs text dominates the size of a parsed abs."""
+    return ENTRY_OVERHEAD_BYTES + sys.getsizeof(docmeta.raw_safe or '')
+
+
+class DocMetadataCache():
+    """Thread safe, bounded LRU cache of parsed `DocMetadata`.
+
+    Entries are keyed by the path of the .abs file, which identifies both the
+    paper id and the version. Each entry records the mtime of the .abs file
+    it was parsed from. An entry is served without touching the FS or GS for
+    `revalidate_seconds` after it was last checked. After that a single
+    `stat` is done and the entry is only reparsed if the mtime has changed.
+
+    Parameters
+    ----------
+    max_entries: int
+        Maximum number of parsed abs to keep.
+    max_bytes: int
+        Maximum approximate memory to use, see `approx_size`.
+    revalidate_seconds: float
+        How long to trust an entry before checking the mtime of its file.
+    """
+
+    def __init__(self,
+                 max_entries: int,
+                 max_bytes: int,
+                 revalidate_seconds: float = 30,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        if max_entries <= 0 or max_bytes <= 0:
+            raise ValueError("max_entries and max_bytes must be positive")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.revalidate_seconds = revalidate_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+    def get_or_load(self,
+                    key: str,
+                    mtime: Callable[[], float],
+                    load: Callable[[], DocMetadata]) -> DocMetadata:
+        """Gets the `DocMetadata` for `key`, calling `load` on a miss.
+
+        `mtime` is only called to revalidate an entry older than
+        `revalidate_seconds`. Exceptions from `load`, such as
+        `AbsNotFoundException`, are not cached.
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry.checked < self.revalidate_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.docmeta
+
+        if entry is not None:
+            try:
+                current_mtime: Optional[float] = mtime()
+            except FileNotFoundError:
+                current_mtime = None
+            with self._lock:
+                self.revalidations += 1
+                if current_mtime is not None \
+                   and abs(current_mtime - entry.mtime) < MTIME_TOLERANCE \
+                   and self._entries.get(key) is entry:
+                    entry.checked = now
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.docmeta
+                self._remove(key)
+
+        with self._lock:
+            self.misses += 1
+        docmeta = load()
+        self.put(key, docmeta)
+        return docmeta
+
+    def put(self, key: str, docmeta: DocMetadata) -> None:
+        """Adds `docmeta` to the cache, evicting least recently used entries.
+
+        The mtime of the entry is taken from `docmeta.modified`."""
+        size = approx_size(docmeta)
+        if size > self.max_bytes:
+            return
+        entry = _Entry(docmeta=docmeta,
+                       mtime=docmeta.modified.timestamp(),
+                       size=size,
+                       checked=self._clock())
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, old = self._entries.popitem(last=False)
+                self._bytes -= old.size
+                self.evictions += 1
+
+    def invalidate(self, key: str) -> None:
+        """Removes `key` from the cache if it is present."""
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Removes all entries, counters are not reset."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Counters and sizes of the cache."""
+        with self._lock:
+            return {"entries": len(self._entries),
+                    "bytes": self._bytes,
+                    "max_entries": self.max_entries,
+                    "max_bytes": self.max_bytes,
+                    "hits": self.hits,
+                    "misses": self.misses,
+                    "revalidations": self.revalidations,
+                    "evictions": self.evictions}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        """Removes `key`, must be called with the lock held."""
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
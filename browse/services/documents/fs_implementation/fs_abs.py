@@ -1,29 +1,44 @@
 """File system backed core metadata service."""
 
-from typing import List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Union
 import dataclasses
 
+from flask import current_app, has_app_context
+
 from browse.domain.metadata import DocMetadata
 from browse.domain.identifier import Identifier
 from browse.services.documents.config.deleted_papers import DELETED_PAPERS
-from browse.services.anypath import fs_check
+from browse.services.anypath import fs_check, to_anypath
 
 from browse.services.documents.base_documents import DocMetadataService, \
     AbsDeletedException, AbsNotFoundException, \
     AbsVersionNotFoundException
 
+from .docmeta_cache import DocMetadataCache
 from .legacy_fs_paths import FSDocMetaPaths
 from .parse_abs import parse_abs_file
 
 class FsDocMetadataService(DocMetadataService):
     """Class for arXiv document metadata service."""
     fs_paths: FSDocMetaPaths
+    cache: Optional[DocMetadataCache]
 
     def __init__(self,
                  latest_versions_path: str,
-                 original_versions_path: str) -> None:
-        """Initialize the FS document metadata service."""
+                 original_versions_path: str,
+                 cache: Optional[DocMetadataCache] = None,
+                 max_threads: int = 8) -> None:
+        """Initialize the FS document metadata service.
+
+        If `cache` is passed, parsed .abs files are kept in it and reused
+        until the .abs file changes.
+
+        `max_threads` limits the threads used to read .abs files in
+        parallel in `get_abs_many`."""
         self.fs_paths = FSDocMetaPaths(latest_versions_path, original_versions_path)
+        self.cache = cache
+        self.max_threads = max_threads
 
     def get_abs(self, arxiv_id: Union[str, Identifier]) -> DocMetadata:
         """Get the .abs metadata for the specified arXiv paper identifier.
@@ -75,13 +90,49 @@ class FsDocMetadataService(DocMetadataService):
 
         return combined_version
 
+    def get_abs_many(self, arxiv_ids: Iterable[str]) -> Dict[str, DocMetadata]:
+        """Get the .abs metadata for several arXiv paper identifiers.
+
+        The .abs files are read in parallel with a bounded thread pool so the
+        latency is close to that of the slowest read instead of the sum of
+        all of them.
+
+        Ids that are not found, deleted or have problems are left out of the
+        returned `Dict`.
+        """
+        ids = list(dict.fromkeys(arxiv_ids))
+        if len(ids) <= 1 or self.max_threads <= 1:
+            return super().get_abs_many(ids)
+
+        # parse_abs_file uses the app config for the FS timezone
+        app = current_app._get_current_object() if has_app_context() else None  # type: ignore
+
+        def get_one(arxiv_id: str) -> Optional[DocMetadata]:
+            if app is None:
+                return self._get_abs_or_none(arxiv_id)
+            with app.app_context():
+                return self._get_abs_or_none(arxiv_id)
+
+        with ThreadPoolExecutor(max_workers=min(len(ids), self.max_threads),
+                                thread_name_prefix="get_abs_many") as pool:
+            results = list(pool.map(get_one, ids))
+
+        return {arxiv_id: docmeta for arxiv_id, docmeta in zip(ids, results)
+                if docmeta is not None}
+
     def _abs_for_version(self, identifier: Identifier,
                          version: Optional[int] = None) -> DocMetadata:
         """Get a specific version of a paper's abstract metadata.
 
-        if version is None then get the latest version."""        
+        if version is None then get the latest version."""
         path = self.fs_paths.get_abs_file(identifier, version)
-        return parse_abs_file(filename=path)
+        if self.cache is None:
+            return parse_abs_file(filename=path)
+
+        return self.cache.get_or_load(
+            path,
+            lambda: to_anypath(path).stat().st_mtime,
+            lambda: parse_abs_file(filename=path))
 
 
 
@@ -4,14 +4,21 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
 from time import mktime
-from typing import Any, List, Literal, Optional, Tuple, Union, cast
+from typing import TYPE_CHECKING, Any, List, Literal, Optional, Tuple, Union, cast
 from wsgiref.handlers import format_date_time
+from zoneinfo import ZoneInfo
 
 from flask import g, current_app
 
 from browse.domain.metadata import DocMetadata
 from browse.services import HasStatus
 
+if TYPE_CHECKING:
+    from .listing_cache import ParsedListingCache
+
+_listing_cache: Optional["ParsedListingCache"] = None
+# Process wide cache of parsed new and pastweek listings used by `fs_listing`.
+# This works because it is thread safe and not bound to the app context.
 
 def get_listing_service() -> "ListingService":
     """Get the listing service configured for the app context."""
@@ -25,7 +32,24 @@ def get_listing_service() -> "ListingService":
 def fs_listing(config: dict, _: Any) -> "ListingService":
     """Factory function for filesystem-based listing service."""
     from .fs_listings import FsListingFilesService
-    return FsListingFilesService(config["DOCUMENT_LISTING_PATH"])
+    return FsListingFilesService(config["DOCUMENT_LISTING_PATH"],
+                                 listing_cache=_get_listing_cache(config))
+
+
+def _get_listing_cache(config: dict) -> Optional["ParsedListingCache"]:
+    """Gets the process wide `ParsedListingCache`, `None` if it is disabled."""
+    global _listing_cache
+    if _listing_cache is None:
+        max_entries = config.get("DOCUMENT_LISTING_CACHE_MAX_ENTRIES", 0)
+        if not max_entries or max_entries <= 0:
+            return None
+        from .listing_cache import ParsedListingCache
+        _listing_cache = ParsedListingCache(
+            max_entries,
+            config.get("DOCUMENT_LISTING_CACHE_REVALIDATE_SECONDS", 30),
+            ZoneInfo(config.get("ARXIV_BUSINESS_TZ", "US/Eastern")),
+            config.get("DOCUMENT_LISTING_CACHE_DIR") or None)
+    return _listing_cache
 
 def db_listing(config: dict, _: Any) -> "ListingService":
     """Factory function for filesystem-based listing service."""
@@ -5,8 +5,10 @@ Can be either local file or GCP storage.
 
 import logging
 import re
+from copy import copy
+from dataclasses import replace
 from datetime import date, datetime
-from typing import List, Literal, Optional, Tuple, Union
+from typing import Callable, List, Literal, Optional, Tuple, TypeVar, Union
 from zoneinfo import ZoneInfo
 
 from google.cloud import storage
@@ -22,7 +24,9 @@ from browse.services.object_store.object_store_gs import GsObjectStore
 from browse.services.object_store.object_store_local import LocalObjectStore
 from werkzeug.exceptions import BadRequest
 
-from .parse_listing_file import ParsingMode, get_updates_from_list_file
+from .listing_cache import ParsedListingCache
+from .month_aggregates import MonthAggregateCache, get_month_aggregates
+from .parse_listing_file import MonthItem, month_pubdates
 from .parse_listing_pastweek import parse_listing_pastweek
 from .parse_new_listing_file import parse_new_listing_file
 
@@ -32,6 +36,17 @@ logger.level = logging.DEBUG
 ListingFileType = Literal["new", "pastweek", "month"]
 """These are the listing file types."""
 
+ListingT = TypeVar("ListingT", Listing, ListingNew)
+
+
+def _window(listing: ListingT, skip: int, show: int) -> ListingT:
+    """Copy of a whole cached `listing` with just the `skip` and `show` items.
+
+    The items are copied since the list page sets attributes on them."""
+    return replace(listing,
+                   listings=[copy(item) for item in listing.listings[skip:skip + show]],
+                   expires=gen_expires())
+
 
 class FsListingFilesService(ListingService):
     """arXiv document listings via Filesystem.
@@ -40,8 +55,12 @@ class FsListingFilesService(ListingService):
     or a GCP storage bucket.
     """
 
-    def __init__(self, document_listing_path: str):
+    def __init__(self, document_listing_path: str,
+                 aggregates: Optional[MonthAggregateCache] = None,
+                 listing_cache: Optional[ParsedListingCache] = None):
         self.document_listing_path = document_listing_path
+        self.aggregates = aggregates if aggregates is not None else get_month_aggregates()
+        self.listing_cache = listing_cache
         self.obj_store: ObjectStore = LocalObjectStore(document_listing_path)
         self.listing_files_root = "./"
         
@@ -61,6 +80,12 @@ class FsListingFilesService(ListingService):
 
         This just formats the string file name and returns a `Path`. It does
         not check if the file exists."""
+        return self.obj_store.to_obj(self._listing_key(fileMode, archiveOrCategory,
+                                                       year, month))
+
+    def _listing_key(self, fileMode: ListingFileType, archiveOrCategory: str,
+                     year: int, month: int) -> str:
+        """Key of a listing file in `obj_store`."""
         categorySuffix = ''
         archive = ''
         if archiveOrCategory in taxonomy.ARCHIVES:
@@ -91,7 +116,7 @@ class FsListingFilesService(ListingService):
         else:
             listingFilePath = f'{listingRoot}{fileMode}{categorySuffix}'
 
-        return self.obj_store.to_obj(listingFilePath)
+        return listingFilePath
 
 
     def _current_y_m_em(self, year:int) -> Tuple[str,int,int]:
@@ -104,6 +129,21 @@ class FsListingFilesService(ListingService):
             end_month = currentMonth
         return (currentYear, currentMonth, end_month)
 
+    def _cache_key(self, key: str) -> str:
+        """Key of a listing file in the process wide caches.
+
+        This includes `document_listing_path` since the keys in `obj_store`
+        are relative to it."""
+        return f"{self.document_listing_path}:{key}"
+
+    def _cached_listing(self, key: str,
+                        parse: Callable[[FileObj], ListingT]) -> ListingT:
+        """Gets the whole parsed listing file at `key` from `listing_cache`."""
+        assert self.listing_cache is not None
+        return self.listing_cache.get_or_parse(self._cache_key(key),  # type: ignore
+                                               lambda: self.obj_store.to_obj(key),
+                                               parse)
+
     def _modified_since(self, if_modified_since: str, listingFile: FileObj) -> bool:
         """Returns whether data has been modified since `if_modified_since`."""
         if not listingFile.exists():
@@ -117,9 +157,8 @@ class FsListingFilesService(ListingService):
                                  yymmfiles: List[Tuple[int,int, FileObj]],
                                  skip: int,
                                  show: int,
-                                 if_modified_since: Optional[str] = None,
-                                 mode: ParsingMode = 'month')\
-                                 -> Union[Listing, MonthTotal, NotModifiedResponse]:
+                                 if_modified_since: Optional[str] = None)\
+                                 -> Union[Listing, NotModifiedResponse]:
         """Gets listing for a list of `months`.
 
         This gets the listings for all the months in `months`. It works fine for
@@ -130,6 +169,10 @@ class FsListingFilesService(ListingService):
         A category listing requires filtering these monthly listing files by the
         category.
 
+        The items of each monthly listing file come from `aggregates` so a file
+        is only parsed when it has changed. Only the items in the `skip` and
+        `show` window are parsed to `DocMetadata`.
+
         `if_modified_since` is the if_modified_since header value passed by the
         web client It should be in RFC 1123 format. This will return
         NotModifiedResponse if `if_modified_since` is not empty and any of the
@@ -151,10 +194,6 @@ class FsListingFilesService(ListingService):
             The quantity of listings that need to be shown.
         if_modified_since : Optional[str]
             RFC 1123 format date of an if_modified_since header.
-        mode: ParsingMode        
-            Which type if listing is requested. One of ['new', 'month',
-            'monthly_counts', 'year', 'pastweek']'month' works with a yymmfiles
-            list greater than length 1. 'new' works only with a list of length 1.
 
         Returns
         -------
@@ -169,9 +208,6 @@ class FsListingFilesService(ListingService):
             have been created yet if there has not yet been an announcement.
 
         """
-        if mode == 'new' and len(yymmfiles) > 1:
-            raise ValueError("When listing type  is 'new' yymmfiles must be size 1")
-
         currentYear, currentMonth, end_month = self._current_y_m_em(
             max([yy for yy,_,_ in yymmfiles]))
         
@@ -181,7 +217,7 @@ class FsListingFilesService(ListingService):
                 return NotModifiedResponse(True, gen_expires())
 
         # Collect updates for each month
-        all_listings: List[ListingItem] = []
+        all_items: List[MonthItem] = []
         all_pubdates: List[Tuple[date,int]] = []
         for year, month, listingFile in yymmfiles:
             if not listingFile.exists() and currentYear != str(year)\
@@ -189,21 +225,16 @@ class FsListingFilesService(ListingService):
                 # This is fine if new month and no announce has happened yet.
                 raise Exception(f"Missing monthly listing file {listingFile}")
 
-            response = get_updates_from_list_file(year, month, listingFile,
-                                                  mode, archiveOrCategory)
-            if not isinstance(response, Listing):
-                return response
-            
-            all_listings.extend(response.listings)            
-            if response.pubdates:
-                all_pubdates.extend(response.pubdates)
-            # else:
-            #     pub_date = date(year, month, 1).strftime('%a, %d %b %Y')
-            #     all_pubdates.append((pub_date, len(response.listings)))
-
-        return Listing(listings=all_listings[skip:skip + show], # Adjust for skip/show
+            key = self._listing_key('month', archiveOrCategory, year, month)
+            items = self.aggregates.get(self._cache_key(key), listingFile)\
+                                  .listed(archiveOrCategory)
+            all_items.extend(items)
+            all_pubdates.extend(month_pubdates(listingFile, len(items)))
+
+        listings = [item.to_listing_item() for item in all_items[skip:skip + show]]
+        return Listing(listings=listings, # Adjust for skip/show
                        pubdates=all_pubdates,
-                       count=len(all_listings),
+                       count=len(all_items),
                        expires= gen_expires())
 
 
@@ -274,13 +305,14 @@ class FsListingFilesService(ListingService):
         The 'new' listing maps to a single file. The filename depends on whether
         the archiveOrCategory value is an archive or category listing.
         """
-        file= self._generate_listing_path('new', archiveOrCategory, 0, 0)
-        if if_modified_since and self._modified_since(if_modified_since, file):
+        key = self._listing_key('new', archiveOrCategory, 0, 0)
+        if if_modified_since and self._modified_since(if_modified_since,
+                                                      self.obj_store.to_obj(key)):
             return NotModifiedResponse(True, gen_expires())
+        elif self.listing_cache is None:
+            return parse_new_listing_file(self.obj_store.to_obj(key), skip=skip, show=show)
         else:
-            rv =  parse_new_listing_file(file)
-            rv.listings = rv.listings[skip:skip + show] # Adjust for skip/show
-            return rv
+            return _window(self._cached_listing(key, parse_new_listing_file), skip, show)
 
     def list_pastweek_articles(self,
                                archiveOrCategory: str,
@@ -296,36 +328,30 @@ class FsListingFilesService(ListingService):
         The 'pastweek' listing maps to a single file. The filename depends on whether
         the archiveOrCategory value is an archive or category listing.
         """
-        file = self._generate_listing_path('pastweek', archiveOrCategory, 0, 0)
-        if if_modified_since and self._modified_since(if_modified_since, file):
+        key = self._listing_key('pastweek', archiveOrCategory, 0, 0)
+        if if_modified_since and self._modified_since(if_modified_since,
+                                                      self.obj_store.to_obj(key)):
             return NotModifiedResponse(True, gen_expires())
+        elif self.listing_cache is None:
+            return parse_listing_pastweek(self.obj_store.to_obj(key), skip=skip, show=show)
         else:
-            rv = parse_listing_pastweek(file)
-            rv.listings = rv.listings[skip:skip + show] # Adjust for skip/show
-            return rv
+            return _window(self._cached_listing(key, parse_listing_pastweek), skip, show)
 
     def monthly_counts(self, archive: str, year: int) -> YearCount:
         """Gets monthly listing counts for the year."""
-        monthly_counts: List[MonthTotal] = []
         new_cnt, cross_cnt = 0, 0
         currentYear, currentMonth, end_month = self._current_y_m_em(year)
 
-        files = []
+        month_totals=[]
         for month in range(1, end_month + 1):
             file = self._generate_listing_path('month', archive, year, month)
-            files.append((month, file, file.exists()))
-        month_totals=[]
-        for month, file, exists in files:
-            if not exists:
+            if not file.exists():
                 continue
-            response = get_updates_from_list_file(year, month, file, 'monthly_counts'
-                                                  # archive TODO Does this need archive?
-                                                  )
-            if isinstance(response, MonthTotal):
-                monthly_counts.append(response)
-                new_cnt += response.new
-                cross_cnt += response.cross
-                month_totals.append(MonthCount(year,month,response.new,response.cross))
+            key = self._listing_key('month', archive, year, month)
+            agg = self.aggregates.get(self._cache_key(key), file)
+            new_cnt += agg.new
+            cross_cnt += agg.cross
+            month_totals.append(MonthCount(year,month,agg.new,agg.cross))
 
         year_resp=YearCount(year, new_cnt, cross_cnt,month_totals)
 
@@ -0,0 +1,49 @@
+"""Forward only scanner over the lines of a listing file.
+
+The listing parsers used to do `text.split("\n")` and then `lines.pop(0)` for
+each line. Each `pop(0)` moves every remaining line so parsing was quadratic
+in the number of lines, which is noticeable on the large monthly listings.
+
+`LineScanner` keeps an offset into the text and finds each line as it is
+popped so there is no list of lines and each pop is proportional to the length
+of the line.
+"""
+
+
+class LineScanner():
+    """Pops lines from the front of `text`.
+
+    The lines are the same as from `text.split("\n")`: they don't have the
+    newline, a text that ends with a newline has a final empty line and an
+    empty text has a single empty line.
+
+    The scanner is true while there are lines left, like the list it
+    replaces."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+        self.done = False
+
+    def __bool__(self) -> bool:
+        return not self.done
+
+    def pop(self) -> str:
+        """Removes and returns the next line.
+
+        Raises `IndexError` if there are no lines left."""
+        if self.done:
+            raise IndexError("pop from empty LineScanner")
+        end = self.text.find("\n", self.pos)
+        if end == -1:
+            line = self.text[self.pos:]
+            self.pos = len(self.text)
+            self.done = True
+        else:
+            line = self.text[self.pos:end]
+            self.pos = end + 1
+        return line
+
+    def rest(self) -> str:
+        """The remaining lines, same as `"\n".join(lines)` on the list."""
+        return "" if self.done else self.text[self.pos:]
@@ -0,0 +1,224 @@
+"""Cache of parsed new and pastweek listings.
+
+The new and pastweek listing files change once per announcement but were
+fetched and parsed on every request. `ParsedListingCache` keeps the parsed
+`ListingNew` or `Listing` of each file with the etag, updated time and size
+of the file it was parsed from.
+
+An entry is used without checking the file for `revalidate_seconds`. After
+that the file's metadata is gotten, which is a single `stat` or GS RPC, and
+the file is only parsed again if it has changed. During the publish window,
+when the files are being rewritten, a stale entry is served while the
+revalidation is done on a background thread.
+
+If `cache_dir` is set the parsed listings are also saved there so the
+processes of a uwsgi server on the same host can share them. The directory
+should only be writable by the user browse runs as since the entries are
+pickled.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from zoneinfo import ZoneInfo
+
+from browse.controllers.response_headers import guess_next_update_utc
+from browse.services.object_store import FileObj
+
+from .month_aggregates import FileVersion, file_version
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Entry:
+    value: Any
+    version: FileVersion
+    checked: float
+    refreshing: bool = False
+
+
+class ParsedListingCache():
+    """Thread safe, bounded LRU cache of parsed listing files.
+
+    Parameters
+    ----------
+    max_entries: int
+        Maximum number of parsed listings to keep in memory.
+    revalidate_seconds: float
+        How long to trust an entry before checking if its file has changed.
+    business_tz: ZoneInfo
+        Timezone of the arXiv business offices, used to tell if it is the
+        publish window with `guess_next_update_utc`.
+    cache_dir: Optional[str]
+        Directory to share parsed listings between processes, `None` to only
+        keep them in memory.
+    """
+
+    def __init__(self,
+                 max_entries: int,
+                 revalidate_seconds: float,
+                 business_tz: ZoneInfo,
+                 cache_dir: Optional[str] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 wall_clock: Callable[[], float] = time.time) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.revalidate_seconds = revalidate_seconds
+        self.business_tz = business_tz
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    def get_or_parse(self,
+                     key: str,
+                     to_obj: Callable[[], FileObj],
+                     parse: Callable[[FileObj], Any]) -> Any:
+        """Gets the parsed listing for `key`, parsing it if needed.
+
+        `to_obj` gets the `FileObj` of the listing file, it is only called on
+        a miss or to revalidate. `parse` parses the whole file. Exceptions
+        from either are not cached.
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if now - entry.checked < self.revalidate_seconds:
+                    self.hits += 1
+                    return entry.value
+                if self._in_publish():
+                    self.stale_hits += 1
+                    if not entry.refreshing:
+                        entry.refreshing = True
+                        threading.Thread(target=self._refresh_quietly,
+                                         args=(key, entry, to_obj, parse),
+                                         daemon=True).start()
+                    return entry.value
+
+        return self._refresh(key, entry, to_obj, parse)
+
+    def _refresh(self,
+                 key: str,
+                 entry: Optional[_Entry],
+                 to_obj: Callable[[], FileObj],
+                 parse: Callable[[FileObj], Any]) -> Any:
+        """Revalidates `entry`, or loads `key` from disk or by parsing."""
+        listing_file = to_obj()
+        version = file_version(listing_file)
+        if entry is not None:
+            with self._lock:
+                self.revalidations += 1
+                if entry.version == version:
+                    entry.checked = self._clock()
+                    entry.refreshing = False
+                    self.hits += 1
+                    return entry.value
+
+        with self._lock:
+            self.misses += 1
+        value = self._load(key, version)
+        if value is None:
+            value = parse(listing_file)
+            self._save(key, version, value)
+        self._put(key, value, version)
+        return value
+
+    def _refresh_quietly(self,
+                         key: str,
+                         entry: _Entry,
+                         to_obj: Callable[[], FileObj],
+                         parse: Callable[[FileObj], Any]) -> None:
+        """Background revalidation, the stale entry is kept on error."""
+        try:
+            self._refresh(key, entry, to_obj, parse)
+        except Exception as ex:
+            logger.warning("Could not revalidate parsed listing %s: %s", key, ex)
+        finally:
+            entry.refreshing = False
+
+    def _put(self, key: str, value: Any, version: FileVersion) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = _Entry(value, version, self._clock())
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _in_publish(self) -> bool:
+        now = datetime.fromtimestamp(self._wall_clock(), tz=timezone.utc)
+        return guess_next_update_utc(self.business_tz, now)[1]
+
+    def _path(self, key: str) -> Path:
+        assert self.cache_dir is not None
+        return self.cache_dir / (hashlib.sha256(key.encode('utf-8')).hexdigest() + '.pickle')
+
+    def _load(self, key: str, version: FileVersion) -> Any:
+        """Gets the parsed listing of `version` of `key` from `cache_dir`."""
+        if self.cache_dir is None:
+            return None
+        try:
+            with self._path(key).open('rb') as fh:
+                saved_key, saved_version, value = pickle.load(fh)
+        except FileNotFoundError:
+            return None
+        except Exception as ex:
+            logger.warning("Could not read parsed listing %s from %s: %s", key, self.cache_dir, ex)
+            return None
+        if saved_key != key or saved_version != version:
+            return None
+        return value
+
+    def _save(self, key: str, version: FileVersion, value: Any) -> None:
+        """Saves the parsed listing to `cache_dir`, replacing it atomically."""
+        if self.cache_dir is None:
+            return
+        tmp_name = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile('wb', dir=self.cache_dir, delete=False) as fh:
+                tmp_name = fh.name
+                pickle.dump((key, version, value), fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, self._path(key))
+        except Exception as ex:
+            logger.warning("Could not save parsed listing %s to %s: %s", key, self.cache_dir, ex)
+            if tmp_name:
+                Path(tmp_name).unlink(missing_ok=True)
+
+    def invalidate(self, key: str) -> None:
+        """Removes `key` from the in memory cache if it is present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Removes all in memory entries, counters are not reset."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Counters and size of the cache."""
+        with self._lock:
+            return {"entries": len(self._entries),
+                    "max_entries": self.max_entries,
+                    "hits": self.hits,
+                    "stale_hits": self.stale_hits,
+                    "misses": self.misses,
+                    "revalidations": self.revalidations}
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,163 @@
+"""Aggregates of monthly listing files.
+
+The year page and the year and month listing pages used to parse every
+monthly listing file they needed on each request. The monthly listing files
+of past months never change so parsing each version of a file once is enough.
+
+A `MonthAggregate` has the new and cross counts of a monthly listing file and
+a compact `MonthItem` for each of its items. The `DocMetadata` of an item is
+only parsed when it is on the page being shown.
+
+The monthly listing file of an archive is shared by the archive and all of
+its categories. While reading the items a `CategoryIndex` is made of the new
+and cross items for each archive and category so that every listing page for
+the month is served from the one parse of the file.
+
+Aggregates are kept in a process wide cache. Each is checked against the
+etag, updated time and size of the listing file so it is remade when the file
+changes, which only happens to the listing of the current month.
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Set, Tuple
+
+from browse.services.object_store import FileObj
+
+from .parse_listing_file import MonthItem, listing_contexts, read_month_items
+
+ITEM_BYTES = 250
+"""Approximate memory of a `MonthItem` other than its raw text."""
+
+INDEX_REF_BYTES = 8
+"""Approximate memory of each reference to an item in a `CategoryIndex`."""
+
+FileVersion = Tuple[str, datetime, int]
+"""Etag, updated time and size of a listing file."""
+
+CategoryIndex = Dict[str, Tuple[Tuple[int, ...], Tuple[int, ...]]]
+"""Archive or category to the positions of its new items and its cross items."""
+
+
+def category_index(items: Tuple[MonthItem, ...]) -> CategoryIndex:
+    """Makes the `CategoryIndex` of `items` in a single pass.
+
+    A new item is listed as new in the contexts of its primary and as a cross
+    in the other contexts of its secondaries. A cross item is listed as a
+    cross in the contexts of its secondaries."""
+    new: Dict[str, List[int]] = {}
+    cross: Dict[str, List[int]] = {}
+    for pos, item in enumerate(items):
+        new_in = listing_contexts(item.primary) if item.listing_type == 'new' else set()
+        for context in new_in:
+            new.setdefault(context, []).append(pos)
+        cross_in: Set[str] = set()
+        for secondary in item.categories.split()[1:]:
+            cross_in |= listing_contexts(secondary)
+        for context in cross_in - new_in:
+            cross.setdefault(context, []).append(pos)
+    return {context: (tuple(new.get(context, ())), tuple(cross.get(context, ())))
+            for context in new.keys() | cross.keys()}
+
+
+@dataclass(frozen=True)
+class MonthAggregate:
+    """Counts and items of a monthly listing file."""
+    version: FileVersion
+    new: int
+    cross: int
+    items: Tuple[MonthItem, ...]
+    index: CategoryIndex
+
+    @classmethod
+    def from_file(cls, listing_file: FileObj) -> 'MonthAggregate':
+        version = file_version(listing_file)
+        items = tuple(read_month_items(listing_file))
+        return cls(version=version,
+                   new=sum(1 for item in items if item.listing_type == 'new'),
+                   cross=sum(1 for item in items if item.listing_type == 'cross'),
+                   items=items,
+                   index=category_index(items))
+
+    def listed(self, archiveOrCategory: str) -> List[MonthItem]:
+        """The items of the listing of `archiveOrCategory`, new then cross.
+
+        With an empty `archiveOrCategory` all the new and cross items of the
+        file are listed."""
+        if not archiveOrCategory:
+            return [item for item in self.items if item.listing_type == 'new'] \
+                + [item for item in self.items if item.listing_type == 'cross']
+        new, cross = self.index.get(archiveOrCategory, ((), ()))
+        return [self.items[pos] for pos in new] + [self.items[pos] for pos in cross]
+
+    def approx_size(self) -> int:
+        refs = sum(len(new) + len(cross) for new, cross in self.index.values())
+        return sum(ITEM_BYTES + len(item.raw) for item in self.items) \
+            + refs * INDEX_REF_BYTES
+
+
+def file_version(listing_file: FileObj) -> FileVersion:
+    """The etag, updated time and size of `listing_file`.
+
+    The updated time and size are included since local files do not have a
+    real etag."""
+    return (listing_file.etag, listing_file.updated, listing_file.size)
+
+
+class MonthAggregateCache():
+    """Thread safe LRU cache of `MonthAggregate` with a memory budget."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, MonthAggregate]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, listing_file: FileObj) -> MonthAggregate:
+        """Gets the `MonthAggregate` of `listing_file`, parsing it on a miss.
+
+        `key` is the key of the listing file in its object store. It is used
+        instead of the name of `listing_file` since local files only have the
+        file name, ex. `2006`, which is the same for every archive."""
+        version = file_version(listing_file)
+        with self._lock:
+            agg = self._entries.get(key)
+            if agg is not None and agg.version == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return agg
+            self.misses += 1
+
+        agg = MonthAggregate.from_file(listing_file)
+        size = agg.approx_size()
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.approx_size()
+            if size <= self.max_bytes:
+                self._entries[key] = agg
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._bytes -= evicted.approx_size()
+        return agg
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_month_aggregates = MonthAggregateCache(256 * 1024 * 1024)
+"""Process wide cache, this works because it is thread safe and not bound to the app context."""
+
+
+def get_month_aggregates() -> MonthAggregateCache:
+    """Gets the process wide `MonthAggregateCache`."""
+    return _month_aggregates
@@ -18,7 +18,11 @@ work for both.
 import codecs
 import re
 from datetime import date, datetime
-from typing import List, Literal, Tuple, Union
+from functools import lru_cache
+from typing import (Dict, FrozenSet, Iterator, List, Literal, NamedTuple,
+                    Optional, Set, Tuple, Union)
+
+from arxiv import taxonomy
 
 from browse.domain.category import Category
 from browse.domain.metadata import DocMetadata, AuthorList
@@ -27,6 +31,7 @@ from browse.services.object_store import FileObj
 from browse.services.listing import (Listing, ListingItem,
                                      MonthTotal, NotModifiedResponse,
                                      gen_expires)
+from browse.services.listing.line_scanner import LineScanner
 
 DATE     = re.compile(r'^Date:\s+')
 SUBJECT  = re.compile(r'^Subject:\s+')
@@ -116,10 +121,61 @@ def get_updates_from_list_file(year:int, month: int, listingFilePath: FileObj,
     pub_dates:List[date] = []
     pub_counts:List[int] = []
 
+    for item_lines, article, neworcross in _read_items(listingFilePath):
+        # If we have id, register the update
+        #   apply filtering (if we are dealing with monthly listing)
+        if article:
+            primary = article.primary_category.id if article.primary_category else ''
+            listed = listed_as(primary, article.categories, neworcross, listingFilter)
+            if listed:
+                item = ListingItem(id=article.arxiv_id, listingType=neworcross,
+                                   primary=primary, article=article)
+                if listed == 'new':
+                    new_items.append(item)
+                elif listed == 'cross':
+                    cross_items.append(item)
+                elif listed == 'rep':
+                    rep_items.append(item)
+
+    count = len(new_items)
+
+    pub_dates_with_count:List[Tuple[date,int]] = []
+    index = 0
+    for pdate in pub_dates:
+        pub_dates_with_count.append((pdate, pub_counts[index]))
+        index = index + 1
+
+    for pd in pub_dates_with_count:
+        (date, count) = pd
+
+    if parsingMode == 'monthly_counts':
+        # We need the new and cross counts for the monthly count summary
+        return MonthTotal(
+            year=year, month=month, new=len(new_items), cross=len(cross_items),
+            expires=gen_expires(), listings=new_items + cross_items + rep_items)
+    else:
+        # There are no pubdates for month, so we will create one and add count
+        # to be consistent with API
+        if parsingMode == 'month':
+            pub_dates_with_count.extend(month_pubdates(listingFilePath,
+                                                       len(new_items + cross_items)))
+
+        return Listing(listings=new_items + cross_items,
+                       pubdates=pub_dates_with_count,
+                       count=len(new_items + cross_items),
+                       expires=gen_expires())
+
+
+
+def _read_items(listingFilePath: FileObj) -> Iterator[Tuple[List[str], DocMetadata, str]]:
+    """Reads the items of a monthly listing file.
+
+    Yields the lines of each item, the item parsed to a `DocMetadata` and
+    whether it is a new or cross."""
     with listingFilePath.open('rb') as fh:
         data = fh.read()
 
-    lines = codecs.decode(data, encoding='utf-8',errors='ignore').split("\n")
+    lines = LineScanner(codecs.decode(data, encoding='utf-8',errors='ignore'))
 
 
     # Skip forward to first \\,
@@ -128,15 +184,15 @@ def get_updates_from_list_file(year:int, month: int, listingFilePath: FileObj,
     # /*Tue, 20 Jul 2021 */
     #\\
     #   or first update entry for monthly listing
-    line = lines.pop(0)
-    while (len(lines) and not re.match(r'^\\', line)):
-        line = lines.pop(0)
+    line = lines.pop()
+    while (lines and not re.match(r'^\\', line)):
+        line = lines.pop()
         line = line.replace('\n', '')
 
     # Now cycle through and process update entries in file
     type = 'new'
 
-    line = lines.pop(0)
+    line = lines.pop()
     line = line.replace('\n', '')
     while (line):
         # check for special markup
@@ -144,8 +200,8 @@ def get_updates_from_list_file(year:int, month: int, listingFilePath: FileObj,
         while (is_rule):
             if is_rule and type_change:
                 type = type_change
-            if len(lines):
-                line = lines.pop(0)
+            if lines:
+                line = lines.pop()
             else:
                 break
             (is_rule, type_change) = _is_rule(line, type)
@@ -153,44 +209,22 @@ def get_updates_from_list_file(year:int, month: int, listingFilePath: FileObj,
                 break
 
         # Read up to the next \\
-        while (len(lines) and re.match(r'^\\', line)):
-            if len(lines):
-                line = lines.pop(0)
+        while (lines and re.match(r'^\\', line)):
+            if lines:
+                line = lines.pop()
 
         # Now process all fields up to the next \\
         item_lines=[]
-        while (len(lines) and not re.match(r'^\\', line)):
+        while (lines and not re.match(r'^\\', line)):
             item_lines.append(line)
-            if len(lines):
-                line = lines.pop(0)
+            if lines:
+                line = lines.pop()
                 line = line.replace('\n', '')
             else:
                 break
 
         article, neworcross = _parse_item(item_lines)
-
-        # If we have id, register the update
-        #   apply filtering (if we are dealing with monthly listing)
-        if article:
-            primary = article.primary_category.id if article.primary_category else ''
-            if not listingFilter or (re.match(f'^{listingFilter}', primary)
-                                     and neworcross == 'new' ):
-                # push update
-                item = ListingItem(id=article.arxiv_id, listingType=neworcross,
-                                   primary=primary, article=article)
-                if neworcross == 'new':
-                    new_items.append(item)
-                elif neworcross == 'cross':
-                    cross_items.append(item)
-                elif neworcross =='rep':
-                    rep_items.append(item)
-
-            elif listingFilter:
-                secondaries = ' '.join(article.categories.split()[1:])  # type: ignore
-                if re.search(listingFilter, secondaries):
-                    item = ListingItem(id=article.arxiv_id, listingType=neworcross,
-                                       primary=primary, article=article)
-                    cross_items.append(item)
+        yield item_lines, article, neworcross
 
         # From original parser
         #  Now complete the reading of this entry by reading everything up to the
@@ -199,51 +233,104 @@ def get_updates_from_list_file(year:int, month: int, listingFilePath: FileObj,
         (rule, new_type) = _is_rule(line, type)
         if new_type:
             type = new_type
-        while len(lines) and not rule:
-            line = lines.pop(0)
+        while lines and not rule:
+            line = lines.pop()
             line = line.replace('\n', '')
             (rule, new_type) = _is_rule(line, type)
             if new_type:
                 type = new_type
 
         # Read the next line for while loop
-        if len(lines):
-            line = lines.pop(0)
+        if lines:
+            line = lines.pop()
             line = line.replace('\n', '')
         else:
             break
 
-    count = len(new_items)
-
-    pub_dates_with_count:List[Tuple[date,int]] = []
-    index = 0
-    for pdate in pub_dates:
-        pub_dates_with_count.append((pdate, pub_counts[index]))
-        index = index + 1
-
-    for pd in pub_dates_with_count:
-        (date, count) = pd
-
-    if parsingMode == 'monthly_counts':
-        # We need the new and cross counts for the monthly count summary
-        return MonthTotal(
-            year=year, month=month, new=len(new_items), cross=len(cross_items),
-            expires=gen_expires(), listings=new_items + cross_items + rep_items)
-    else:
-        # There are no pubdates for month, so we will create one and add count
-        # to be consistent with API
-        if parsingMode == 'month':
-            date = re.search(r'(?P<date>\d{4})$', str(listingFilePath))
-            if date:
-                yymm_string = date.group('date')
-                pub_date = datetime.strptime(yymm_string, '%y%m')
-                pub_dates_with_count.append((pub_date, len(new_items + cross_items)))
-
-        return Listing(listings=new_items + cross_items,
-                       pubdates=pub_dates_with_count,
-                       count=len(new_items + cross_items),
-                       expires=gen_expires())
 
+_ALIASES: Dict[str, str] = {**taxonomy.CATEGORY_ALIASES,
+                            **{v: k for k, v in taxonomy.CATEGORY_ALIASES.items()}}
+
+
+def listing_contexts(category: str) -> Set[str]:
+    """The archives and categories whose listings include `category`.
+
+    This is the category itself, its archive, and the same for its alias if
+    it has one. Ex. `math-ph` is also listed in `math.MP` and `math`."""
+    contexts = set()
+    for cat in [category, _ALIASES.get(category)]:
+        if cat:
+            contexts.add(cat)
+            contexts.add(cat.split('.')[0])
+    return contexts
+
+
+@lru_cache(maxsize=None)
+def categories_in(archiveOrCategory: str) -> FrozenSet[str]:
+    """The categories listed in the listing of `archiveOrCategory`.
+
+    Made once for each archive or category from `taxonomy.CATEGORIES`, this
+    is the inverse of `listing_contexts`."""
+    return frozenset([archiveOrCategory] +
+                     [cat for cat in taxonomy.CATEGORIES
+                      if archiveOrCategory in listing_contexts(cat)])
+
+
+def listed_as(primary: str, categories: Optional[str], neworcross: str,
+              listingFilter: str) -> Optional[str]:
+    """Which part of a listing filtered by `listingFilter` an item goes in.
+
+    Returns 'new', 'cross' or 'rep', or `None` if the item is not in the
+    listing. Without a filter every item goes in the part it was listed as.
+    With a filter, which is an archive or category, new items with a primary
+    in the filter are listed as new and items with a secondary in the filter
+    are listed as crosses."""
+    if not listingFilter:
+        return neworcross if neworcross in ('new', 'cross', 'rep') else None
+    listed = categories_in(listingFilter)
+    if neworcross == 'new' and primary in listed:
+        return 'new'
+    if any(cat in listed for cat in (categories or '').split()[1:]):
+        return 'cross'
+    return None
+
+
+def month_pubdates(listingFilePath: FileObj, count: int) -> List[Tuple[date, int]]:
+    """The pubdate of a monthly listing file, if the month is in its name."""
+    date = re.search(r'(?P<date>\d{4})$', str(listingFilePath))
+    if date:
+        yymm_string = date.group('date')
+        pub_date = datetime.strptime(yymm_string, '%y%m')
+        return [(pub_date, count)]
+    return []
+
+
+class MonthItem(NamedTuple):
+    """An item of a monthly listing file with just what is needed to filter it.
+
+    `raw` is the lines of the item, `to_listing_item` parses it to get the
+    `DocMetadata`."""
+    id: str
+    listing_type: str
+    primary: str
+    categories: str
+    raw: str
+
+    def to_listing_item(self) -> ListingItem:
+        article, _ = _parse_item(self.raw.split("\n"))
+        return ListingItem(id=article.arxiv_id, listingType=self.listing_type,
+                           primary=self.primary, article=article)
+
+
+def read_month_items(listingFilePath: FileObj) -> List[MonthItem]:
+    """Reads all the items of a monthly listing file without filtering."""
+    items: List[MonthItem] = []
+    for item_lines, article, neworcross in _read_items(listingFilePath):
+        if article:
+            primary = article.primary_category.id if article.primary_category else ''
+            items.append(MonthItem(article.arxiv_id, neworcross, primary,
+                                   article.categories or '', "\n".join(item_lines)))
+    return items
 
 
 RE_FROM_FIELD = re.compile(
@@ -20,24 +20,30 @@ that indicate the date.
 import codecs
 import re
 from datetime import datetime
-from typing import List, Literal, Tuple, Union
+from typing import List, Literal, Optional, Tuple, Union
 from dataclasses import dataclass
 
 from browse.domain.metadata import DocMetadata
 from browse.services.object_store import FileObj
 from browse.services.documents.fs_implementation.parse_abs import parse_abs_top
 from browse.services.listing import (ListingItem, Listing, gen_expires)
+from browse.services.listing.line_scanner import LineScanner
 
 
 
 @dataclass
 class PastweekDay:
-    """A list of items from a single day"""
+    """A list of items from a single day
+
+    count is the number of items on the day, items may have only some of
+    them if a window of the listing was parsed."""
     datestr: str
     items: List[ListingItem]
+    count: int = 0
 
 
-def parse_listing_pastweek(listingFilePath: FileObj)\
+def parse_listing_pastweek(listingFilePath: FileObj,
+                           skip: int = 0, show: Optional[int] = None)\
         -> Listing:
     """Read the paperids that have been updated from a listings file.
 
@@ -52,7 +58,13 @@ def parse_listing_pastweek(listingFilePath: FileObj)\
     pastweek.CL, pastweek.DF, etc.
 
     Listing file markup is used to identify new and cross submissions.
+
+    All items are counted but only the `show` items after `skip` are parsed
+    to `DocMetadata` and returned in the listings. With the default `show` of
+    `None` all items are returned.
     """
+    end = None if show is None else skip + show
+    index = 0
     days: List[PastweekDay] = []
     day = PastweekDay('warning-unset',[])
     section = 'new'
@@ -60,15 +72,15 @@ def parse_listing_pastweek(listingFilePath: FileObj)\
     with listingFilePath.open('rb') as fh:
         data = fh.read()
 
-    lines = codecs.decode(data, encoding='utf-8',errors='ignore').split("\n")
-    line = lines.pop(0).replace('\n','')
+    lines = LineScanner(codecs.decode(data, encoding='utf-8',errors='ignore'))
+    line = lines.pop().replace('\n','')
     while(line):
         (is_rule, section_change) = _is_rule(line, section)
         while (is_rule):
             if is_rule and section_change:
                 section = section_change
-            if len(lines):
-                line = lines.pop(0).replace('\n','')
+            if lines:
+                line = lines.pop().replace('\n','')
             else:
                 break
             (is_rule, section_change) = _is_rule(line, section)
@@ -76,16 +88,16 @@ def parse_listing_pastweek(listingFilePath: FileObj)\
                 break
 
         # consume any \\
-        while (len(lines) and re.match(r'^\\', line)):
-            line = lines.pop(0).replace('\n','')
+        while (lines and re.match(r'^\\', line)):
+            line = lines.pop().replace('\n','')
 
         # Now accumulate all lines up to the next \\
         listing_lines: List[str] = []
         # Since the non-new listings don't have abstracts we don't have the
         # problem of // being in the abstract so we can just use the // delimiters.
-        while (len(lines) and not re.match(r'^\\', line)):
+        while (lines and not re.match(r'^\\', line)):
             listing_lines.append(line)
-            line = lines.pop(0).replace('\n','')
+            line = lines.pop().replace('\n','')
 
 
         start_new_date = re.search(r"/\* (.*) \*/", " ".join(listing_lines))
@@ -93,33 +105,36 @@ def parse_listing_pastweek(listingFilePath: FileObj)\
             day = PastweekDay(start_new_date.group(1), [])
             days.append(day)
         else:
-            doc, type = _parse_doc(listing_lines)
-            if doc:
-                item = ListingItem(id=doc.arxiv_id, listingType=type,
-                                   primary=doc.primary_category.id, # type: ignore
-                                   article=doc)
-                day.items.append(item)
+            if skip <= index and (end is None or index < end):
+                doc, type = _parse_doc(listing_lines)
+                if doc:
+                    item = ListingItem(id=doc.arxiv_id, listingType=type,
+                                       primary=doc.primary_category.id, # type: ignore
+                                       article=doc)
+                    day.items.append(item)
+            day.count += 1
+            index += 1
 
         #  Now complete the reading of this entry by reading everything up to the
         #  next rule.
         (rule, new_section) = _is_rule(line, section)
         if new_section:
             section = new_section
-        while len(lines) and not rule:
-            line = lines.pop(0).replace('\n','')
+        while lines and not rule:
+            line = lines.pop().replace('\n','')
             (rule, new_section) = _is_rule(line, section)
             if new_section:
                 section = new_section
 
         # Read the next line for while loop
-        if len(lines):
-            line = lines.pop(0).replace('\n','')
+        if lines:
+            line = lines.pop().replace('\n','')
         else:
             break
 
     listings = [item for day in days for item in day.items]
     return Listing(listings=listings,
-                   count=len(listings),
+                   count=index,
                    pubdates=_recent_skip_for_days(days),
                    expires=gen_expires())
 
@@ -174,6 +189,6 @@ def _is_rule(line: str, type: str) -> Tuple[int, Literal['','cross','rep','end']
 
 def _recent_skip_for_days(days:List[PastweekDay]) -> List[Tuple[datetime,int]]:
     """For each day make the number of items to skip to get to that day."""
-    counts = [len(day.items) for day in days[:-1]]
+    counts = [day.count for day in days[:-1]]
     counts.insert(0,0) # skip zero for first entry
     return [(datetime.strptime(day.datestr, '%a, %d %b %Y'), count) for day, count in  zip(days, counts)]
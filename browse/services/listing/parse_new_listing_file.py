@@ -20,6 +20,7 @@ from browse.services.documents.fs_implementation.parse_abs import (
     parse_abs, parse_abs_top)
 from browse.services.listing import (ListingItem, ListingNew,
                                      gen_expires)
+from browse.services.listing.line_scanner import LineScanner
 
 DATE     = re.compile(r'^Date:\s+')
 SUBJECT  = re.compile(r'^Subject:\s+')
@@ -61,7 +62,8 @@ def _is_rule(line: str, type: str) -> Tuple[int, Literal['','cross','rep','end']
     return (0, '')
 
 
-def parse_new_listing_file(listingFilePath: FileObj, listingFilter: str='')\
+def parse_new_listing_file(listingFilePath: FileObj, listingFilter: str='',
+                           skip: int = 0, show: Optional[int] = None)\
                            -> Union[ListingNew]:
     """Parses a new or new.{CATEGORY} listing file.
 
@@ -70,13 +72,13 @@ def parse_new_listing_file(listingFilePath: FileObj, listingFilter: str='')\
     etc.
 
     Listing file markup is used to identify new and cross submissions.
+
+    The new, cross and rep items are all counted but only the `show` items
+    after `skip`, in that order, are parsed to `DocMetadata` and returned in
+    the listings. With the default `show` of `None` all items are returned.
     """
     extras = {}
 
-    new_items:List[ListingItem] = []
-    cross_items:List[ListingItem] = []
-    rep_items:List[ListingItem] = []
-
     # new
     announce_date: Optional[date] = None
     submit_start_date: Optional[date] = None
@@ -85,11 +87,11 @@ def parse_new_listing_file(listingFilePath: FileObj, listingFilter: str='')\
     with listingFilePath.open('rb') as fh:
         rawdata = fh.read()
     data =codecs.decode(rawdata, encoding='utf-8',errors='ignore')
-    lines = data.split("\n")
+    lines = LineScanner(data)
 
     # First line is always the date.
     # Date: Tue, 20 Jul 21 00:51:12 GMT
-    dateline = lines.pop(0)
+    dateline = lines.pop()
     dateline = dateline.replace('\n', '')
 
     if DATE.match(dateline):
@@ -100,7 +102,7 @@ def parse_new_listing_file(listingFilePath: FileObj, listingFilter: str='')\
         announce_date = datetime.strptime(short_date, '%a, %d %b %y')
 
     # Subject: cs daily 346 new + 55 crosses received
-    line = lines.pop(0)
+    line = lines.pop()
     if SUBJECT.match(line):
         subject = line
         extras['Subject'] = subject
@@ -121,7 +123,7 @@ def parse_new_listing_file(listingFilePath: FileObj, listingFilter: str='')\
     # advance to "\\" just before first listing
     rules_to_pop = 5
     while( rules_to_pop ):
-        line = lines.pop(0)
+        line = lines.pop()
         if line.startswith('--------'):
             rules_to_pop = rules_to_pop - 1
 
@@ -130,16 +132,21 @@ def parse_new_listing_file(listingFilePath: FileObj, listingFilter: str='')\
     # should be at // that is part of the first listing item Now cycle through
     # and process update entries in file.
 
-    new_lines, cross_lines, rep, end = _split_sections(("\n").join(lines))
-    new_items = [_to_item(data, 'new') for data in _split_items(new_lines)]
-    cross_items = [_to_item(data, 'cross') for data in _split_items(cross_lines)]
-    rep_items = [_to_item(data, 'rep') for data in _split_items(rep)]
+    new_lines, cross_lines, rep, end = _split_sections(lines.rest())
+    new_data = _split_items(new_lines)
+    cross_data = _split_items(cross_lines)
+    rep_data = _split_items(rep)
+
+    all_data = [(data, 'new') for data in new_data] \
+        + [(data, 'cross') for data in cross_data] \
+        + [(data, 'rep') for data in rep_data]
+    window = all_data[skip:] if show is None else all_data[skip:skip + show]
 
-    return ListingNew(listings= new_items + cross_items + rep_items,
+    return ListingNew(listings= [_to_item(data, ltype) for data, ltype in window],  # type: ignore
                       announced= announce_date,  # type: ignore
-                      new_count= len(new_items),
-                      cross_count= len(cross_items),
-                      rep_count= len(rep_items),
+                      new_count= len(new_data),
+                      cross_count= len(cross_data),
+                      rep_count= len(rep_data),
                       expires= gen_expires())
 
 
@@ -1,7 +1,7 @@
 """The object store service to access local or cloud files."""
 
 from abc import ABC, abstractmethod
-from typing import Iterable, Literal, Tuple
+from typing import Iterable, List, Literal, Sequence, Tuple
 
 from .fileobj import FileObj
 
@@ -14,6 +14,13 @@ class ObjectStore(ABC):
         """Gets a `FileObj` given a key"""
         pass
 
+    def to_objs(self, keys: Sequence[str]) -> List[FileObj]:
+        """Gets a `FileObj` for each of `keys`, in the same order.
+
+        Missing keys get a `FileDoesNotExist`. Stores that can get several
+        objects in one request should override this."""
+        return [self.to_obj(key) for key in keys]
+
     @abstractmethod
     def list(self, dir: str) -> Iterable[FileObj]:
         """Gets a listing similar to returned by `Client.list_blobs()`
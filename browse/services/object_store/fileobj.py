@@ -10,6 +10,10 @@ from types import TracebackType
 import typing
 from typing import BinaryIO, Optional
 
+if typing.TYPE_CHECKING:
+    from .gzip_size import GzipSizeCache
+    from .tar_index import TarIndex
+
 class BinaryMinimalFile(typing.Protocol):
     def read(self, size: Optional[int] = -1) -> bytes:
         pass
@@ -193,11 +197,16 @@ class MockStringFileObj(FileObj):
 
 
 class UngzippedFileObj(FileObj):
-    """File object backed by different file object and un-gzipped."""
+    """File object backed by different file object and un-gzipped.
+
+    The size is gotten with `browse.services.object_store.gzip_size`, sizes
+    that need a decompress are kept in `size_cache` or the process wide
+    `GzipSizeCache`."""
 
-    def __init__(self, gzipped_file: FileObj):
+    def __init__(self, gzipped_file: FileObj, size_cache: Optional['GzipSizeCache'] = None):
         self._fileobj = gzipped_file
         self._size = -1
+        self._size_cache = size_cache
 
     @property
     def name(self) -> str:
@@ -222,17 +231,12 @@ class UngzippedFileObj(FileObj):
 
     @property
     def size(self) -> int:
-        if self._size >= 0:
-            return self._size
-        else:
-            # Seems gzip files will have the size as the last 4 bytes of the
-            # file.  That won't record file sizes larger than 4Gb and there may
-            # be other quirks.  So for now we get it by reading and unzipping
-            # the whole file.
-            with self._fileobj.open("rb") as unzip_f:
-                size = unzip_f.seek(0, io.SEEK_END)
-                self._size = size
-            return self._size
+        if self._size < 0:
+            # ISIZE in the last 4 bytes of the file is only used when it cannot
+            # be past 4GB, otherwise the file is decompressed once and cached.
+            from .gzip_size import gzip_size
+            self._size = gzip_size(self._fileobj, self._size_cache)
+        return self._size
 
     @property
     def updated(self) -> datetime:
@@ -250,14 +254,18 @@ class FileNotFound(Exception):
 
 
 class FileFromTar(FileObj):
-    """Single file from a tar `FileObj`."""
+    """Single file from a tar `FileObj`.
+
+    If `tar_index` is passed it is used to find and open `path` without
+    scanning the tar, see `browse.services.object_store.tar_index`."""
 
-    def __init__(self, tar_file: FileObj, path: str):
+    def __init__(self, tar_file: FileObj, path: str, tar_index: Optional['TarIndex'] = None):
         self._fileobj = tar_file
         self._path = path
         self._size = -1
         self._path_exists: Optional[bool] = None
         self._tarinfo: Optional[tarfile.TarInfo] = None
+        self._tar_index = tar_index
 
     @property
     def name(self) -> str:
@@ -273,6 +281,13 @@ class FileFromTar(FileObj):
         if self._path_exists is not None:
             return self._path_exists
 
+        if self._tar_index is not None:
+            member = self._tar_index.members.get(self._path)
+            self._path_exists = member is not None
+            if member is not None:
+                self._size = member.size
+            return self._path_exists
+
         if not self._fileobj.exists():
             self._path_exists = False
             return False
@@ -289,6 +304,13 @@ class FileFromTar(FileObj):
                     return False
 
     def open(self, mode:str) -> BinaryMinimalFile:
+        if self._tar_index is not None:
+            if self._path not in self._tar_index.members:
+                raise FileNotFound(f"could not find {self._path} in tar")
+            self._size = self._tar_index.members[self._path].size
+            return typing.cast(BinaryMinimalFile,
+                               self._tar_index.open_member(self._fileobj.open(mode), self._path))
+
         # Why does this not use `with`? Because after the return it would be out of the with scope
         # and the file will be closed and unusable.
         fh = self._fileobj.open(mode)
@@ -331,46 +353,77 @@ DEFAULT_IO_SIZE = 8 * 1024 * 1024
 
 
 class BinaryMinimalFileTransformed(BinaryMinimalFile):
-    """A file like object that includes a transform."""
+    """A file like object that includes a transform.
+
+    The transform is applied to each line of `inner_io`, up to
+    `DEFAULT_IO_SIZE` bytes of a line at a time. The transformed data is kept
+    in a `bytearray` that is only compacted once more than half of it has
+    been read so reading the whole file is linear in its size for any mix of
+    `read()` and `readline()` calls."""
 
     def __init__(self, inner_io: BinaryMinimalFile, transform: typing.Callable[[bytes], bytes]):
         self.transform = transform
         self.io = inner_io
-        self.buffer = b""
+        self.buffer = bytearray()
+        self.pos = 0
+        self.eof = False
         self.at_start = True
         super().__init__()
 
-    def readline(self, size: Optional[int] = -1) -> bytes:
-        if size is None or size <= 0:
-            size = DEFAULT_IO_SIZE
-        if not self.buffer:
-            data = self.read(size)
-            self.buffer = data + self.buffer
+    def _fill(self) -> bool:
+        """Transforms the next line of `io` into the buffer.
 
-        lines = self.buffer.split(b"\n")
-        line = lines[0]
-        self.buffer = b"\n".join(lines[1:])
-        return line
+        Returns `False` if `io` is at EOF."""
+        if self.eof:
+            return False
+        if self.pos > len(self.buffer) // 2:
+            del self.buffer[:self.pos]
+            self.pos = 0
+        line = self.io.readline(DEFAULT_IO_SIZE)
+        if not line:
+            self.eof = True
+            return False
+        self.buffer += self.transform(line)
+        return True
 
-    def read(self, size: Optional[int] = -1) -> bytes:
-        if size is None or size <= 0:
-            size = DEFAULT_IO_SIZE
+    def _take(self, end: int) -> bytes:
+        """Returns the buffer from `pos` to `end` and moves `pos` to `end`."""
+        end = min(end, len(self.buffer))
+        with memoryview(self.buffer) as view:
+            data = bytes(view[self.pos:end])
+        self.pos = end
+        return data
 
+    def readline(self, size: Optional[int] = -1) -> bytes:
+        """Reads up to and including the next newline, or up to `size` bytes."""
         self.at_start = False
+        if size is None or size < 0:
+            size = None
+        searched = 0  # Relative to pos since _fill() may compact the buffer
         while True:
-            data = self.io.readline(size)
-            self.buffer = self.buffer + self.transform(data)
-            if not data or len(self.buffer) >= size:
+            newline = self.buffer.find(b"\n", self.pos + searched)
+            if newline >= 0:
+                end = newline + 1
                 break
+            searched = len(self.buffer) - self.pos
+            if (size is not None and searched >= size) or not self._fill():
+                end = len(self.buffer)
+                break
+        if size is not None:
+            end = min(end, self.pos + size)
+        return self._take(end)
 
-        if len(self.buffer) <= size:
-            to_return = self.buffer
-            self.buffer = b""
-            return to_return
-        else:
-            to_return = self.buffer[:size]
-            self.buffer = self.buffer[size:]
-            return to_return
+    def read(self, size: Optional[int] = -1) -> bytes:
+        """Reads up to `size` bytes, or to the end if `size` is `None` or negative."""
+        self.at_start = False
+        if size is None or size < 0:
+            while self._fill():
+                pass
+            return self._take(len(self.buffer))
+
+        while len(self.buffer) - self.pos < size and self._fill():
+            pass
+        return self._take(self.pos + size)
 
     def seek(self, pos: int, whence: int = io.SEEK_SET) -> int:
         if not self.at_start:
@@ -382,7 +435,8 @@ class BinaryMinimalFileTransformed(BinaryMinimalFile):
 
     def close(self) -> None:
         self.io.close()
-        self.buffer = b""
+        self.buffer = bytearray()
+        self.pos = 0
         self.at_start = True
 
     def __enter__(self) -> 'BinaryMinimalFile':
@@ -395,10 +449,12 @@ class BinaryMinimalFileTransformed(BinaryMinimalFile):
         self.close()
 
     def __iter__(self) -> typing.Iterator[bytes]:
-        for line in self.io:
-            yield self.transform(line)
-
-
+        """Lines of the transformed data."""
+        while True:
+            line = self.readline()
+            if not line:
+                return
+            yield line
 
 
 class FileTransform(FileObj):
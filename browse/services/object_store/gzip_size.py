@@ -0,0 +1,173 @@
+"""Uncompressed size of gzip files without decompressing them.
+
+The last 4 bytes of a gzip file, ISIZE, are the uncompressed size of its last
+member modulo 2^32. deflate cannot compress by more than `MAX_DEFLATE_RATIO`
+so if the compressed file is small enough the uncompressed size is under 4GB
+and ISIZE is exact. That only needs a ranged read of the last 4 bytes.
+
+Larger files are decompressed once to count their size. The size is then kept
+in a `GzipSizeCache` by the etag, name and compressed size of the file. If the
+cache has a `cache_dir` the sizes are also saved there so other processes and
+restarts do not decompress the file again.
+
+This assumes single member gzip files, as made by `gzip`, which is what the
+arXiv .ps.gz, .dvi.gz and .html.gz files are.
+"""
+import gzip
+import hashlib
+import io
+import logging
+import os
+import struct
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+from .fileobj import FileObj
+
+logger = logging.getLogger(__name__)
+
+MAX_DEFLATE_RATIO = 1032
+"""Max ratio of uncompressed to compressed size that deflate can reach."""
+
+GZIP_MIN_SIZE = 18
+"""Size of the gzip header and trailer of an empty gzip file."""
+
+SizeKey = Tuple[str, str, int, str]
+"""Name, etag, compressed size and updated time of a gzip file.
+
+The size and updated time are included since local files do not have a real
+etag."""
+
+
+def isize_is_exact(compressed_size: int) -> bool:
+    """Is ISIZE the exact uncompressed size of a file of `compressed_size`?"""
+    return GZIP_MIN_SIZE <= compressed_size and compressed_size * MAX_DEFLATE_RATIO < 2 ** 32
+
+
+def read_isize(gzipped: FileObj) -> int:
+    """Reads the ISIZE trailer of `gzipped`, this is a ranged read on GS."""
+    with gzipped.open('rb') as fh:
+        fh.seek(-4, io.SEEK_END)
+        trailer = fh.read(4)
+    if len(trailer) != 4:
+        raise ValueError(f"Could not read the gzip trailer of {gzipped.name}")
+    return int(struct.unpack('<I', trailer)[0])
+
+
+def decompressed_size(gzipped: FileObj) -> int:
+    """Gets the size of `gzipped` by decompressing all of it."""
+    # GzipFile does not close a fileobj it is given
+    with gzipped.open('rb') as raw, gzip.GzipFile(fileobj=raw, mode='rb') as unzip_f:
+        return unzip_f.seek(0, io.SEEK_END)
+
+
+class GzipSizeCache():
+    """Thread safe, bounded LRU cache of uncompressed sizes by `SizeKey`.
+
+    Parameters
+    ----------
+    max_entries: int
+        Maximum number of sizes to keep in memory.
+    cache_dir: Optional[str]
+        Directory to save sizes in, `None` to only keep them in memory.
+    """
+
+    def __init__(self, max_entries: int, cache_dir: Optional[str] = None):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._lock = threading.Lock()
+        self._sizes: "OrderedDict[SizeKey, int]" = OrderedDict()
+
+    def get(self, key: SizeKey) -> Optional[int]:
+        with self._lock:
+            size = self._sizes.get(key)
+            if size is not None:
+                self._sizes.move_to_end(key)
+                return size
+        size = self._load(key)
+        if size is not None:
+            self._put(key, size)
+        return size
+
+    def put(self, key: SizeKey, size: int) -> None:
+        self._put(key, size)
+        self._save(key, size)
+
+    def _put(self, key: SizeKey, size: int) -> None:
+        with self._lock:
+            self._sizes.pop(key, None)
+            self._sizes[key] = size
+            while len(self._sizes) > self.max_entries:
+                self._sizes.popitem(last=False)
+
+    def _path(self, key: SizeKey) -> Path:
+        assert self.cache_dir is not None
+        return self.cache_dir / (hashlib.sha256(repr(key).encode('utf-8')).hexdigest() + '.size')
+
+    def _load(self, key: SizeKey) -> Optional[int]:
+        if self.cache_dir is None:
+            return None
+        try:
+            saved_key, size = self._path(key).read_text().rsplit("\n", 1)
+            return int(size) if saved_key == repr(key) else None
+        except FileNotFoundError:
+            return None
+        except Exception as ex:
+            logger.warning("Could not read gzip size of %s from %s: %s", key[0], self.cache_dir, ex)
+            return None
+
+    def _save(self, key: SizeKey, size: int) -> None:
+        """Saves the size to `cache_dir`, replacing it atomically."""
+        if self.cache_dir is None:
+            return
+        tmp_name = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile('w', dir=self.cache_dir, delete=False) as fh:
+                tmp_name = fh.name
+                fh.write(f"{key!r}\n{size}")
+            os.replace(tmp_name, self._path(key))
+        except Exception as ex:
+            logger.warning("Could not save gzip size of %s to %s: %s", key[0], self.cache_dir, ex)
+            if tmp_name:
+                Path(tmp_name).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Removes all in memory entries."""
+        with self._lock:
+            self._sizes.clear()
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+
+_gzip_size_cache = GzipSizeCache(100000)
+"""Process wide cache, this works because it is thread safe and not bound to the app context."""
+
+
+def get_gzip_size_cache() -> GzipSizeCache:
+    """Gets the process wide `GzipSizeCache`."""
+    return _gzip_size_cache
+
+
+def gzip_size(gzipped: FileObj, cache: Optional[GzipSizeCache] = None) -> int:
+    """Gets the uncompressed size of `gzipped`.
+
+    Uses ISIZE if it is exact for the size of `gzipped`, otherwise the size in
+    `cache`, otherwise decompresses `gzipped` and saves its size in `cache`."""
+    compressed_size = gzipped.size
+    if isize_is_exact(compressed_size):
+        return read_isize(gzipped)
+
+    cache = cache if cache is not None else _gzip_size_cache
+    key = (gzipped.name, gzipped.etag, compressed_size, gzipped.updated.isoformat())
+    size = cache.get(key)
+    if size is None:
+        size = decompressed_size(gzipped)
+        cache.put(key, size)
+    return size
@@ -0,0 +1,271 @@
+"""ObjectStore that keeps copies of objects on local disk.
+
+After an announcement a few hundred papers get most of the traffic but each
+request for their PDF or source streams the object from GS again.
+`CachingObjectStore` wraps another `ObjectStore` and, when an object is
+opened, copies it to a local directory, which may be a tmpfs, and serves it
+from there.
+
+The `FileObj` of a key is still gotten from the wrapped store on each
+`to_obj()`, for GS that is the same single metadata RPC as before. That is
+used to revalidate the copy: each copy is for one generation, or etag, size
+and updated time, of the object so a changed object is copied again.
+
+The copies are evicted in LRU order to keep the total under `max_bytes`.
+Only one thread fetches a given object, others opening it wait for that
+fetch. The copies are normal files so ranged reads seek in the copy.
+
+The byte budget is for each process. Copies left in the directory by an
+earlier process are used and counted when it starts.
+"""
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Literal, Optional, Sequence, Tuple
+
+from . import ObjectStore
+from .fileobj import BinaryMinimalFile, FileDoesNotExist, FileObj, LocalFileObj
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Copy:
+    path: Path
+    size: int
+
+
+def _version(fileobj: FileObj) -> str:
+    """The generation of a GS `Blob`, otherwise the etag, size and updated time."""
+    generation = getattr(fileobj, "generation", None)
+    if generation:
+        return str(generation)
+    return f"{fileobj.etag}-{fileobj.size}-{fileobj.updated.timestamp()}"
+
+
+def _key_of(fileobj: FileObj) -> str:
+    """Key of an item of a listing, the name of a `LocalFileObj` is only the file name."""
+    if isinstance(fileobj, LocalFileObj):
+        return fileobj.item.as_posix()
+    return fileobj.name
+
+
+class CachingObjectStore(ObjectStore):
+    """Read through local disk cache of the objects of another `ObjectStore`.
+
+    Parameters
+    ----------
+    objstore: ObjectStore
+        The store to cache.
+    cache_dir: str
+        Directory for the copies. It should only be used by this cache.
+    max_bytes: int
+        Total size of the copies to keep.
+    max_object_bytes: Optional[int]
+        Objects larger than this are not copied but streamed from `objstore`.
+        Defaults to an eighth of `max_bytes`.
+    """
+
+    def __init__(self,
+                 objstore: ObjectStore,
+                 cache_dir: str,
+                 max_bytes: int,
+                 max_object_bytes: Optional[int] = None):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.objstore = objstore
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_object_bytes = max_object_bytes if max_object_bytes is not None else max_bytes // 8
+        self._lock = threading.Lock()
+        self._copies: "OrderedDict[str, _Copy]" = OrderedDict()
+        self._fetching: Dict[str, threading.Event] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._load_existing()
+
+    def to_obj(self, key: str) -> FileObj:
+        return self._wrap(key, self.objstore.to_obj(key))
+
+    def to_objs(self, keys: Sequence[str]) -> List[FileObj]:
+        return [self._wrap(key, fileobj) for key, fileobj in zip(keys, self.objstore.to_objs(keys))]
+
+    def _wrap(self, key: str, fileobj: FileObj) -> FileObj:
+        # Not `exists()` since that is another RPC for a `Blob`
+        if isinstance(fileobj, FileDoesNotExist):
+            return fileobj
+        return CachedFileObj(self, key, fileobj)
+
+    def list(self, prefix: str) -> Iterator[FileObj]:
+        return (CachedFileObj(self, _key_of(item), item) for item in self.objstore.list(prefix))
+
+    def status(self) -> Tuple[Literal["GOOD", "BAD"], str]:
+        return self.objstore.status()
+
+    def open(self, key: str, fileobj: FileObj, mode: str) -> BinaryMinimalFile:
+        """Opens the local copy of `fileobj`, copying it on a miss."""
+        if 'r' not in mode or fileobj.size > self.max_object_bytes:
+            with self._lock:
+                self.bypasses += 1
+            return fileobj.open(mode)
+        path = self._path(key, _version(fileobj))
+        while True:
+            with self._lock:
+                if path.name in self._copies:
+                    try:
+                        fh = path.open(mode)
+                        self._copies.move_to_end(path.name)
+                        self.hits += 1
+                        return fh  # type: ignore
+                    except FileNotFoundError:
+                        self._forget(path.name)
+                fetching = self._fetching.get(path.name)
+                if fetching is None:
+                    self.misses += 1
+                    fetching = threading.Event()
+                    self._fetching[path.name] = fetching
+                    break
+            fetching.wait()
+
+        try:
+            size = self._fetch(fileobj, path)
+        except Exception:
+            with self._lock:
+                self._fetching.pop(path.name).set()
+            raise
+        with self._lock:
+            try:
+                self._add(key, path, size)
+                # Opened before releasing the lock so it cannot be evicted first
+                return path.open(mode)  # type: ignore
+            finally:
+                self._fetching.pop(path.name).set()
+
+    def _path(self, key: str, version: str) -> Path:
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        vdigest = hashlib.sha256(version.encode('utf-8')).hexdigest()[:16]
+        return self.cache_dir / f"{digest}.{vdigest}"
+
+    def _fetch(self, fileobj: FileObj, path: Path) -> int:
+        """Copies `fileobj` to `path`, replacing it atomically."""
+        tmp_name = None
+        try:
+            with tempfile.NamedTemporaryFile('wb', dir=self.cache_dir, prefix=".fetch-",
+                                             delete=False) as out:
+                tmp_name = out.name
+                with fileobj.open('rb') as src:
+                    shutil.copyfileobj(src, out, 1024 * 1024)  # type: ignore
+            os.replace(tmp_name, path)
+        except Exception:
+            if tmp_name:
+                Path(tmp_name).unlink(missing_ok=True)
+            raise
+        return path.stat().st_size
+
+    def _add(self, key: str, path: Path, size: int) -> None:
+        """Adds the copy at `path`, removing older versions of `key` and the
+        least recently used copies past `max_bytes`. Called with the lock held."""
+        prefix = path.name.split('.')[0] + '.'
+        for name in [name for name in self._copies if name.startswith(prefix) and name != path.name]:
+            self._remove(name)
+        old = self._copies.pop(path.name, None)
+        if old is not None:
+            self._bytes -= old.size
+        self._copies[path.name] = _Copy(path, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes and len(self._copies) > 1:
+            name = next(iter(self._copies))
+            self._remove(name)
+
+    def _remove(self, name: str) -> None:
+        copy = self._forget(name)
+        if copy is not None:
+            # A reader that has the copy open can keep reading it after the unlink
+            copy.path.unlink(missing_ok=True)
+
+    def _forget(self, name: str) -> Optional[_Copy]:
+        copy = self._copies.pop(name, None)
+        if copy is not None:
+            self._bytes -= copy.size
+        return copy
+
+    def _load_existing(self) -> None:
+        """Counts the copies left in `cache_dir`, oldest access first."""
+        found = []
+        for path in self.cache_dir.iterdir():
+            if path.name.startswith(".fetch-"):
+                path.unlink(missing_ok=True)
+            elif path.is_file():
+                stat = path.stat()
+                found.append((stat.st_atime, path, stat.st_size))
+        with self._lock:
+            for _, path, size in sorted(found):
+                self._copies[path.name] = _Copy(path, size)
+                self._bytes += size
+            while self._bytes > self.max_bytes and self._copies:
+                self._remove(next(iter(self._copies)))
+
+    def stats(self) -> Dict[str, int]:
+        """Counters and size of the cache."""
+        with self._lock:
+            return {"copies": len(self._copies),
+                    "bytes": self._bytes,
+                    "max_bytes": self.max_bytes,
+                    "hits": self.hits,
+                    "misses": self.misses,
+                    "bypasses": self.bypasses}
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __str__(self) -> str:
+        return f"<CachingObjectStore {self.objstore} at {self.cache_dir}>"
+
+
+class CachedFileObj(FileObj):
+    """`FileObj` of a `CachingObjectStore`.
+
+    Everything but `open()` is from the `FileObj` of the wrapped store."""
+
+    def __init__(self, store: CachingObjectStore, key: str, fileobj: FileObj):
+        self.store = store
+        self.key = key
+        self.fileobj = fileobj
+
+    @property
+    def name(self) -> str:
+        return self.fileobj.name
+
+    def exists(self) -> bool:
+        return self.fileobj.exists()
+
+    def open(self, mode: str) -> BinaryMinimalFile:
+        return self.store.open(self.key, self.fileobj, mode)
+
+    @property
+    def etag(self) -> str:
+        return self.fileobj.etag
+
+    @property
+    def size(self) -> int:
+        return self.fileobj.size
+
+    @property
+    def updated(self) -> datetime:
+        return self.fileobj.updated
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __str__(self) -> str:
+        return f"<CachedFileObj fileobj={self.fileobj}>"
@@ -1,8 +1,9 @@
 """ObjectStore that uses Google GS buckets"""
 
 
-from typing import Iterator, Literal, Tuple
+from typing import Iterator, List, Literal, Sequence, Tuple
 
+from google.api_core import exceptions
 from google.cloud.storage.blob import Blob
 from google.cloud.storage.bucket import Bucket
 
@@ -12,6 +13,12 @@ from .fileobj import FileDoesNotExist, FileObj
 # This causes the `Blob` class to be considered a subclass of `FileObj`
 FileObj.register(Blob)
 
+MAX_BATCH_SIZE = 100
+"""Max calls in a GCS JSON API batch request."""
+
+LIST_FIELDS = "items(name,size,updated,etag,generation),nextPageToken"
+"""Fields of a listing, these are what `FileObj` uses."""
+
 
 class GsObjectStore(ObjectStore):
     def __init__(self, bucket: Bucket):
@@ -29,14 +36,51 @@ class GsObjectStore(ObjectStore):
         else:
             return blob  # type: ignore
 
+    def to_objs(self, keys: Sequence[str]) -> List[FileObj]:
+        """Gets the `Blob` of each of `keys` with GCS JSON API batch requests.
+
+        This is one HTTP request for up to `MAX_BATCH_SIZE` keys. Returns
+        `FileDoesNotExist` for each key that has no object."""
+        if len(keys) <= 1:
+            return [self.to_obj(key) for key in keys]
+
+        objs: List[FileObj] = []
+        client = self.bucket.client
+        for start in range(0, len(keys), MAX_BATCH_SIZE):
+            batch_keys = keys[start:start + MAX_BATCH_SIZE]
+            blobs = [self.bucket.blob(key) for key in batch_keys]
+            try:
+                with client.batch():
+                    for blob in blobs:
+                        blob.reload()
+            except exceptions.GoogleAPICallError:
+                # Raised for the whole batch if any call failed, such as a 404,
+                # after the blobs of the calls that succeeded were set
+                pass
+            objs.extend(self._batched_obj(key, blob) for key, blob in zip(batch_keys, blobs))
+        return objs
+
+    def _batched_obj(self, key: str, blob: Blob) -> FileObj:
+        """The `Blob` if it was reloaded in the batch, otherwise `to_obj()` of `key`.
+
+        The batch does not say which of its calls failed and leaves a
+        placeholder in their `_properties`, so a key whose blob was not
+        reloaded is gotten on its own to get `FileDoesNotExist` for a 404 or
+        raise any other error."""
+        if isinstance(blob._properties, dict) and "generation" in blob._properties:
+            return blob  # type: ignore
+        return self.to_obj(key)
+
     def list(self, prefix: str) -> Iterator[FileObj]:
         """Gets listing of keys with prefix.
 
         `prefix` should be just a path to a file name. Example:
         'ps_cache/arxiv/pdf/1212/1212.12345' or
         'ftp/cs/papers/0012/0012007'.
+
+        Only the `LIST_FIELDS` of each object are gotten.
         """
-        return self.bucket.client.list_blobs(self.bucket, prefix=prefix)  # type: ignore
+        return self.bucket.client.list_blobs(self.bucket, prefix=prefix, fields=LIST_FIELDS)  # type: ignore
 
     def status(self) -> Tuple[Literal["GOOD", "BAD"], str]:
         """Gets if bucket can be read."""
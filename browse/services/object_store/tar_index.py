@@ -0,0 +1,310 @@
+"""Index of the members of a .tar.gz with gzip access points.
+
+Serving a single ancillary file from a source .tar.gz used to reopen the tar
+and scan it linearly for each `exists()`, `open()` and listing. For papers
+with GB of ancillary data that is a lot of decompression for each request.
+
+`TarIndex` is made with a single pass over the .tar.gz. It records each
+member's name, size and offset into the uncompressed tar. During the same
+pass it saves access points every `span` bytes of uncompressed data, similar
+to zlib's zran.c. Each access point is the offset into the compressed file
+and a copy of the zlib decompressor state at that point. A member can then be
+read by seeking the compressed file to the access point before the member and
+decompressing at most `span` bytes before the member's data.
+
+Python's zlib does not expose `inflatePrime()` so the decompressor state is
+kept with `Decompress.copy()` instead of saving the 32KB window as zran.c
+does. Due to this the index is only kept in memory, see `TarIndexCache`.
+"""
+import bisect
+import io
+import tarfile
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from .fileobj import BinaryMinimalFile, FileObj
+
+DEFAULT_SPAN = 8 * 1024 * 1024
+"""Bytes of uncompressed data between access points."""
+
+READ_SIZE = 64 * 1024
+"""Bytes of compressed data read at a time."""
+
+ACCESS_POINT_BYTES = 48 * 1024
+"""Approximate memory of a copy of a zlib decompressor."""
+
+MEMBER_BYTES = 200
+"""Approximate memory of a `TarMember`."""
+
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+@dataclass(frozen=True)
+class TarMember:
+    """A regular file in the tar."""
+    name: str
+    size: int
+    offset_data: int
+    """Offset of the file's data in the uncompressed tar."""
+
+
+@dataclass(frozen=True)
+class AccessPoint:
+    """Where decompression can be restarted."""
+    uncompressed: int
+    compressed: int
+    decompressor: 'zlib._Decompress'
+
+
+@dataclass
+class TarIndex:
+    """Members and gzip access points of a .tar.gz."""
+    members: Dict[str, TarMember]
+    points: List[AccessPoint]
+    span: int
+    _point_offsets: List[int] = field(default_factory=list, repr=False)
+
+    def __post_init__(self) -> None:
+        self._point_offsets = [point.uncompressed for point in self.points]
+
+    def point_before(self, offset: int) -> AccessPoint:
+        """Gets the last access point at or before `offset` of the uncompressed tar."""
+        return self.points[bisect.bisect_right(self._point_offsets, offset) - 1]
+
+    def approx_size(self) -> int:
+        return len(self.points) * ACCESS_POINT_BYTES + len(self.members) * MEMBER_BYTES
+
+    def open_member(self, raw: BinaryMinimalFile, name: str) -> 'TarMemberReader':
+        """Opens member `name` given `raw`, the opened seekable .tar.gz."""
+        return TarMemberReader(self, raw, self.members[name])
+
+
+class _Inflater():
+    """Reads uncompressed data from a gzip file and tracks offsets in both."""
+
+    def __init__(self, raw: BinaryMinimalFile, point: Optional[AccessPoint] = None):
+        self.raw = raw
+        if point is None:
+            self.decompressor = zlib.decompressobj(GZIP_WBITS)
+            self.compressed = 0
+            self.uncompressed = 0
+        else:
+            self.raw.seek(point.compressed)
+            self.decompressor = point.decompressor.copy()
+            self.compressed = point.compressed
+            self.uncompressed = point.uncompressed
+        self.eof = False
+
+    def inflate_chunk(self) -> bytes:
+        """Decompresses the next `READ_SIZE` of compressed data.
+
+        After this returns, `compressed`, `uncompressed` and `decompressor`
+        are consistent and can be saved as an `AccessPoint`."""
+        data = self.raw.read(READ_SIZE)
+        if not data:
+            self.eof = True
+            return b''
+        self.compressed += len(data)
+        out = self.decompressor.decompress(data)
+        while self.decompressor.eof and self.decompressor.unused_data:
+            # Concatenated gzip members
+            unused = self.decompressor.unused_data
+            self.decompressor = zlib.decompressobj(GZIP_WBITS)
+            out += self.decompressor.decompress(unused)
+        if self.decompressor.eof:
+            # Trailing bytes are not part of any member
+            self.compressed -= len(self.decompressor.unused_data)
+        self.uncompressed += len(out)
+        return out
+
+
+class _IndexingReader(io.RawIOBase):
+    """Forward only reader of the uncompressed tar that saves access points."""
+
+    def __init__(self, raw: BinaryMinimalFile, span: int):
+        self.inflater = _Inflater(raw)
+        self.span = span
+        self.points = [AccessPoint(0, 0, self.inflater.decompressor.copy())]
+        self.buffer = bytearray()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buf) -> int:  # type: ignore
+        while not self.buffer and not self.inflater.eof:
+            self.buffer += self.inflater.inflate_chunk()
+            if self.inflater.uncompressed - self.points[-1].uncompressed >= self.span \
+               and not self.inflater.decompressor.eof:
+                self.points.append(AccessPoint(self.inflater.uncompressed,
+                                               self.inflater.compressed,
+                                               self.inflater.decompressor.copy()))
+        size = min(len(buf), len(self.buffer))
+        buf[:size] = self.buffer[:size]
+        del self.buffer[:size]
+        return size
+
+
+def build_tar_index(raw: BinaryMinimalFile, span: int = DEFAULT_SPAN) -> TarIndex:
+    """Makes a `TarIndex` with a single pass over `raw`, an opened .tar.gz.
+
+    Raises `tarfile.ReadError` or `zlib.error` if `raw` is not a .tar.gz."""
+    reader = _IndexingReader(raw, span)
+    members: Dict[str, TarMember] = {}
+    with tarfile.open(fileobj=io.BufferedReader(reader, READ_SIZE), mode='r|') as tar:
+        for info in tar:
+            if info.isfile():
+                members[info.name] = TarMember(info.name, info.size, info.offset_data)
+    return TarIndex(members, reader.points, span)
+
+
+class TarMemberReader(io.RawIOBase):
+    """Seekable reader of a single member using the access points of a `TarIndex`.
+
+    Reading from the start or seeking to any offset decompresses at most
+    `span` bytes before the data that is returned."""
+
+    def __init__(self, index: TarIndex, raw: BinaryMinimalFile, member: TarMember):
+        self.index = index
+        self.raw = raw
+        self.member = member
+        self.pos = 0
+        self.inflater: Optional[_Inflater] = None
+        self.pending = bytearray()
+        """Uncompressed data already inflated, starts at `pending_offset` of the tar."""
+        self.pending_offset = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.pos
+
+    def seek(self, pos: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            new_pos = pos
+        elif whence == io.SEEK_CUR:
+            new_pos = self.pos + pos
+        elif whence == io.SEEK_END:
+            new_pos = self.member.size + pos
+        else:
+            raise ValueError(f"Invalid whence {whence}")
+        if new_pos < 0:
+            raise ValueError("Negative seek position")
+        self.pos = new_pos
+        return self.pos
+
+    def _position(self, target: int) -> None:
+        """Gets the inflater so `pending` starts at `target` of the tar."""
+        point = self.index.point_before(target)
+        if self.inflater is None or target < self.pending_offset \
+           or point.uncompressed > self.pending_offset + len(self.pending):
+            self.inflater = _Inflater(self.raw, point)
+            self.pending = bytearray()
+            self.pending_offset = point.uncompressed
+        while True:
+            end = self.pending_offset + len(self.pending)
+            if target <= end:
+                del self.pending[:target - self.pending_offset]
+                self.pending_offset = target
+                return
+            self.pending = bytearray()
+            self.pending_offset = end
+            if self.inflater.eof:
+                return
+            self.pending += self.inflater.inflate_chunk()
+
+    def readinto(self, buf) -> int:  # type: ignore
+        remaining = self.member.size - self.pos
+        if remaining <= 0:
+            return 0
+        want = min(len(buf), remaining)
+        self._position(self.member.offset_data + self.pos)
+        assert self.inflater is not None
+        while len(self.pending) < want and not self.inflater.eof:
+            self.pending += self.inflater.inflate_chunk()
+        size = min(want, len(self.pending))
+        buf[:size] = self.pending[:size]
+        del self.pending[:size]
+        self.pending_offset += size
+        self.pos += size
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self.raw.close()
+            self.pending = bytearray()
+        super().close()
+
+
+class TarIndexCache():
+    """Thread safe LRU cache of `TarIndex` with a memory budget."""
+
+    def __init__(self, max_bytes: int, span: int = DEFAULT_SPAN):
+        self.max_bytes = max_bytes
+        self.span = span
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, TarIndex]" = OrderedDict()
+        self._bytes = 0
+
+    @staticmethod
+    def key_for(tar_file: FileObj) -> Tuple[str, str, int]:
+        """Cache key of `tar_file`.
+
+        The size is included since local files do not have a real etag."""
+        return (tar_file.name, tar_file.etag, tar_file.size)
+
+    def get(self, tar_file: FileObj) -> TarIndex:
+        """Gets the `TarIndex` of `tar_file`, making it on a miss."""
+        key = self.key_for(tar_file)
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None:
+                self._entries.move_to_end(key)
+                return index
+
+        with tar_file.open('rb') as raw:
+            index = build_tar_index(raw, self.span)
+
+        size = index.approx_size()
+        with self._lock:
+            if key not in self._entries and size <= self.max_bytes:
+                self._entries[key] = index
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    _, old = self._entries.popitem(last=False)
+                    self._bytes -= old.approx_size()
+        return index
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_tar_index_cache = TarIndexCache(256 * 1024 * 1024)
+"""Process wide cache, this works because it is thread safe and not bound to the app context."""
+
+
+def get_tar_index(tar_file: FileObj) -> TarIndex:
+    """Gets the `TarIndex` of `tar_file` from the process wide cache."""
+    return _tar_index_cache.get(tar_file)
+
+
+def find_tar_index(tar_file: FileObj) -> Optional[TarIndex]:
+    """Gets the `TarIndex` of `tar_file`, or `None` if it is not gzipped.
+
+    Some sources named .tar.gz are uncompressed tars. Those should be read by
+    scanning with `tarfile.open(mode='r')`, which detects the compression."""
+    try:
+        return get_tar_index(tar_file)
+    except (tarfile.ReadError, tarfile.CompressionError, zlib.error, EOFError):
+        return None
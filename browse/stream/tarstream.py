@@ -1,13 +1,20 @@
 """Streamng tar files."""
 
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from io import BytesIO
+from itertools import chain
 import tarfile
-from typing import Callable, Iterator, List
+from typing import Callable, Deque, Iterator, List, Optional, Tuple
 
 from browse.services.object_store import FileObj
+from browse.services.object_store.fileobj import BinaryMinimalFile
 
 BUFFER_SIZE = 16 * 1024  # bytes, similar to tarfile.copyfileobj()
 
+MAX_PREFETCH_BYTES = 32 * 1024 * 1024
+"""Max bytes read ahead for all prefetched files together."""
+
 
 class _FileStream():
     def __init__(self) -> None:
@@ -38,13 +45,32 @@ def _to_tarinfo(fileobj: FileObj) -> tarfile.TarInfo:
     return tarinfo
 
 
+def _open_and_read(fileobj: FileObj, head_size: int) -> Tuple[BinaryMinimalFile, bytes]:
+    """Opens `fileobj` and reads up to `head_size` bytes from it."""
+    fp = fileobj.open('rb')
+    try:
+        return fp, fp.read(head_size) if head_size > 0 else b''
+    except Exception:
+        fp.close()
+        raise
+
+
 def tar_stream_gen(files: List[FileObj],
-                   to_tarinfo: Callable[[FileObj], tarfile.TarInfo] = _to_tarinfo)\
+                   to_tarinfo: Callable[[FileObj], tarfile.TarInfo] = _to_tarinfo,
+                   prefetch: int = 0,
+                   buffer_size: int = BUFFER_SIZE,
+                   max_prefetch_bytes: int = MAX_PREFETCH_BYTES)\
         -> Iterator[bytes]:
     """Returns an `iterator[bytes]` over the bytes of a .tar made up of the
     items in `file_list`.
 
-    This will be gzipped."""
+    This will be gzipped.
+
+    If `prefetch` is more than zero, the next `prefetch` files are opened and
+    the start of each is read in a thread pool while the current file is
+    being gzipped. This avoids waiting for the first byte of each file from
+    GS. At most `max_prefetch_bytes` are read ahead in total, split evenly
+    across the prefetched files. `buffer_size` is the size of each read."""
     buffer = _FileStream()
     tar = tarfile.TarFile.open('no_file_name',
                                mode='w|gz',
@@ -52,28 +78,48 @@ def tar_stream_gen(files: List[FileObj],
     if tar.fileobj is None:
         raise Exception("Tar has None for fileobj")
 
-    for fileobj in files:
-        tarinfo = to_tarinfo(fileobj)
-        tar.addfile(tarinfo)
-        yield buffer.pop()
-
-        with fileobj.open('rb') as fp:
-            while True:
-                blk = fp.read(BUFFER_SIZE)
-                if len(blk) > 0:
+    pool: Optional[ThreadPoolExecutor] = None
+    head_size = 0
+    if prefetch > 0:
+        pool = ThreadPoolExecutor(max_workers=prefetch, thread_name_prefix="tar_prefetch")
+        head_size = max(buffer_size, max_prefetch_bytes // prefetch)
+    pending: Deque["Future[Tuple[BinaryMinimalFile, bytes]]"] = deque()
+    next_to_prefetch = 0
+
+    try:
+        for fileobj in files:
+            if pool is not None:
+                while len(pending) < prefetch and next_to_prefetch < len(files):
+                    pending.append(pool.submit(_open_and_read, files[next_to_prefetch], head_size))
+                    next_to_prefetch += 1
+                fp, head = pending.popleft().result()
+            else:
+                fp, head = fileobj.open('rb'), b''
+
+            with fp:
+                tarinfo = to_tarinfo(fileobj)
+                tar.addfile(tarinfo)
+                yield buffer.pop()
+
+                blocks = chain([head] if head else [], iter(lambda: fp.read(buffer_size), b''))
+                for blk in blocks:
                     tar.fileobj.write(blk)
                     yield buffer.pop()
-                if len(blk) < BUFFER_SIZE:
-                    # taken from tarfile.TarFile.addfile()
-                    blocks, remainder = divmod(tarinfo.size, tarfile.BLOCKSIZE)
-                    if remainder > 0:
-                        tar.fileobj.write(
-                            tarfile.NUL * (tarfile.BLOCKSIZE - remainder))
-                        yield buffer.pop()
-                        blocks += 1
-
-                    tar.offset += blocks * tarfile.BLOCKSIZE
-                    break
-
-    tar.close()
-    yield buffer.pop()
+
+            # taken from tarfile.TarFile.addfile()
+            n_blocks, remainder = divmod(tarinfo.size, tarfile.BLOCKSIZE)
+            if remainder > 0:
+                tar.fileobj.write(
+                    tarfile.NUL * (tarfile.BLOCKSIZE - remainder))
+                yield buffer.pop()
+                n_blocks += 1
+            tar.offset += n_blocks * tarfile.BLOCKSIZE
+
+        tar.close()
+        yield buffer.pop()
+    finally:
+        if pool is not None:
+            for future in pending:
+                if not future.cancel() and future.exception() is None:
+                    future.result()[0].close()
+            pool.shutdown(wait=False)
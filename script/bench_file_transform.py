@@ -0,0 +1,172 @@
+"""
+Time reading a large HTML file through `BinaryMinimalFileTransformed`.
+
+HTML source papers are served through `FileTransform` with
+`post_process_html`. `BinaryMinimalFileTransformed` used to grow its buffer
+with `bytes` concatenation for each line in `read()` and split and re-join the
+whole buffer for each `readline()`, both quadratic in the size of the file. It
+now keeps the transformed data in a `bytearray` with a read offset.
+
+This makes an HTML file of up to `--mb` MB and reports the seconds to read all
+of it in 8KB chunks, as werkzeug's `FileWrapper` does, with one `read()` and
+line by line with `readline()`, for the implementation before this change and
+the current one, at a few sizes to show how they scale. The old implementation
+is skipped at larger sizes once a read takes over `--max-seconds`.
+
+`--identity` uses a transform that returns the line unchanged to time only the
+buffering, it does not need the dependencies of `post_process_html`.
+
+Usage:
+    PYTHONPATH=. python script/bench_file_transform.py [--mb 8] [--repeat 3] [--max-seconds 10] [--identity]
+"""
+import argparse
+import io
+import random
+import typing
+from time import perf_counter
+from typing import Callable, Dict, List, Optional
+
+from browse.services.object_store.fileobj import (DEFAULT_IO_SIZE, BinaryMinimalFile,
+                                                  BinaryMinimalFileTransformed)
+
+Transform = Callable[[bytes], bytes]
+
+
+class OldTransformed():
+    """`BinaryMinimalFileTransformed` as it was before the `bytearray` buffer."""
+
+    def __init__(self, inner_io: BinaryMinimalFile, transform: Transform):
+        self.transform = transform
+        self.io = inner_io
+        self.buffer = b""
+
+    def readline(self, size: Optional[int] = -1) -> bytes:
+        if size is None or size <= 0:
+            size = DEFAULT_IO_SIZE
+        if not self.buffer:
+            data = self.read(size)
+            self.buffer = data + self.buffer
+
+        lines = self.buffer.split(b"\n")
+        line = lines[0]
+        self.buffer = b"\n".join(lines[1:])
+        return line
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        if size is None or size <= 0:
+            size = DEFAULT_IO_SIZE
+
+        while True:
+            data = self.io.readline(size)
+            self.buffer = self.buffer + self.transform(data)
+            if not data or len(self.buffer) >= size:
+                break
+
+        if len(self.buffer) <= size:
+            to_return = self.buffer
+            self.buffer = b""
+            return to_return
+        else:
+            to_return = self.buffer[:size]
+            self.buffer = self.buffer[size:]
+            return to_return
+
+
+def make_html(size: int, seed: int = 1) -> bytes:
+    """HTML of about `size` bytes with lines like those of a conference proceeding."""
+    rnd = random.Random(seed)
+    words = ["quantum", "lattice", "gauge", "theory", "neural", "network", "graph",
+             "manifold", "entropy", "boundary", "operator", "spectral", "the", "of", "a"]
+    out = io.BytesIO()
+    out.write(b"<html><head><title>Proceedings</title></head><body>\n")
+    while out.tell() < size:
+        kind = rnd.random()
+        if kind < .05:
+            out.write(f"REPORT-NO:CONF-{rnd.randint(1, 9999)}\n".encode())
+        elif kind < .2:
+            out.write(f"<h2>Session {rnd.randint(1, 99)}</h2>\n".encode())
+        else:
+            text = " ".join(rnd.choice(words) for _ in range(rnd.randint(4, 30)))
+            out.write(f"<p>{text}</p>\n".encode())
+    out.write(b"</body></html>\n")
+    return out.getvalue()
+
+
+def read_chunks(fh: typing.Any, lines: int) -> int:
+    total = 0
+    while True:
+        data = fh.read(8192)
+        if not data:
+            return total
+        total += len(data)
+
+
+def read_all(fh: typing.Any, lines: int) -> int:
+    return len(fh.read())
+
+
+def read_lines(fh: typing.Any, lines: int) -> int:
+    # The old readline() returns b"" at EOF and for blank lines so read `lines` lines
+    total = 0
+    for _ in range(lines):
+        total += len(fh.readline())
+    return total
+
+
+MODES: Dict[str, Callable[[typing.Any, int], int]] = {
+    "8KB chunks": read_chunks,
+    "read()": read_all,
+    "readline()": read_lines,
+}
+
+
+def best_seconds(repeat: int, data: bytes, transform: Transform,
+                 stream: Callable[[BinaryMinimalFile, Transform], typing.Any],
+                 mode: Callable[[typing.Any, int], int]) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        fh = stream(io.BytesIO(data), transform)
+        start = perf_counter()
+        mode(fh, data.count(b"\n"))
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-seconds", type=float, default=10)
+    parser.add_argument("--identity", action="store_true")
+    args = parser.parse_args()
+
+    transform: Transform
+    if args.identity:
+        def transform(line: bytes) -> bytes:
+            return line
+    else:
+        from browse.services.html_processing import post_process_html
+        transform = post_process_html
+
+    full = make_html(int(args.mb * 1024 * 1024))
+    sizes: List[int] = [len(full) // 2 ** n for n in range(4, -1, -1)]
+    slow = set()
+    print(f"best of {args.repeat}, seconds to read all of the file")
+    print(f"{'MB':>6} {'mode':>12} {'old':>10} {'new':>10}")
+    for size in sizes:
+        data = full[:full.rfind(b"\n", 0, size) + 1]
+        for name, mode in MODES.items():
+            new = best_seconds(args.repeat, data, transform, BinaryMinimalFileTransformed, mode)
+            if name in slow:
+                old_col = f"{'skipped':>10}"
+            else:
+                old = best_seconds(args.repeat, data, transform, OldTransformed, mode)
+                old_col = f"{old:10.3f}"
+                if old > args.max_seconds:
+                    slow.add(name)
+            print(f"{len(data) / 1024 / 1024:6.2f} {name:>12} {old_col} {new:10.3f}")
+
+
+if __name__ == "__main__":
+    main()
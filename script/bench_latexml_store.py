@@ -0,0 +1,92 @@
+"""
+Time getting LaTeXML HTML with and without reusing the LaTeXML object store.
+
+Before, `ArticleStore._html` made a `storage.Client()` and a `GsObjectStore`
+for every request. Now the store is made once and reused.
+
+This uses a local directory as a stand-in for the LaTeXML bucket so only the
+cost of making the client and store is compared, not GS latency.
+
+Usage:
+    PYTHONPATH=. python script/bench_latexml_store.py [--requests 50] [--client default|anonymous]
+
+`--client default` does the same credential discovery as production and
+needs GCP credentials, `anonymous` does not but is much faster to create.
+"""
+import argparse
+import statistics
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, List
+
+from google.cloud import storage
+
+from browse.services.object_store import ObjectStore
+from browse.services.object_store.object_store_gs import GsObjectStore
+from browse.services.object_store.object_store_local import LocalObjectStore
+
+KEY = "2101.00001v1/2101.00001v1.html"
+
+
+def make_stand_in_bucket(root: Path) -> None:
+    html = root / KEY
+    html.parent.mkdir(parents=True)
+    html.write_text("<html><body>LaTeXML stand-in</body></html>")
+
+
+def make_client(kind: str) -> storage.Client:
+    if kind == "anonymous":
+        return storage.Client.create_anonymous_client()
+    return storage.Client()
+
+
+def time_requests(n: int, get_store: Callable[[], ObjectStore]) -> List[float]:
+    times = []
+    for _ in range(n):
+        start = perf_counter()
+        store = get_store()
+        fileobj = store.to_obj(KEY)
+        assert fileobj.exists()
+        times.append(perf_counter() - start)
+    return times
+
+
+def report(name: str, times: List[float]) -> None:
+    times = sorted(times)
+    p95 = times[min(len(times) - 1, int(len(times) * .95))]
+    print(f"{name:>12}: mean {statistics.mean(times) * 1000:9.3f} ms "
+          f"p50 {statistics.median(times) * 1000:9.3f} ms "
+          f"p95 {p95 * 1000:9.3f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--client", choices=["default", "anonymous"], default="default")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        make_stand_in_bucket(Path(tmp_dir))
+        local = LocalObjectStore(tmp_dir)
+
+        def per_request() -> ObjectStore:
+            # What _html used to do, the GsObjectStore is made but the
+            # lookup goes to the local stand-in.
+            GsObjectStore(make_client(args.client).bucket("latexml-stand-in"))
+            return local
+
+        reused: List[ObjectStore] = []
+
+        def once() -> ObjectStore:
+            if not reused:
+                reused.append(per_request())
+            return reused[0]
+
+        report("per request", time_requests(args.requests, per_request))
+        report("reused", time_requests(args.requests, once))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Time filtering the items of a large monthly listing by archive or category.
+
+`get_updates_from_list_file` used to filter each item with
+`re.match(f'^{listingFilter}', primary)` and
+`re.search(listingFilter, secondaries)`, building the pattern string for every
+item. It now uses `listed_as` which checks membership in a set of categories
+made once for each filter by `categories_in`.
+
+This makes a month of `--items` items with categories drawn from
+`taxonomy.CATEGORIES` and reports the cost per item of the regex filter and of
+`listed_as` for a few archives and categories.
+
+Usage:
+    PYTHONPATH=. python script/bench_listing_filter.py [--items 30000] [--repeat 5]
+"""
+import argparse
+import random
+import re
+from time import perf_counter
+from typing import Callable, List, Optional, Tuple
+
+from arxiv import taxonomy
+
+from browse.services.listing.parse_listing_file import categories_in, listed_as
+
+FILTERS = ['math', 'math.AG', 'cs', 'cs.LG', 'astro-ph', 'hep-th']
+
+Item = Tuple[str, str, str]
+"""Primary, categories and 'new' or 'cross'."""
+
+
+def regex_listed_as(primary: str, categories: str, neworcross: str,
+                    listingFilter: str) -> Optional[str]:
+    """The filter as it was before `listed_as`."""
+    if not listingFilter or (re.match(f'^{listingFilter}', primary)
+                             and neworcross == 'new'):
+        return neworcross
+    elif listingFilter:
+        secondaries = ' '.join(categories.split()[1:])
+        if re.search(listingFilter, secondaries):
+            return 'cross'
+    return None
+
+
+def make_month(n: int, seed: int = 1) -> List[Item]:
+    rnd = random.Random(seed)
+    active = [cat for cat, info in taxonomy.CATEGORIES.items() if info.get('is_active', True)]
+    items = []
+    for _ in range(n):
+        cats = rnd.sample(active, rnd.randint(1, 4))
+        items.append((cats[0], ' '.join(cats), 'new' if rnd.random() < .8 else 'cross'))
+    return items
+
+
+def per_item_ns(repeat: int, items: List[Item],
+                filter_fn: Callable[[str, str, str, str], Optional[str]],
+                listing_filter: str) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = perf_counter()
+        for primary, categories, neworcross in items:
+            filter_fn(primary, categories, neworcross, listing_filter)
+        best = min(best, perf_counter() - start)
+    return best / len(items) * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=30000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    items = make_month(args.items)
+    print(f"{len(items)} items, best of {args.repeat}, ns per item")
+    print(f"{'filter':>10} {'regex':>10} {'set':>10} {'listed':>8}")
+    for listing_filter in FILTERS:
+        categories_in(listing_filter)  # Made once per filter, not part of the per item cost
+        listed = sum(1 for primary, categories, neworcross in items
+                     if listed_as(primary, categories, neworcross, listing_filter))
+        print(f"{listing_filter:>10} "
+              f"{per_item_ns(args.repeat, items, regex_listed_as, listing_filter):10.0f} "
+              f"{per_item_ns(args.repeat, items, listed_as, listing_filter):10.0f} "
+              f"{listed:8d}")
+
+
+if __name__ == "__main__":
+    main()
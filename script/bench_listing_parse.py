@@ -0,0 +1,114 @@
+"""
+Time parsing the listing files in the test fixtures.
+
+The listing parsers used to consume lines with `lines.pop(0)` which is
+quadratic in the number of lines. They now use
+`browse.services.listing.line_scanner.LineScanner`.
+
+This times:
+
+- reading just the lines of each fixture listing with `split` and `pop(0)`
+  and with `LineScanner`
+- the full parse of each fixture monthly, new and pastweek listing
+- the full parse of a large monthly listing made by repeating the items of the
+  largest fixture, to show how the parse scales with the size of the file
+
+Usage:
+    PYTHONPATH=. python script/bench_listing_parse.py [--repeat 5] [--scale 1 4 8]
+"""
+import argparse
+import codecs
+import re
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from typing import Callable
+
+from browse.services.listing.line_scanner import LineScanner
+from browse.services.listing.parse_listing_file import get_updates_from_list_file
+from browse.services.listing.parse_listing_pastweek import parse_listing_pastweek
+from browse.services.listing.parse_new_listing_file import parse_new_listing_file
+from browse.services.object_store.object_store_local import LocalFileObj
+
+LISTINGS = "tests/data/abs_files/ftp/*/listings/*"
+
+
+def pop_lines(text: str) -> int:
+    lines = text.split("\n")
+    count = 0
+    while len(lines):
+        lines.pop(0)
+        count += 1
+    return count
+
+
+def scan_lines(text: str) -> int:
+    lines = LineScanner(text)
+    count = 0
+    while lines:
+        lines.pop()
+        count += 1
+    return count
+
+
+def parser_for(path: Path) -> Callable[[Path], object]:
+    name = path.name
+    if re.match(r'^\d{4}$', name):
+        return lambda p: get_updates_from_list_file(int(name[:2]), int(name[2:]),
+                                                    LocalFileObj(p), 'month')
+    if name.startswith('new'):
+        return lambda p: parse_new_listing_file(LocalFileObj(p))
+    return lambda p: parse_listing_pastweek(LocalFileObj(p))
+
+
+def best_of(repeat: int, func: Callable[[], object]) -> float:
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        times.append(perf_counter() - start)
+    return min(times)
+
+
+def report(name: str, seconds: float, extra: str = '') -> None:
+    print(f"{name:>32}: {seconds * 1000:10.3f} ms {extra}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+
+    files = sorted(path for path in Path('.').glob(LISTINGS) if path.is_file())
+    if not files:
+        raise SystemExit(f"No listings found at {LISTINGS}, run from the root of the repo")
+    texts = [codecs.decode(path.read_bytes(), encoding='utf-8', errors='ignore')
+             for path in files]
+
+    print(f"{len(files)} fixture listings, {sum(len(text) for text in texts)} chars")
+    report("lines with pop(0)", best_of(args.repeat, lambda: [pop_lines(t) for t in texts]))
+    report("lines with LineScanner", best_of(args.repeat, lambda: [scan_lines(t) for t in texts]))
+
+    parses = [(path, parser_for(path)) for path in files]
+    report("parse all fixtures", best_of(args.repeat, lambda: [parse(path) for path, parse in parses]))
+
+    largest = max((path for path in files if re.match(r'^\d{4}$', path.name)),
+                  key=lambda path: path.stat().st_size)
+    body = largest.read_bytes()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for scale in args.scale:
+            path = Path(tmp_dir) / largest.name
+            path.write_bytes(body * scale)
+            text = codecs.decode(path.read_bytes(), encoding='utf-8', errors='ignore')
+            lines = text.count("\n") + 1
+            parse = parser_for(path)
+            report(f"{largest.name} x{scale} pop(0) lines", best_of(args.repeat, lambda: pop_lines(text)),
+                   f"({lines} lines)")
+            report(f"{largest.name} x{scale} scanner lines", best_of(args.repeat, lambda: scan_lines(text)))
+            report(f"{largest.name} x{scale} parse", best_of(args.repeat, lambda: parse(path)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Updates the dissemination index from the todos of a publish log.
+
+The index is a SQLite file with one row per idv, it is read by browse's
+`browse.services.dissemination.dissem_index.DisseminationIndex`. It is
+updated incrementally for each publish log:
+
+- new, rep and wdr add or update the row of the version being announced
+- files moved to /orig by a rep or wdr update the source key of the old version
+
+Only facts from the publish log and the local files it names are used.
+"""
+import os
+import re
+import sqlite3
+from typing import Callable, Container, Dict, Iterable, List, Optional, Tuple
+
+INDEX_VERSION = 1
+"""Set as `PRAGMA user_version`, browse checks this before using the index."""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dissem (
+    idv TEXT PRIMARY KEY,
+    src_key TEXT,
+    src_size INTEGER,
+    src_format TEXT,
+    anc INTEGER,
+    pdf INTEGER,
+    ps INTEGER,
+    html INTEGER
+) WITHOUT ROWID
+"""
+
+SRC_FORMATS = [('.html.gz', 'html'),
+               ('.ps.gz', 'ps'),
+               ('.dvi.gz', 'dvi'),
+               ('.tar.gz', 'tex'),
+               ('.pdf', 'pdf'),
+               ('.gz', 'tex')]
+"""Source file extension to format, first match wins."""
+
+_date_r = re.compile(r'^Date\s*(?::|\(revised\s*(?P<version>.*?)\):)\s*(?P<date>.*?)'
+                     r'(?:\s+\((?P<size_kilobytes>\d+)kb,?(?P<source_type>.*)\))?$')
+
+_papers_r = re.compile(r'/(?P<archive>[^/]+)/papers/\d{4}/(?P<name>[^/]+?)v(?P<version>\d+)\.(?P<ext>.+)$')
+
+Record = Dict[str, Optional[object]]
+
+
+def src_format(path: str) -> Optional[str]:
+    for ext, fmt in SRC_FORMATS:
+        if path.endswith(ext):
+            return fmt
+    return None
+
+
+def _is_src(path: str) -> bool:
+    return not path.endswith('.abs') and src_format(path) is not None
+
+
+def _size(path: str) -> Optional[int]:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+def abs_version_and_anc(abs_path: str) -> Tuple[Optional[int], Optional[bool]]:
+    """Gets the current version and if it has ancillary files from an abs file.
+
+    The version is the number of `Date` lines and the ancillary flag is an `A`
+    in the source type of the last one."""
+    try:
+        with open(abs_path, encoding='utf-8', errors='replace') as fh:
+            dates = [m for m in (_date_r.match(line.strip()) for line in fh) if m]
+    except OSError:
+        return None, None
+    if not dates:
+        return None, None
+    source_type = dates[-1].group('source_type') or ''
+    return len(dates), 'A' in source_type.upper()
+
+
+def _orig_idv(path: str) -> Optional[str]:
+    """The idv for a file moved to /orig, ex. `hep-th/0101001v1`."""
+    m = _papers_r.search(path)
+    if not m:
+        return None
+    if m.group('archive') == 'arxiv':
+        return f"{m.group('name')}v{m.group('version')}"
+    return f"{m.group('archive')}/{m.group('name')}v{m.group('version')}"
+
+
+def records_for_todo(todo: dict,
+                     to_key: Callable[[str], str],
+                     ftp_prefix: str,
+                     orig_prefix: str) -> Tuple[List[Record], List[Record]]:
+    """Makes the index records for a todo from `make_todos`.
+
+    Returns a tuple of full records for the announced version and partial
+    records, with just the source, for older versions moved to /orig."""
+    if todo['type'] not in ('new', 'rep', 'wdr'):
+        return [], []
+
+    uploads = [path for act, path in todo['actions'] if act == 'upload']
+    builds = [act for act, _ in todo['actions']]
+
+    moved: List[Record] = []
+    for path in uploads:
+        if path.startswith(orig_prefix) and _is_src(path):
+            idv = _orig_idv(path)
+            if idv:
+                moved.append({'idv': idv, 'src_key': to_key(path), 'src_size': _size(path),
+                              'src_format': src_format(path)})
+
+    abs_path = next((path for path in uploads
+                     if path.startswith(ftp_prefix) and path.endswith('.abs')), None)
+    if abs_path is None:
+        return [], moved
+    version, anc = abs_version_and_anc(abs_path)
+    if version is None:
+        return [], moved
+
+    src = next((path for path in uploads if path.startswith(ftp_prefix) and _is_src(path)), None)
+    fmt = src_format(src) if src else None
+    current: Record = {
+        'idv': f"{todo['paper_id']}v{version}",
+        'src_key': to_key(src) if src else None,
+        'src_size': _size(src) if src else None,
+        'src_format': fmt,
+        'anc': anc,
+        'pdf': True if 'build_pdf+upload' in builds or fmt == 'pdf' else None,
+        'ps': None,
+        'html': True if 'build_html+upload' in builds else None,
+    }
+    return [current], moved
+
+
+def open_index(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.execute(SCHEMA)
+    conn.execute(f"PRAGMA user_version={INDEX_VERSION}")
+    return conn
+
+
+def update_index(path: str,
+                 todos: Iterable[dict],
+                 to_key: Callable[[str], str],
+                 ftp_prefix: str,
+                 orig_prefix: str,
+                 failed: Container[str] = ()) -> int:
+    """Adds or updates the records for `todos` in the index at `path`.
+
+    Todos of the paper_ids in `failed` are skipped since some of their
+    objects may not be in GCS and browse trusts the index over a listing.
+
+    Returns the number of records written."""
+    current: List[Record] = []
+    moved: List[Record] = []
+    for todo in todos:
+        if todo['paper_id'] in failed:
+            continue
+        cur, mov = records_for_todo(todo, to_key, ftp_prefix, orig_prefix)
+        current.extend(cur)
+        moved.extend(mov)
+
+    conn = open_index(path)
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT INTO dissem (idv, src_key, src_size, src_format, anc, pdf, ps, html)"
+                " VALUES (:idv, :src_key, :src_size, :src_format, :anc, :pdf, :ps, :html)"
+                " ON CONFLICT(idv) DO UPDATE SET src_key=excluded.src_key,"
+                " src_size=excluded.src_size, src_format=excluded.src_format, anc=excluded.anc,"
+                " pdf=excluded.pdf, ps=excluded.ps, html=excluded.html",
+                current)
+            conn.executemany(
+                "INSERT INTO dissem (idv, src_key, src_size, src_format)"
+                " VALUES (:idv, :src_key, :src_size, :src_format)"
+                " ON CONFLICT(idv) DO UPDATE SET src_key=excluded.src_key,"
+                " src_size=excluded.src_size, src_format=excluded.src_format",
+                moved)
+    finally:
+        conn.close()
+    return len(current) + len(moved)
@@ -48,6 +48,7 @@ from google.cloud.storage.retry import DEFAULT_RETRY as STORAGE_RETRY
 from identifier import Identifier
 
 from digester import get_file_mtime
+from dissem_index import update_index
 
 overall_start = perf_counter()
 
@@ -627,6 +628,14 @@ def main(args):
 
     # Summary report
     log_summary(perf_counter() - overall_start, overall_size)
+
+    if getattr(args, 'dissem_index', None):
+        failed = {row[0] for row in summary_q.queue if row[2] == "failed"}
+        n_records = update_index(args.dissem_index, todos, path_to_bucket_key, FTP_PREFIX, ORIG_PREFIX,
+                                 failed=failed)
+        logger.info("Updated dissemination index %s with %d records, skipped %d failed papers",
+                    args.dissem_index, n_records, len(failed),
+                    extra={CATEGORY: "status", "n_records": n_records, "n_failed": len(failed)})
     pass
 
 
@@ -651,6 +660,7 @@ if __name__ == "__main__":
     ad.add_argument('--globals', help="Global variables")
     ad.add_argument('--generate', default=True, type=str, action=store_boolean,
                     help="Generate files (default). Use =false to disable PDF/HTML gen")
+    ad.add_argument('--dissem-index', help="SQLite dissemination index to update after the sync")
     ad.add_argument('filename')
     args = ad.parse_args()
     main(args)
@@ -0,0 +1,69 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from dissem_index import INDEX_VERSION, update_index
+
+ABS = """------------------------------------------------------------------------------
+\\\\
+arXiv:2308.16188
+From: Some One <someone@example.com>
+Date: Thu, 31 Aug 2023 10:00:00 GMT   (120kb)
+Date (revised v2): Fri, 1 Sep 2023 10:00:00 GMT   (130kb,A)
+
+Title: A paper
+"""
+
+
+class DissemIndexTestCase(unittest.TestCase):
+
+    def test_update_index(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            ftp = os.path.join(tmp, 'ftp') + '/'
+            orig = os.path.join(tmp, 'orig') + '/'
+            os.makedirs(ftp + 'arxiv/papers/2308')
+            os.makedirs(orig + 'arxiv/papers/2308')
+            abs_path = ftp + 'arxiv/papers/2308/2308.16188.abs'
+            src_path = ftp + 'arxiv/papers/2308/2308.16188.tar.gz'
+            old_src_path = orig + 'arxiv/papers/2308/2308.16188v1.tar.gz'
+            with open(abs_path, 'w') as fh:
+                fh.write(ABS)
+            with open(src_path, 'wb') as fh:
+                fh.write(b'x' * 10)
+            with open(old_src_path, 'wb') as fh:
+                fh.write(b'x' * 7)
+
+            todos = [{'submission_id': '1', 'paper_id': '2308.16188', 'type': 'rep',
+                      'actions': [('upload', old_src_path),
+                                  ('upload', abs_path),
+                                  ('upload', src_path),
+                                  ('build_pdf+upload', '2308.16188v2')]},
+                     {'submission_id': '2', 'paper_id': '2308.16188', 'type': 'cross',
+                      'actions': [('upload', abs_path)]}]
+            index = os.path.join(tmp, 'dissem.sqlite')
+            to_key = lambda path: path.replace(tmp + '/', '')
+            self.assertEqual(2, update_index(index, todos, to_key, ftp, orig))
+
+            conn = sqlite3.connect(index)
+            self.assertEqual(INDEX_VERSION, conn.execute("PRAGMA user_version").fetchone()[0])
+            rows = {row[0]: row[1:] for row in conn.execute(
+                "SELECT idv, src_key, src_size, src_format, anc, pdf, ps, html FROM dissem")}
+            self.assertEqual(('ftp/arxiv/papers/2308/2308.16188.tar.gz', 10, 'tex', 1, 1, None, None),
+                             rows['2308.16188v2'])
+            self.assertEqual(('orig/arxiv/papers/2308/2308.16188v1.tar.gz', 7, 'tex', None, None, None, None),
+                             rows['2308.16188v1'])
+
+            # Running again is idempotent
+            update_index(index, todos, to_key, ftp, orig)
+            self.assertEqual(2, conn.execute("SELECT count(*) FROM dissem").fetchone()[0])
+            conn.close()
+
+            # Papers with a failed upload are left out
+            failed_index = os.path.join(tmp, 'failed.sqlite')
+            self.assertEqual(0, update_index(failed_index, todos, to_key, ftp, orig,
+                                             failed={'2308.16188'}))
+
+
+if __name__ == '__main__':
+    unittest.main()
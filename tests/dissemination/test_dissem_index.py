@@ -0,0 +1,81 @@
+"""Tests for reading the dissemination index."""
+import os
+import sqlite3
+import tempfile
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from browse.services.dissemination.dissem_index import (INDEX_VERSION,
+                                                        DisseminationIndex,
+                                                        IndexedFileObj)
+from browse.services.dissemination.source_store import SourceStore
+from browse.services.documents.fs_implementation.parse_abs import parse_abs_file
+from browse.services.object_store.object_store_local import LocalObjectStore
+from tests import path_of_for_test
+
+SRC_KEY = 'ftp/arxiv/papers/1208/1208.9999.gz'
+
+
+def make_index(path: str, version: int = INDEX_VERSION) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE dissem (idv TEXT PRIMARY KEY, src_key TEXT, src_size INTEGER,"
+                 " src_format TEXT, anc INTEGER, pdf INTEGER, ps INTEGER, html INTEGER)")
+    conn.execute(f"PRAGMA user_version={version}")
+    conn.execute("INSERT INTO dissem VALUES ('1208.9999v2', ?, 1234, 'tex', 0, 1, NULL, NULL)",
+                 (SRC_KEY,))
+    conn.commit()
+    conn.close()
+
+
+class TestDisseminationIndex(TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'dissem.sqlite')
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_get(self):
+        make_index(self.path)
+        index = DisseminationIndex(self.path)
+        self.assertTrue(index.usable)
+        record = index.get('1208.9999v2')
+        self.assertEqual(record.src_key, SRC_KEY)
+        self.assertEqual(record.src_size, 1234)
+        self.assertFalse(record.anc)
+        self.assertTrue(record.pdf)
+        self.assertIsNone(record.ps)
+        self.assertIsNone(index.get('1208.9999v1'))
+
+    def test_unusable(self):
+        self.assertFalse(DisseminationIndex(self.path).usable)
+        make_index(self.path, version=INDEX_VERSION + 1)
+        index = DisseminationIndex(self.path)
+        self.assertFalse(index.usable)
+        self.assertIsNone(index.get('1208.9999v2'))
+
+    def test_indexed_fileobj(self):
+        make_index(self.path)
+        record = DisseminationIndex(self.path).get('1208.9999v2')
+        store = LocalObjectStore(path_of_for_test('data/abs_files/'))
+        fileobj = IndexedFileObj(store, record)
+        self.assertEqual(fileobj.name, SRC_KEY)
+        self.assertEqual(fileobj.size, 1234)
+        self.assertIsNone(fileobj._fileobj, "name and size should not touch the object store")
+        self.assertEqual(fileobj.exists(), os.path.exists(path_of_for_test('data/abs_files/' + SRC_KEY)))
+
+    def test_no_ancillary_files(self):
+        make_index(self.path)
+        conn = sqlite3.connect(self.path)
+        conn.execute("INSERT INTO dissem VALUES ('1601.04345v2', 'ftp/arxiv/papers/1601/1601.04345.tar.gz',"
+                     " 1234, 'tex', 0, NULL, NULL, NULL)")
+        conn.commit()
+        conn.close()
+        docmeta = parse_abs_file(filename=path_of_for_test('data/abs_files/ftp/arxiv/papers/1601/1601.04345.abs'))
+        self.assertTrue(docmeta.version_history[1].source_flag.includes_ancillary_files)
+        objstore = MagicMock()
+        sstore = SourceStore(objstore, DisseminationIndex(self.path))
+        self.assertEqual(sstore.get_ancillary_files(docmeta), [])
+        objstore.to_obj.assert_not_called()
+        objstore.list.assert_not_called()
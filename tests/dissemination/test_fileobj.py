@@ -1,5 +1,7 @@
+import io
+
 from hypothesis import given
-from hypothesis.strategies import text, binary
+from hypothesis.strategies import integers, lists, text, binary
 
 from browse.services.object_store.fileobj import MockStringFileObj, FileTransform
 
@@ -34,3 +36,31 @@ def test_filetransform_fakeurls(data: str) -> None:
     transformed_data = new_file.open('rb').read()
     assert transformed_data == expected
 
+
+def _upper(xx: bytes) -> bytes:
+    return xx.upper()
+
+
+@given(text(), lists(integers(min_value=1, max_value=20)))
+def test_filetransform_read_sizes(data: str, sizes: list) -> None:
+    orig_file = MockStringFileObj("no_name.data", data=data)
+    expected = io.BytesIO(data.encode('utf-8').upper())
+    with FileTransform(orig_file, _upper).open('rb') as fh:
+        for size in sizes:
+            assert fh.read(size) == expected.read(size)
+            assert fh.readline(size) == expected.readline(size)
+        assert fh.read() == expected.read()
+        assert fh.read(1) == b""
+
+
+@given(text())
+def test_filetransform_readline(data: str) -> None:
+    orig_file = MockStringFileObj("no_name.data", data=data)
+    expected = io.BytesIO(data.encode('utf-8').upper()).readlines()
+    assert list(FileTransform(orig_file, _upper).open('rb')) == expected
+
+    fh = FileTransform(orig_file, _upper).open('rb')
+    lines = []
+    while line := fh.readline():
+        lines.append(line)
+    assert lines == expected
@@ -0,0 +1,65 @@
+"""Tests for getting the uncompressed size of gzip files."""
+import gzip
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+
+from browse.services.object_store import gzip_size
+from browse.services.object_store.fileobj import LocalFileObj, UngzippedFileObj
+from browse.services.object_store.gzip_size import GzipSizeCache
+
+
+class TestGzipSize(TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "1234.5678v1.ps.gz"
+        self.data = b"%!PS-Adobe-2.0\n" + os.urandom(5000) + b"showpage\n" * 2000
+        self.path.write_bytes(gzip.compress(self.data))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_isize(self):
+        ungz = UngzippedFileObj(LocalFileObj(self.path))
+        with mock.patch.object(gzip_size, "decompressed_size", side_effect=AssertionError):
+            self.assertEqual(ungz.size, len(self.data))
+        self.assertEqual(ungz.name, "1234.5678v1.ps")
+        with ungz.open("rb") as fh:
+            self.assertEqual(fh.read(), self.data)
+
+    def test_large_files_are_decompressed_once(self):
+        cache_dir = Path(self.tmp.name) / "sizes"
+        with mock.patch.object(gzip_size, "isize_is_exact", return_value=False), \
+                mock.patch.object(gzip_size, "decompressed_size",
+                                  wraps=gzip_size.decompressed_size) as decompress:
+            cache = GzipSizeCache(10, str(cache_dir))
+            self.assertEqual(UngzippedFileObj(LocalFileObj(self.path), cache).size, len(self.data))
+            self.assertEqual(UngzippedFileObj(LocalFileObj(self.path), cache).size, len(self.data))
+            self.assertEqual(decompress.call_count, 1)
+
+            restarted = GzipSizeCache(10, str(cache_dir))
+            self.assertEqual(UngzippedFileObj(LocalFileObj(self.path), restarted).size, len(self.data))
+            self.assertEqual(decompress.call_count, 1, "size should be read from cache_dir")
+
+            self.path.write_bytes(gzip.compress(self.data + b"more"))
+            self.assertEqual(UngzippedFileObj(LocalFileObj(self.path), restarted).size, len(self.data) + 4)
+            self.assertEqual(decompress.call_count, 2, "a changed file should be decompressed again")
+
+    def test_isize_is_exact(self):
+        self.assertTrue(gzip_size.isize_is_exact(1024 * 1024))
+        self.assertFalse(gzip_size.isize_is_exact(5 * 1024 * 1024))
+        self.assertFalse(gzip_size.isize_is_exact(10))
+
+    def test_decompressed_size_closes_file(self):
+        opened = []
+        gzipped = LocalFileObj(self.path)
+        inner_open = gzipped.open
+
+        def tracked_open(*args, **kwargs):
+            opened.append(inner_open(*args, **kwargs))
+            return opened[-1]
+        gzipped.open = tracked_open
+        self.assertEqual(gzip_size.decompressed_size(gzipped), len(self.data))
+        self.assertTrue(opened and all(fh.closed for fh in opened))
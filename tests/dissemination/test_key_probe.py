@@ -0,0 +1,69 @@
+"""Tests for probing candidate keys concurrently."""
+import threading
+import time
+from unittest import TestCase
+
+from browse.services.dissemination.key_probe import KeyProbe
+
+
+def miss():
+    return None
+
+
+def slow(value, seconds=0.05):
+    def probe():
+        time.sleep(seconds)
+        return value
+    return probe
+
+
+def fail():
+    raise ValueError("bad probe")
+
+
+class TestKeyProbe(TestCase):
+
+    def setUp(self) -> None:
+        self.concurrent = KeyProbe(4)
+        self.serial = KeyProbe(1)
+
+    def test_precedence(self):
+        for probe in [self.concurrent, self.serial]:
+            self.assertEqual(probe.first("t", [("a", miss), ("b", slow("B")), ("c", lambda: "C")]),
+                             ("b", "B"), "first hit in order even if a later one is faster")
+            self.assertEqual(probe.first("t", [("a", slow("A")), ("b", lambda: "B")]), ("a", "A"))
+            self.assertEqual(probe.first("t", [("a", miss), ("b", miss)]), (None, None))
+            self.assertEqual(probe.first("t", []), (None, None))
+
+    def test_exceptions(self):
+        for probe in [self.concurrent, self.serial]:
+            self.assertEqual(probe.first("t", [("a", lambda: "A"), ("b", fail)]), ("a", "A"),
+                             "exception after a hit is not raised")
+            with self.assertRaises(ValueError):
+                probe.first("t", [("a", miss), ("b", fail), ("c", lambda: "C")])
+
+    def test_concurrent(self):
+        started = threading.Barrier(3, timeout=5)
+
+        def together(value):
+            def probe():
+                started.wait()  # only passes if all three are running at once
+                return value
+            return probe
+
+        self.assertEqual(self.concurrent.first("t", [("a", together(None)),
+                                                     ("b", together(None)),
+                                                     ("c", together("C"))]),
+                         ("c", "C"))
+
+    def test_serial_stops_at_hit(self):
+        tried = []
+
+        def probe(label, value):
+            def fn():
+                tried.append(label)
+                return value
+            return (label, fn)
+
+        self.serial.first("t", [probe("a", None), probe("b", "B"), probe("c", "C")])
+        self.assertEqual(tried, ["a", "b"])
@@ -0,0 +1,64 @@
+"""Tests for the cache of where PDFs were found."""
+from datetime import datetime, timezone
+from unittest import TestCase
+from zoneinfo import ZoneInfo
+
+from browse.services.dissemination.location_cache import (Found,
+                                                          LocationCache,
+                                                          Missing)
+
+TZ = ZoneInfo('US/Eastern')
+KEY = ('1208.9999v1', 1, 'pdf')
+
+
+class FakeClock():
+    def __init__(self, now: datetime) -> None:
+        self.now = now.timestamp()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLocationCache(TestCase):
+
+    def setUp(self) -> None:
+        # Tuesday 10:00 US/Eastern, next announcement is 20:00 the same day
+        self.clock = FakeClock(datetime(2023, 5, 2, 14, 0, tzinfo=timezone.utc))
+        self.cache = LocationCache(10, 60 * 60 * 24, 300, TZ, clock=self.clock)
+
+    def test_found(self):
+        self.assertIsNone(self.cache.get(KEY))
+        self.cache.put(KEY, Found('ps_cache/arxiv/pdf/1208/1208.9999v1.pdf'))
+        self.assertEqual(self.cache.get(KEY), Found('ps_cache/arxiv/pdf/1208/1208.9999v1.pdf'))
+        self.assertEqual(self.cache.stats()['hits'], 1)
+        self.assertEqual(self.cache.stats()['misses'], 1)
+
+    def test_found_expires_at_next_announcement(self):
+        self.cache.put(KEY, Found('some/key.pdf'))
+        self.clock.now += 60 * 60 * 9
+        self.assertIsNotNone(self.cache.get(KEY))
+        self.clock.now += 60 * 60 * 2
+        self.assertIsNone(self.cache.get(KEY))
+
+    def test_missing_expires(self):
+        self.cache.put(KEY, Missing('UNAVAILABLE'))
+        self.assertEqual(self.cache.get(KEY), Missing('UNAVAILABLE'))
+        self.clock.now += 301
+        self.assertIsNone(self.cache.get(KEY))
+
+    def test_missing_not_cached_during_announcement(self):
+        self.clock.now = datetime(2023, 5, 2, 20, 30, tzinfo=TZ).timestamp()
+        self.cache.put(KEY, Missing('NO_SOURCE'))
+        self.assertIsNone(self.cache.get(KEY))
+        self.cache.put(KEY, Found('some/key.pdf'))
+        self.assertIsNotNone(self.cache.get(KEY))
+
+    def test_lru(self):
+        cache = LocationCache(2, 600, 300, TZ, clock=self.clock)
+        cache.put(('a', 1, 'pdf'), Found('a'))
+        cache.put(('b', 1, 'pdf'), Found('b'))
+        cache.get(('a', 1, 'pdf'))
+        cache.put(('c', 1, 'pdf'), Found('c'))
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(('b', 1, 'pdf')))
+        self.assertIsNotNone(cache.get(('a', 1, 'pdf')))
@@ -0,0 +1,101 @@
+"""Tests for getting several objects at once from the object stores."""
+import json
+import re
+from unittest import TestCase
+from urllib.parse import unquote
+
+import requests
+from google.auth.credentials import AnonymousCredentials
+from google.cloud import storage
+
+from browse.services.object_store.fileobj import FileDoesNotExist
+from browse.services.object_store.object_store_gs import LIST_FIELDS, GsObjectStore
+from browse.services.object_store.object_store_local import LocalObjectStore
+
+OBJECTS = {"ps_cache/arxiv/pdf/1208/1208.6335v1.pdf": 10,
+           "ftp/arxiv/papers/1208/1208.6335.pdf": 30}
+
+
+class FakeGcs(requests.Session):
+    """Answers GCS JSON API batch, get and list requests for `OBJECTS`."""
+    is_mtls = False
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = []
+
+    def request(self, method, url, data=None, headers=None, timeout=None, **kwargs):
+        self.calls.append((method, url))
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.request = requests.Request(method, url).prepare()
+        if "/batch/" in url:
+            parts = []
+            for num, path in enumerate(re.findall(r"GET (\S+) HTTP/1.1", data)):
+                name = unquote(path.split("/o/")[1].split("?")[0])
+                if name in OBJECTS:
+                    status = "200 OK"
+                    body = {"name": name, "bucket": "b", "size": str(OBJECTS[name]),
+                            "generation": "1", "etag": "E"}
+                else:
+                    status = "404 Not Found"
+                    body = {"error": {"code": 404, "message": "No such object"}}
+                parts.append(f"--BOUNDARY\r\nContent-Type: application/http\r\n"
+                             f"Content-ID: <response-{num}>\r\n\r\nHTTP/1.1 {status}\r\n"
+                             f"Content-Type: application/json\r\n\r\n{json.dumps(body)}\r\n")
+            resp._content = ("".join(parts) + "--BOUNDARY--").encode()
+            resp.headers["content-type"] = "multipart/mixed; boundary=BOUNDARY"
+        elif "/o/" in url:
+            name = unquote(url.split("/o/")[1].split("?")[0])
+            if name in OBJECTS:
+                body = {"name": name, "bucket": "b", "size": str(OBJECTS[name]),
+                        "generation": "1", "etag": "E"}
+            else:
+                resp.status_code = 404
+                body = {"error": {"code": 404, "message": "No such object"}}
+            resp._content = json.dumps(body).encode()
+            resp.headers["content-type"] = "application/json"
+        else:
+            items = [{"name": name, "size": str(size)} for name, size in OBJECTS.items()]
+            resp._content = json.dumps({"items": items}).encode()
+            resp.headers["content-type"] = "application/json"
+        return resp
+
+
+class TestToObjs(TestCase):
+
+    def test_local(self):
+        store = LocalObjectStore("tests/data/abs_files")
+        keys = ["ftp/arxiv/papers/1208/1208.6335.pdf", "ftp/arxiv/papers/1208/nope.pdf"]
+        objs = store.to_objs(keys)
+        self.assertEqual(len(objs), 2)
+        self.assertTrue(objs[0].exists())
+        self.assertEqual(objs[0].name, "1208.6335.pdf")
+        self.assertIsInstance(objs[1], FileDoesNotExist)
+
+    def test_gs_batch(self):
+        gcs = FakeGcs()
+        client = storage.Client(project="test", credentials=AnonymousCredentials(), _http=gcs)
+        store = GsObjectStore(client.bucket("b"))
+        keys = ["ps_cache/arxiv/pdf/1208/1208.6335v1.pdf", "missing.pdf",
+                "ftp/arxiv/papers/1208/1208.6335.pdf"]
+
+        objs = store.to_objs([keys[0], keys[2]])
+        self.assertEqual(len(gcs.calls), 1, "should be a single batch request")
+        self.assertIn("/batch/storage/v1", gcs.calls[0][1])
+        self.assertEqual([obj.size for obj in objs], [10, 30])
+
+        objs = store.to_objs(keys)
+        self.assertEqual(len(gcs.calls), 3, "the missing key should be gotten on its own")
+        self.assertIn("/o/missing.pdf", gcs.calls[2][1])
+        self.assertEqual([obj.name for obj in objs],
+                         [keys[0], "gs://b/missing.pdf", keys[2]])
+        self.assertIsInstance(objs[1], FileDoesNotExist)
+        self.assertEqual(objs[2].size, 30)
+
+    def test_gs_list_fields(self):
+        gcs = FakeGcs()
+        client = storage.Client(project="test", credentials=AnonymousCredentials(), _http=gcs)
+        store = GsObjectStore(client.bucket("b"))
+        self.assertEqual([obj.name for obj in store.list("ftp/")], list(OBJECTS))
+        self.assertIn("fields=" + requests.utils.quote(LIST_FIELDS, safe=""), gcs.calls[0][1])
@@ -0,0 +1,132 @@
+"""Tests for the local disk cache of objects."""
+import os
+import threading
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from browse.services.object_store.object_store_cache import CachingObjectStore
+from browse.services.object_store.object_store_local import LocalObjectStore
+
+
+class CountingStore(LocalObjectStore):
+    """`LocalObjectStore` that counts how many times its objects are opened."""
+
+    def __init__(self, prefix: str, delay: float = 0):
+        super().__init__(prefix)
+        self.opens = 0
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def to_obj(self, key):
+        fileobj = super().to_obj(key)
+        if fileobj.exists():
+            store = self
+            inner_open = fileobj.open
+
+            def counted_open(*args, **kwargs):
+                with store._lock:
+                    store.opens += 1
+                time.sleep(store.delay)
+                return inner_open(*args, **kwargs)
+            fileobj.open = counted_open
+        return fileobj
+
+
+class TestCachingObjectStore(TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = TemporaryDirectory()
+        self.src = Path(self.tmp.name) / "src"
+        self.src.mkdir()
+        self.cache_dir = Path(self.tmp.name) / "cache"
+        self.inner = CountingStore(str(self.src))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def write(self, key: str, data: bytes) -> None:
+        (self.src / key).write_bytes(data)
+
+    def test_read_through(self):
+        self.write("a.pdf", b"0123456789")
+        store = CachingObjectStore(self.inner, str(self.cache_dir), 1000)
+        self.assertFalse(store.to_obj("missing.pdf").exists())
+
+        for _ in range(3):
+            fileobj = store.to_obj("a.pdf")
+            self.assertEqual(fileobj.size, 10)
+            with fileobj.open("rb") as fh:
+                self.assertEqual(fh.read(), b"0123456789")
+        self.assertEqual(self.inner.opens, 1)
+        self.assertEqual(store.stats()["hits"], 2)
+
+        with store.to_obj("a.pdf").open("rb") as fh:
+            fh.seek(4)
+            self.assertEqual(fh.read(3), b"456", "ranged reads seek in the copy")
+
+    def test_revalidate(self):
+        self.write("a.pdf", b"first")
+        store = CachingObjectStore(self.inner, str(self.cache_dir), 1000)
+        with store.to_obj("a.pdf").open("rb") as fh:
+            self.assertEqual(fh.read(), b"first")
+
+        self.write("a.pdf", b"second version")
+        with store.to_obj("a.pdf").open("rb") as fh:
+            self.assertEqual(fh.read(), b"second version")
+        self.assertEqual(self.inner.opens, 2)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1, "old version should be removed")
+
+    def test_lru_eviction(self):
+        for key in "abc":
+            self.write(key, key.encode() * 40)
+        store = CachingObjectStore(self.inner, str(self.cache_dir), 100, max_object_bytes=100)
+        for key in "ab":
+            store.to_obj(key).open("rb").close()
+        store.to_obj("a").open("rb").close()  # b is now least recently used
+        store.to_obj("c").open("rb").close()
+        self.assertEqual(store.stats()["bytes"], 80)
+        self.assertEqual(self.inner.opens, 3)
+
+        store.to_obj("a").open("rb").close()
+        self.assertEqual(self.inner.opens, 3, "a should still be cached")
+        store.to_obj("b").open("rb").close()
+        self.assertEqual(self.inner.opens, 4, "b should have been evicted")
+
+    def test_large_objects_bypass(self):
+        self.write("big", b"x" * 200)
+        store = CachingObjectStore(self.inner, str(self.cache_dir), 1000, max_object_bytes=100)
+        for _ in range(2):
+            with store.to_obj("big").open("rb") as fh:
+                self.assertEqual(len(fh.read()), 200)
+        self.assertEqual(self.inner.opens, 2)
+        self.assertEqual(store.stats()["bypasses"], 2)
+
+    def test_one_fetch_for_concurrent_opens(self):
+        self.write("a.pdf", b"0123456789")
+        self.inner.delay = 0.1
+        store = CachingObjectStore(self.inner, str(self.cache_dir), 1000)
+        results = []
+
+        def read():
+            with store.to_obj("a.pdf").open("rb") as fh:
+                results.append(fh.read())
+
+        threads = [threading.Thread(target=read) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [b"0123456789"] * 5)
+        self.assertEqual(self.inner.opens, 1)
+
+    def test_existing_copies(self):
+        self.write("a.pdf", b"0123456789")
+        store = CachingObjectStore(self.inner, str(self.cache_dir), 1000)
+        store.to_obj("a.pdf").open("rb").close()
+
+        restarted = CachingObjectStore(self.inner, str(self.cache_dir), 1000)
+        self.assertEqual(restarted.stats()["bytes"], 10)
+        restarted.to_obj("a.pdf").open("rb").close()
+        self.assertEqual(self.inner.opens, 1)
@@ -0,0 +1,38 @@
+"""Tests for sending local files with sendfile or X-Accel-Redirect."""
+import os
+from pathlib import Path
+
+from browse.services.object_store.fileobj import LocalFileObj
+from tests import path_of_for_test
+
+PDF = path_of_for_test('data/abs_files/ftp/arxiv/papers/1208/1208.6335.pdf')
+
+
+def test_sendfile(client_with_test_fs):
+    client_with_test_fs.application.config['DISSEMINATION_SENDFILE'] = 'sendfile'
+    resp = client_with_test_fs.get("/pdf/1208.6335v2")
+    assert resp.status_code == 200
+    assert resp.headers['Content-Type'] == 'application/pdf'
+    assert resp.headers['Content-Length'] == str(os.path.getsize(PDF))
+    assert resp.headers['Accept-Ranges'] == 'bytes'
+    with open(PDF, 'rb') as fh:
+        data = fh.read()
+    assert resp.data == data
+
+    resp = client_with_test_fs.get("/pdf/1208.6335v2", headers={"Range": "bytes=0-9"})
+    assert resp.status_code == 206
+    assert resp.data == data[:10]
+
+    etag = client_with_test_fs.get("/pdf/1208.6335v2").headers['ETag']
+    assert etag == f'"{LocalFileObj(Path(PDF)).etag}"', "should be the same ETag as streaming"
+    resp = client_with_test_fs.get("/pdf/1208.6335v2", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+
+
+def test_x_accel_redirect(client_with_test_fs):
+    client_with_test_fs.application.config['DISSEMINATION_SENDFILE'] = 'x-accel-redirect'
+    resp = client_with_test_fs.get("/pdf/1208.6335v2")
+    assert resp.status_code == 200
+    assert resp.headers['X-Accel-Redirect'] == '/protected/ftp/arxiv/papers/1208/1208.6335.pdf'
+    assert resp.headers['Content-Type'] == 'application/pdf'
+    assert not resp.data
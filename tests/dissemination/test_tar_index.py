@@ -0,0 +1,93 @@
+"""Tests for the tar member index with gzip access points."""
+import io
+import random
+import tarfile
+from pathlib import Path
+
+from browse.services.object_store.fileobj import FileFromTar, LocalFileObj
+from browse.services.dissemination.ancillary_files import list_ancillary_files
+from browse.services.object_store.tar_index import (TarIndexCache,
+                                                    build_tar_index, find_tar_index)
+from tests import path_of_for_test
+
+TARGZ = path_of_for_test('data/abs_files/orig/arxiv/papers/2101/2101.10016v1.tar.gz')
+
+
+def _make_targz(n_members: int = 12) -> tuple:
+    rnd = random.Random(1234)
+    members = {}
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode='w:gz') as tar:
+        for i in range(n_members):
+            # Random data so it does not compress to less than a single read
+            data = rnd.randbytes(rnd.randint(0, 100_000))
+            name = f"anc/file{i}.dat"
+            members[name] = data
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue(), members
+
+
+def test_members_match_tarfile():
+    with open(TARGZ, 'rb') as fh:
+        index = build_tar_index(fh)
+    with tarfile.open(TARGZ) as tar:
+        expected = {m.name: m.size for m in tar if m.isfile()}
+    assert {m.name: m.size for m in index.members.values()} == expected
+
+
+def test_read_and_seek_members():
+    targz, members = _make_targz()
+    index = build_tar_index(io.BytesIO(targz), span=64 * 1024)
+    assert len(index.points) > 1
+
+    rnd = random.Random(99)
+    for name, data in members.items():
+        reader = index.open_member(io.BytesIO(targz), name)
+        assert reader.read() == data
+        for _ in range(5):
+            if not data:
+                break
+            start = rnd.randrange(len(data))
+            reader.seek(start)
+            assert reader.read(5000) == data[start:start + 5000]
+        reader.seek(-10, io.SEEK_END)
+        assert reader.read() == data[-10:]
+
+
+def test_file_from_tar_with_index():
+    tar_file = LocalFileObj(Path(TARGZ))
+    index = TarIndexCache(1024 * 1024).get(tar_file)
+    name = next(iter(index.members))
+
+    with_index = FileFromTar(tar_file, name, index)
+    without_index = FileFromTar(tar_file, name)
+    assert with_index.exists() and without_index.exists()
+    assert with_index.size == without_index.size
+    assert with_index.open('rb').read() == without_index.open('rb').read()
+    assert not FileFromTar(tar_file, 'not/a/member', index).exists()
+
+
+def test_cache():
+    tar_file = LocalFileObj(Path(TARGZ))
+    cache = TarIndexCache(1024 * 1024)
+    assert cache.get(tar_file) is cache.get(tar_file)
+    assert len(cache) == 1
+    assert len(TarIndexCache(1).get(tar_file).members) > 0
+
+
+def test_uncompressed_tar_named_targz(tmp_path):
+    path = tmp_path / "2101.10016v1.tar.gz"
+    with tarfile.open(path, mode='w') as tar:
+        for name, data in [("main.tex", b"\\documentclass{article}"), ("anc/data.csv", b"1,2,3\n")]:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    tar_file = LocalFileObj(path)
+
+    assert find_tar_index(tar_file) is None
+    assert list_ancillary_files(tar_file) == [{'name': 'data.csv', 'size_bytes': 6}]
+    member = FileFromTar(tar_file, "anc/data.csv", find_tar_index(tar_file))
+    assert member.exists()
+    assert member.open('rb').read() == b"1,2,3\n"
@@ -0,0 +1,31 @@
+from browse.services.database.listings import materialize_listings
+from browse.services.database.models import db, ListingAnnouncement, ListingAnnouncementDay
+from browse.services.listing import get_listing_service
+
+
+def _listings(ls, context, skip, show):
+    new=ls.list_new_articles(context, skip, show)
+    recent=ls.list_pastweek_articles(context, skip, show)
+    return ([(item.id, item.listingType) for item in new.listings],
+            new.new_count, new.cross_count, new.rep_count, new.announced,
+            [(item.id, item.listingType) for item in recent.listings],
+            [tuple(day) for day in recent.pubdates], recent.count)
+
+
+def test_materialized_listings(app_with_db):
+    app = app_with_db
+    with app.app_context():
+        ls=get_listing_service()
+        cases=[(context, skip, show)
+               for context in ['math', 'math.RT', 'math-ph', 'eess.SY', 'cond-mat', 'cs']
+               for skip, show in [(0, 25), (1, 2), (0, 2000)]]
+        live={case: _listings(ls, *case) for case in cases}
+        try:
+            written=materialize_listings(sorted({context for context, _, _ in cases}))
+            assert written['new'] > 0 and written['pastweek'] > 0
+            for case in cases:
+                assert _listings(ls, *case) == live[case]
+        finally:
+            db.session.query(ListingAnnouncement).delete()
+            db.session.query(ListingAnnouncementDay).delete()
+            db.session.commit()
@@ -197,3 +197,26 @@ def test_year_listing_page( client_with_db_listings):
     #print(text)
     assert '<a href ="/abs/chao-dyn/9510015" title="Abstract" id="chao-dyn/9510015">\n        arXiv:chao-dyn/9510015\n      </a>' in text
     assert '<a href="https://arxiv.org/search/chao-dyn?searchtype=author&amp;query=Tiong,+M+L+B">Melvin Leok Boon Tiong</a>' in text
+
+def test_keyset_pagination(app_with_db, monkeypatch):
+    from browse.services.database import listings
+    app = app_with_db
+    with app.app_context():
+        ls=get_listing_service()
+        for stride in [1, 2]:
+            monkeypatch.setattr(listings, 'KEYSET_STRIDE', stride)
+            listings._listing_index_cache.clear()
+            for year, month in [(2009, 6), (2009, None)]:
+                full=ls.list_articles_by_month("math", year, month, 0, 2000)
+                assert full.count>=4
+                index=listings._listing_index_cache._entries[("math", year, month)]
+                assert len(index.keys)==full.count // stride, "pages past skip=stride should seek past a saved key"
+                for show in [1, 2, 3]:
+                    paged=[]
+                    for skip in range(0, full.count, show):
+                        page=ls.list_articles_by_month("math", year, month, skip, show)
+                        assert page.count==full.count
+                        paged.extend(page.listings)
+                    assert [item.id for item in paged]==[item.id for item in full.listings]
+                assert ls.list_articles_by_month("math", year, month, full.count + 5, 25).listings==[]
+    listings._listing_index_cache.clear()
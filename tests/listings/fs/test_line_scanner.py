@@ -0,0 +1,17 @@
+import pytest
+
+from browse.services.listing.line_scanner import LineScanner
+
+
+@pytest.mark.parametrize("text", ["", "\n", "a", "a\n", "a\nb", "a\n\nb\n", "\\\\\n/* x */\n\\\\\n"])
+def test_same_lines_as_split(text):
+    lines = text.split("\n")
+    scanner = LineScanner(text)
+    while lines:
+        assert scanner
+        assert scanner.rest() == "\n".join(lines)
+        assert scanner.pop() == lines.pop(0)
+    assert not scanner
+    assert scanner.rest() == ""
+    with pytest.raises(IndexError):
+        scanner.pop()
@@ -0,0 +1,105 @@
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from browse.services.listing.listing_cache import ParsedListingCache
+from browse.services.listing.parse_new_listing_file import parse_new_listing_file
+from browse.services.object_store.fileobj import LocalFileObj
+from tests import path_of_for_test
+
+NEW = Path(path_of_for_test("data/abs_files/ftp/astro-ph/listings/new"))
+TZ = ZoneInfo("US/Eastern")
+NOT_PUBLISH = datetime(2024, 1, 8, 17, 0, tzinfo=timezone.utc).timestamp()
+IN_PUBLISH = datetime(2024, 1, 9, 1, 30, tzinfo=timezone.utc).timestamp()
+
+
+class Clock():
+    def __init__(self, wall: float):
+        self.now = 0.0
+        self.wall = wall
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def counting(parse):
+    def _parse(fileobj):
+        _parse.calls += 1
+        return parse(fileobj)
+    _parse.calls = 0
+    return _parse
+
+
+def _cache(clock, cache_dir=None):
+    return ParsedListingCache(10, 30, TZ, cache_dir, clock=clock, wall_clock=lambda: clock.wall)
+
+
+def test_revalidate(tmp_path):
+    new = tmp_path / "new"
+    shutil.copy(NEW, new)
+    clock = Clock(NOT_PUBLISH)
+    cache = _cache(clock)
+    parse = counting(parse_new_listing_file)
+
+    first = cache.get_or_parse("new", lambda: LocalFileObj(new), parse)
+    assert first.listings and parse.calls == 1
+    clock.now = 10
+    assert cache.get_or_parse("new", lambda: 1 / 0, parse) is first
+
+    clock.now = 40
+    assert cache.get_or_parse("new", lambda: LocalFileObj(new), parse) is first
+    assert parse.calls == 1
+    assert cache.stats()['revalidations'] == 1
+
+    os.utime(new, (1, 1))
+    clock.now = 80
+    assert cache.get_or_parse("new", lambda: LocalFileObj(new), parse) is not first
+    assert parse.calls == 2
+
+
+def test_stale_while_revalidate_in_publish(tmp_path):
+    new = tmp_path / "new"
+    shutil.copy(NEW, new)
+    clock = Clock(IN_PUBLISH)
+    cache = _cache(clock)
+    parse = counting(parse_new_listing_file)
+
+    first = cache.get_or_parse("new", lambda: LocalFileObj(new), parse)
+    os.utime(new, (1, 1))
+    clock.now = 40
+    assert cache.get_or_parse("new", lambda: LocalFileObj(new), parse) is first
+    assert cache.stats()['stale_hits'] == 1
+
+    for _ in range(100):
+        if parse.calls == 2:
+            break
+        time.sleep(0.05)
+    assert parse.calls == 2
+    assert cache.get_or_parse("new", lambda: 1 / 0, parse) is not first
+
+
+def test_shared_dir(tmp_path):
+    clock = Clock(NOT_PUBLISH)
+    parse = counting(parse_new_listing_file)
+    first = _cache(clock, tmp_path).get_or_parse("new", lambda: LocalFileObj(NEW), parse)
+    second = _cache(clock, tmp_path).get_or_parse("new", lambda: LocalFileObj(NEW), parse)
+    assert parse.calls == 1
+    assert [item.id for item in second.listings] == [item.id for item in first.listings]
+
+
+def test_service_window():
+    from browse.services.listing.fs_listings import FsListingFilesService
+    listing_path = path_of_for_test("data/abs_files/ftp")
+    cached = FsListingFilesService(listing_path, listing_cache=_cache(Clock(NOT_PUBLISH)))
+    uncached = FsListingFilesService(listing_path)
+    for skip, show in [(0, 5), (3, 20), (0, 2000)]:
+        for list_fn in ['list_new_articles', 'list_pastweek_articles']:
+            expected = getattr(uncached, list_fn)('astro-ph', skip, show)
+            got = getattr(cached, list_fn)('astro-ph', skip, show)
+            assert [item.id for item in got.listings] == [item.id for item in expected.listings]
+            assert got.count if list_fn == 'list_pastweek_articles' else got.new_count
+            assert (vars(got) | {'listings': None, 'expires': None}) == \
+                (vars(expected) | {'listings': None, 'expires': None})
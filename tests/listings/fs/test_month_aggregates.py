@@ -0,0 +1,64 @@
+import os
+import shutil
+from pathlib import Path
+
+from browse.services.listing.month_aggregates import MonthAggregateCache, category_index
+from browse.services.listing.parse_listing_file import MonthItem, get_updates_from_list_file
+from browse.services.object_store.fileobj import LocalFileObj
+from tests import path_of_for_test
+
+MONTH = Path(path_of_for_test("data/abs_files/ftp/astro-ph/listings/2006"))
+
+
+def test_same_as_parse():
+    agg = MonthAggregateCache(10 * 1024 * 1024).get("astro-ph/listings/2006",
+                                                   LocalFileObj(MONTH))
+    for lfilter in ['', 'astro-ph', 'astro-ph.GA']:
+        parsed = get_updates_from_list_file(20, 6, LocalFileObj(MONTH), 'month', lfilter)
+        listed = agg.listed(lfilter)
+        assert [(item.id, item.listing_type) for item in listed] == \
+            [(item.id, item.listingType) for item in parsed.listings]
+        assert [vars(item.to_listing_item().article) for item in listed[:5]] == \
+            [vars(item.article) for item in parsed.listings[:5]]
+
+    counts = get_updates_from_list_file(20, 6, LocalFileObj(MONTH), 'monthly_counts')
+    assert (agg.new, agg.cross) == (counts.new, counts.cross)
+
+
+def test_reparse_only_on_change(tmp_path):
+    month = tmp_path / "2006"
+    shutil.copy(MONTH, month)
+    cache = MonthAggregateCache(10 * 1024 * 1024)
+
+    first = cache.get("astro-ph/listings/2006", LocalFileObj(month))
+    assert cache.get("astro-ph/listings/2006", LocalFileObj(month)) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    month.write_bytes(month.read_bytes() * 2)
+    os.utime(month, (1, 1))
+    changed = cache.get("astro-ph/listings/2006", LocalFileObj(month))
+    assert changed is not first
+    assert len(changed.items) == 2 * len(first.items)
+    assert len(cache) == 1
+
+
+def test_memory_budget():
+    cache = MonthAggregateCache(1)
+    agg = cache.get("astro-ph/listings/2006", LocalFileObj(MONTH))
+    assert agg.items
+    assert len(cache) == 0
+
+
+def test_category_index():
+    items = (MonthItem('1', 'new', 'math-ph', 'math-ph cs.IT', ''),
+             MonthItem('2', 'new', 'physics.atom-ph', 'physics.atom-ph cond-mat.stat-mech', ''),
+             MonthItem('3', 'cross', 'hep-th', 'hep-th math.AG', ''),
+             MonthItem('4', 'new', 'math.AG', 'math.AG math.CO', ''))
+    index = category_index(items)
+    assert index['math'] == ((0, 3), (2,))
+    assert index['math.MP'] == ((0,), ())
+    assert index['math.IT'] == ((), (0,))
+    assert index['math.CO'] == ((), (3,))
+    assert index['cond-mat.stat-mech'] == ((), (1,))
+    assert 'cs' in index and index['cs'] == ((), (0,))
+    assert 'stat' not in index
@@ -1,7 +1,8 @@
 from pathlib import Path
 
 from browse.services.listing import Listing
-from browse.services.listing.parse_listing_file import get_updates_from_list_file, _parse_item
+from browse.services.listing.parse_listing_file import (get_updates_from_list_file, _parse_item,
+                                                          categories_in, listed_as)
 
 ASTRO_LISTS = "ftp/astro-ph/listings"
 
@@ -166,3 +167,14 @@ License: http://creativecommons.org/licenses/by/4.0/""",
         if 'expected' in ex:
             for name, value in ex['expected']:
                 assert getattr(item, name) == value , f"check of {name} failed"
+
+
+def test_listed_as():
+    assert 'math.AG' in categories_in('math')
+    assert 'math-ph' in categories_in('math')  # alias of math.MP
+    assert 'physics.optics' not in categories_in('cs')
+    assert listed_as('math.AG', 'math.AG cs.LG', 'new', 'math') == 'new'
+    assert listed_as('math.AG', 'math.AG cs.LG', 'new', 'cs') == 'cross'
+    assert listed_as('math.AG', 'math.AG cs.LG', 'cross', 'math') is None
+    assert listed_as('physics.optics', 'physics.optics', 'new', 'cs') is None
+    assert listed_as('physics.optics', 'physics.optics', 'rep', '') == 'rep'
@@ -37,3 +37,13 @@ def test_parse_new_math_oa(abs_path):
         assert item.article.title
         if item.listingType in ['cross','new']:
             assert item.article.abstract
+
+
+def test_parse_new_window(abs_path):
+    full = parse_new_listing_file((abs_path / ASTRO_LISTS / "new"))
+    for skip, show in [(0, 5), (full.new_count - 2, 4), (full.new_count + full.cross_count, 1000)]:
+        window = parse_new_listing_file((abs_path / ASTRO_LISTS / "new"), skip=skip, show=show)
+        assert [(item.id, item.listingType) for item in window.listings] == \
+            [(item.id, item.listingType) for item in full.listings[skip:skip + show]]
+        assert (window.new_count, window.cross_count, window.rep_count) == \
+            (full.new_count, full.cross_count, full.rep_count)
@@ -12,3 +12,14 @@ def test_parse_pastweek(abs_path):
         assert parsed.listings
         assert parsed.count
         assert parsed.expires
+
+
+def test_parse_pastweek_window(abs_path):
+    for file in (abs_path/ASTRO_LISTS).glob("pastweek.*"):
+        full = parse_listing_pastweek(file)
+        for skip, show in [(0, 5), (3, 10), (full.count - 1, 25)]:
+            window = parse_listing_pastweek(file, skip=skip, show=show)
+            assert [item.id for item in window.listings] == \
+                [item.id for item in full.listings[skip:skip + show]], f"problem with {file}"
+            assert window.count == full.count
+            assert window.pubdates == full.pubdates
@@ -214,6 +214,43 @@ class TestBrowseDatabaseService(TestCase):
             database.get_dblp_authors(
                 test_paper_id), [])
 
+    def test_get_abs_page_bundle(self) -> None:
+        """Test that the bundle has the same data as the individual functions."""
+        for test_paper_id in ['0808.4142', '0704.0361', '0906.2112', '1807.00002']:
+            bundle = database.get_abs_page_bundle(test_paper_id)
+            count = database.count_trackback_pings(test_paper_id)
+            self.assertEqual(bundle.trackback_ping_count, count)
+            if count:
+                self.assertEqual(bundle.trackback_ping_latest,
+                                 database.get_trackback_ping_latest_date(test_paper_id))
+            self.assertEqual(bundle.dblp_listing_path,
+                             database.get_dblp_listing_path(test_paper_id))
+            self.assertListEqual(bundle.dblp_authors,
+                                 database.get_dblp_authors(test_paper_id))
+            self.assertEqual(bundle.datacite_doi,
+                             database.get_datacite_doi(test_paper_id))
+            for version in [1, 2, 3]:
+                self.assertEqual(bundle.latexml_status(version),
+                                 database.get_latexml_status_for_document(test_paper_id, version))
+                self.assertEqual(bundle.latexml_publish_dt(version),
+                                 database.get_latexml_publish_dt(test_paper_id, version))
+
+        self.assertEqual(database.get_abs_page_bundle('0808.4142').trackback_ping_count, 9)
+        self.assertEqual(database.get_abs_page_bundle('0704.0361').dblp_listing_path,
+                         'db/journals/corr/corr0704.html#abs-0704-0361')
+
+    def test_get_latexml_statuses(self) -> None:
+        """Test that the bulk statuses match the status of each paper."""
+        papers = [(paper_id, version)
+                  for paper_id in ['0906.2112', '0906.5132', '2310.08262', '0906.5504']
+                  for version in [1, 2, 3]]
+        statuses = database.get_latexml_statuses(papers)
+        self.assertGreater(len(statuses), 0)
+        for paper_id, version in papers:
+            self.assertEqual(statuses.get((paper_id, version)),
+                             database.get_latexml_status_for_document(paper_id, version))
+        self.assertDictEqual(database.get_latexml_statuses([]), {})
+
     def test_get_document_count(self) -> None:
         """Test document count function."""
         self.assertGreater(
@@ -239,6 +276,8 @@ class TestBrowseDatabaseService(TestCase):
             database.get_dblp_listing_path('0704.0361'), None)
         self.assertEqual(
             database.get_dblp_authors('0704.0361'), [])
+        self.assertEqual(
+            database.get_abs_page_bundle('0704.0361'), database.AbsPageBundle())
         mock_query.side_effect = SQLAlchemyError
         self.assertRaises(SQLAlchemyError,
                           database.get_institution, '10.0.0.1')
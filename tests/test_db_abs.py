@@ -117,3 +117,80 @@ def test_last_modified_no_html (dbclient):
     atag = html.select_one('.extra-services').find('a', {'id': 'latexml-download-link'})
 
     assert atag is None
+
+
+def test_db_abs_many(dbclient):
+    from browse.services.documents import get_doc_service
+    with dbclient.application.app_context():
+        docs = get_doc_service().get_abs_many(['0906.2112', '0906.2112v1', '0704.9999999', 'bogus'])
+        assert set(docs.keys()) == {'0906.2112', '0906.2112v1'}
+        assert docs['0906.2112'].version == 3
+        assert docs['0906.2112v1'].version == 1
+        assert docs['0906.2112'].arxiv_id == get_doc_service().get_abs('0906.2112').arxiv_id
+
+
+def test_db_abs_query_count(dbclient):
+    """The DB data of the abs page should be gotten with a few bulk queries."""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    statements = []
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        rt = dbclient.get('/abs/0906.2112')
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    assert rt.status_code == 200
+    assert rt.headers['Last-Modified'] == 'Mon, 01 Jan 2024 00:00:00 GMT'
+    selects = [stmt for stmt in statements if stmt.lstrip().upper().startswith('SELECT')]
+    # arXiv_metadata, the AbsPageBundle query and the LaTeXML query, no DBLP listing so no DBLP authors
+    assert len(selects) <= 3, f"abs page made {len(selects)} queries: {selects}"
+
+
+def test_db_abs_304_query_count(dbclient):
+    """A not modified abs page should only query the LaTeXML DB for its publish times."""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    statements = []
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        rt = dbclient.get('/abs/0906.2112',
+                          headers={'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'})
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    assert rt.status_code == 304
+    selects = [stmt for stmt in statements if stmt.lstrip().upper().startswith('SELECT')]
+    # arXiv_metadata and the LaTeXML query
+    assert len(selects) <= 2, f"not modified abs page made {len(selects)} queries: {selects}"
+
+
+def test_db_request_memo(dbclient):
+    """Memoized DB functions only query once per request for the same args."""
+    from browse.services import database
+    app = dbclient.application
+    with app.test_request_context('/abs/0906.2112'):
+        app.preprocess_request()
+        first = database.get_latexml_status_for_document('0906.2112', 1)
+        assert database.get_latexml_status_for_document('0906.2112', 1) == first
+        database.get_latexml_status_for_document('0906.2112', 2)
+        memo = database._request_memo()
+        assert memo.hits['get_latexml_status_for_document'] == 1
+        assert memo.misses['get_latexml_status_for_document'] == 2
+
+    app.config['BROWSE_DB_MEMO_HEADERS'] = True
+    try:
+        rt = dbclient.get('/abs/0906.2112')
+    finally:
+        app.config['BROWSE_DB_MEMO_HEADERS'] = False
+    assert rt.status_code == 200
+    assert int(rt.headers['X-Browse-DB-Memo-Misses']) > 0
+    assert 'X-Browse-DB-Memo-Hits' in rt.headers
@@ -0,0 +1,59 @@
+"""Tests for the metrics of the DB connection pools."""
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from browse.services.database.pool_metrics import PoolMetrics, timed_pool_class
+
+
+def test_timed_pool(tmp_path):
+    metrics = PoolMetrics("test")
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}",
+                           poolclass=timed_pool_class(metrics),
+                           pool_size=1, max_overflow=1, pool_timeout=0.1)
+
+    first = engine.connect()
+    first.execute(text("SELECT 1"))
+    status = metrics.status()
+    assert status["checkouts"] == 1
+    assert status["in_use"] == 1
+    assert status["overflow_connects"] == 0
+
+    second = engine.connect()
+    status = metrics.status()
+    assert status["in_use"] == 2
+    assert status["overflow"] == 1
+    assert status["overflow_connects"] == 1
+
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    assert metrics.status()["timeouts"] == 1
+
+    first.close()
+    second.close()
+    status = metrics.status()
+    assert status["in_use"] == 0
+    assert status["checkouts"] == 2
+    assert sum(status["checkout_histogram"].values()) == 2
+
+    engine.dispose()
+    with engine.connect():
+        assert metrics.status()["checkouts"] == 3, "metrics are kept when the pool is recreated"
+
+
+def test_pool_names():
+    from flask import Flask
+    from sqlalchemy.engine.url import make_url
+
+    from browse.services.database.models import db
+
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI="mysql+pymysql://u:p@main/arXiv",
+                      SQLALCHEMY_BINDS={"latexml": "mysql+pymysql://u:p@latexml/latexml"},
+                      SQLALCHEMY_NATIVE_UNICODE=None)
+    names = {}
+    for uri in ["mysql+pymysql://u:p@main/arXiv", "mysql+pymysql://u:p@latexml/latexml",
+                "mysql+pymysql://u:p@other/other"]:
+        url, options = db.apply_driver_hacks(app, make_url(uri), {})
+        assert url.query["charset"] == "utf8"
+        names[uri] = options["pool_name"]
+    assert list(names.values()) == ["default", "latexml", "mysql"]
@@ -0,0 +1,94 @@
+"""Tests for the process wide cache of parsed .abs files."""
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from browse.services.documents.base_documents import AbsNotFoundException
+from browse.services.documents.fs_implementation.docmeta_cache import (
+    DocMetadataCache, approx_size)
+from browse.services.documents.fs_implementation.parse_abs import parse_abs_file
+from tests import path_of_for_test
+
+ABS = path_of_for_test('data/abs_files/ftp/arxiv/papers/0906/0906.2112.abs')
+ABS2 = path_of_for_test('data/abs_files/ftp/arxiv/papers/0906/0906.3336.abs')
+
+
+class FakeClock():
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestDocMetadataCache(TestCase):
+
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.cache = DocMetadataCache(10, 1024 * 1024, 30, clock=self.clock)
+        self.loads = 0
+        self.stats = 0
+
+    def _load(self, path: str):
+        def load():
+            self.loads += 1
+            return parse_abs_file(filename=path)
+        return load
+
+    def _mtime(self, path: str):
+        def mtime():
+            self.stats += 1
+            return os.stat(path).st_mtime
+        return mtime
+
+    def test_hit_does_not_touch_file(self):
+        first = self.cache.get_or_load(ABS, self._mtime(ABS), self._load(ABS))
+        second = self.cache.get_or_load(ABS, self._mtime(ABS), self._load(ABS))
+        self.assertIs(first, second)
+        self.assertEqual(self.loads, 1)
+        self.assertEqual(self.stats, 0)
+        self.assertEqual(self.cache.stats()['hits'], 1)
+        self.assertEqual(self.cache.stats()['misses'], 1)
+
+    def test_revalidate_unchanged(self):
+        self.cache.get_or_load(ABS, self._mtime(ABS), self._load(ABS))
+        self.clock.now += 31
+        self.cache.get_or_load(ABS, self._mtime(ABS), self._load(ABS))
+        self.assertEqual(self.loads, 1)
+        self.assertEqual(self.stats, 1)
+        self.assertEqual(self.cache.stats()['revalidations'], 1)
+
+    def test_revalidate_changed(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, '0906.2112.abs')
+            shutil.copy(ABS, path)
+            self.cache.get_or_load(path, self._mtime(path), self._load(path))
+            mtime = os.stat(path).st_mtime
+            os.utime(path, (mtime + 100, mtime + 100))
+            self.clock.now += 31
+            self.cache.get_or_load(path, self._mtime(path), self._load(path))
+            self.assertEqual(self.loads, 2)
+
+            os.remove(path)
+            self.clock.now += 31
+            with self.assertRaises(AbsNotFoundException):
+                self.cache.get_or_load(path, self._mtime(path), self._load(path))
+            self.assertEqual(len(self.cache), 0)
+
+    def test_lru_eviction(self):
+        cache = DocMetadataCache(1, 1024 * 1024, 30, clock=self.clock)
+        cache.get_or_load(ABS, self._mtime(ABS), self._load(ABS))
+        cache.get_or_load(ABS2, self._mtime(ABS2), self._load(ABS2))
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.stats()['evictions'], 1)
+        cache.get_or_load(ABS, self._mtime(ABS), self._load(ABS))
+        self.assertEqual(self.loads, 3)
+
+    def test_byte_budget(self):
+        docmeta = parse_abs_file(filename=ABS)
+        cache = DocMetadataCache(10, approx_size(docmeta) + 1, 30, clock=self.clock)
+        cache.get_or_load(ABS, self._mtime(ABS), self._load(ABS))
+        cache.get_or_load(ABS2, self._mtime(ABS2), self._load(ABS2))
+        self.assertEqual(len(cache), 1)
+        self.assertLessEqual(cache.stats()['bytes'], cache.max_bytes)
@@ -0,0 +1,11 @@
+"""Tests for getting several abs at once from the FS abs service."""
+
+
+def test_fs_abs_many(app_with_test_fs):
+    from browse.services.documents import get_doc_service
+    ids = ['0906.2112', '0906.3336v1', '0704.9999999', 'bogus']
+    docs = get_doc_service().get_abs_many(ids)
+    assert set(docs.keys()) == {'0906.2112', '0906.3336v1'}
+    assert docs['0906.2112'].arxiv_id == '0906.2112'
+    assert docs['0906.3336v1'].version == 1
+    assert docs['0906.2112'].version == get_doc_service().get_abs('0906.2112').version
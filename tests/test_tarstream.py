@@ -70,3 +70,27 @@ You should see the Greek word 'kosme':       "κόσμε"
     assert members[0].size == fileobj.size
     assert member_data
     assert type(member_data[0]) == str and member_data[0] == data
+
+
+def test_prefetch_tar_stream():
+    files = [MockStringFileObj(f"file{i}.txt", f"file {i}\n" * (i * 500)) for i in range(12)]
+
+    def to_tar(prefetch: int) -> bytes:
+        return b"".join(tar_stream_gen(files, prefetch=prefetch,
+                                       buffer_size=1024, max_prefetch_bytes=4096))
+
+    data_tar = to_tar(4)
+    result_tar = tarfile.open(fileobj=io.BytesIO(data_tar))
+    members = result_tar.getmembers()
+    assert [member.name for member in members] == [fileobj.name for fileobj in files]
+    for member, fileobj in zip(members, files):
+        assert result_tar.extractfile(member).read() == fileobj.open('rb').read()
+
+    assert tarfile.open(fileobj=io.BytesIO(to_tar(0))).getnames() == result_tar.getnames()
+
+
+def test_prefetch_tar_stream_closed_early():
+    files = [MockStringFileObj(f"file{i}.txt", "data" * 1000) for i in range(10)]
+    stream = tar_stream_gen(files, prefetch=3)
+    next(stream)
+    stream.close()